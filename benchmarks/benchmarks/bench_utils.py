@@ -0,0 +1,50 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from datetime import datetime, timedelta
+import pytz
+from bhive.utils import formatTimeString, parse_time, timeFormat
+from bhive import Hive
+from bhive.block import Block
+
+
+class Benchmark(object):
+    goal_time = 2
+
+
+class TimeParsing(Benchmark):
+    def setup(self):
+        self.hv = Hive(offline=True)
+        start = datetime(2020, 1, 1)
+        # Blocks are 3 seconds apart, all operations of a block share the timestamp
+        self.unique = [(start + timedelta(seconds=3 * i)).strftime(timeFormat) for i in range(10000)]
+        self.repeated = [t for t in self.unique[:200] for i in range(50)]
+        self.block = {"block_id": "0000000a" + "0" * 32, "timestamp": self.unique[0],
+                      "transactions": [{"operations": [], "expiration": t} for t in self.unique[:100]],
+                      "transaction_ids": ["0" * 40] * 100}
+
+    def time_strptime_reference(self):
+        for t in self.unique:
+            pytz.utc.localize(datetime.strptime(t, timeFormat))
+
+    def time_formatTimeString_unique(self):
+        for t in self.unique:
+            formatTimeString(t)
+
+    def time_formatTimeString_repeated(self):
+        for t in self.repeated:
+            formatTimeString(t)
+
+    def time_parse_time(self):
+        for t in self.unique:
+            parse_time(t)
+
+    def time_format_datetime(self):
+        for t in self.repeated[::10]:
+            formatTimeString(formatTimeString(t))
+
+    def time_block_parse(self):
+        for i in range(100):
+            Block(dict(self.block, transactions=[trx.copy() for trx in self.block["transactions"]]), hive_instance=self.hv)
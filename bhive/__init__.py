@@ -5,10 +5,14 @@ __all__ = [
     "hive",
     "aes",
     "account",
+    "accountloader",
     "amount",
     "asset",
     "block",
+    "blockarchive",
+    "blocksource",
     "blockchain",
+    "blockdecoder",
     "market",
     "storage",
     "price",
@@ -19,9 +23,13 @@ __all__ = [
     "notify",
     "comment",
     "discussions",
+    "dispatcher",
     "witness",
     "profile",
     "nodelist",
     "imageuploader",
-    "snapshot"
+    "snapshot",
+    "historystore",
+    "checkpoint",
+    "workerpool"
 ]
@@ -10,11 +10,12 @@ from datetime import datetime, timedelta, date, time
 import math
 import random
 import logging
+from bisect import bisect_left
 from prettytable import PrettyTable
 from bhive.instance import shared_hive_instance
 from .exceptions import AccountDoesNotExistsException, OfflineHasNoRPCException
 from bhiveapi.exceptions import ApiNotSupported, MissingRequiredActiveAuthority
-from .blockchainobject import BlockchainObject
+from .blockchainobject import BlockchainObject, ObjectCache
 from .blockchain import Blockchain
 from .utils import formatTimeString, formatTimedelta, remove_from_dict, reputation_to_score, addTzInfo
 from bhive.amount import Amount
@@ -25,6 +26,9 @@ from bhivegraphenebase.py23 import bytes_types, integer_types, string_types, tex
 from bhive.constants import HIVE_VOTE_REGENERATION_SECONDS, HIVE_1_PERCENT, HIVE_100_PERCENT, HIVE_VOTING_MANA_REGENERATION_SECONDS
 log = logging.getLogger(__name__)
 
+# maximum number of cached history probes of an account
+HISTORY_PROBE_CACHE_SIZE = 1000
+
 
 class Account(BlockchainObject):
     """ This class allows to easily access Account data
@@ -62,6 +66,8 @@ class Account(BlockchainObject):
     """
 
     type_id = 2
+    #: history probes of estimate_virtual_op_num() for each account name
+    _history_probe_cache = ObjectCache(default_expiration=3600, max_entries=1000)
 
     def __init__(
         self,
@@ -82,8 +88,12 @@ class Account(BlockchainObject):
         self.full = full
         self.lazy = lazy
         self.hive = hive_instance or shared_hive_instance()
+        self.loader = None
         if isinstance(account, dict):
             account = self._parse_json_data(account)
+        elif lazy and isinstance(account, string_types) and self.hive.account_loader is not None:
+            self.loader = self.hive.account_loader
+            self.loader.add(account)
         super(Account, self).__init__(
             account,
             lazy=lazy,
@@ -97,6 +107,16 @@ class Account(BlockchainObject):
         """
         if not self.hive.is_connected():
             return
+        loader = self.loader or self.hive.account_loader
+        if loader is not None:
+            # the account is received together with the pending requests of the loader
+            account = loader.get(self.identifier)
+            if not account:
+                raise AccountDoesNotExistsException(self.identifier)
+            account = self._parse_json_data(account)
+            self.identifier = account["name"]
+            super(Account, self).__init__(account, id_item="name", lazy=False, full=self.full, hive_instance=self.hive)
+            return
         self.hive.rpc.set_next_node_on_empty_reply(self.hive.rpc.get_use_appbase())
         if self.hive.rpc.get_use_appbase():
             account = self.hive.rpc.find_accounts({'accounts': [self.identifier]}, api="database")
@@ -1586,6 +1606,8 @@ class Account(BlockchainObject):
     def estimate_virtual_op_num(self, blocktime, stop_diff=0, max_count=100):
         """ Returns an estimation of an virtual operation index for a given time or blockindex
 
+            Received operations are cached for the account, see :func:`estimate_virtual_op_nums`.
+
             :param blocktime: start time or start block index from which account
                 operation should be fetched
             :type blocktime: int, datetime
@@ -1625,101 +1647,187 @@ class Account(BlockchainObject):
                 print(block_est - block_num)
 
         """
-        def get_blocknum(index):
-            op = self._get_account_history(start=(index))
-            return op[0][1]['block']
+        return self.estimate_virtual_op_nums([blocktime], stop_diff=stop_diff, max_count=max_count)[0]
 
-        max_index = self.virtual_op_count()
-        if max_index < stop_diff:
-            return 0
+    def estimate_virtual_op_nums(self, blocktimes, stop_diff=0, max_count=100):
+        """ Returns estimations of the virtual operation indices for several times or block
+            numbers, see :func:`estimate_virtual_op_num`.
 
-        # calculate everything with block numbers
-        created = get_blocknum(0)
+            The block number and timestamp of each received operation are kept in a probe
+            cache, which is shared by all Account instances of the account. The search
+            interpolates between the cached probes and receives the probes of all
+            blocktimes of an iteration by a single batched rpc call, so that repeated
+            estimations need only one call for the latest operation.
 
-        # convert blocktime to block number if given as a datetime/date/time
-        if isinstance(blocktime, (datetime, date, time)):
-            b = Blockchain(hive_instance=self.hive)
-            target_blocknum = b.get_estimated_block_num(addTzInfo(blocktime), accurate=True)
-        else:
-            target_blocknum = blocktime
+            :param list blocktimes: start times or block numbers
+            :param int stop_diff: Sets the difference between last estimation and
+                new estimation at which the estimation stops. (default is 0)
+            :param int max_count: sets the maximum number of iterations. -1 disables this (default 100)
+            :rtype: list
 
-        # the requested blocknum/timestamp is before the account creation date
-        if target_blocknum <= created:
-            return 0
+            .. code-block:: python
 
-        # get the block number from the account's latest operation
-        latest_blocknum = get_blocknum(-1)
+                >>> from bhive.account import Account
+                >>> from datetime import datetime, timedelta
+                >>> acc = Account("gtg")
+                >>> start_op, stop_op = acc.estimate_virtual_op_nums([datetime.utcnow() - timedelta(days=7), datetime.utcnow() - timedelta(days=1)])
+
+        """
+        def diff(a, b):
+            d = a - b
+            if isinstance(d, timedelta):
+                return d.total_seconds()
+            return d
+
+        known = {}
+        for index, (op_index, probe) in self._probe_history([0, -1]).items():
+            known[op_index] = probe
+        if len(known) == 0:
+            return [0] * len(blocktimes)
+        max_index = max(known)
+        known.update((index, probe) for index, probe in list(self._get_history_probes().items()) if index <= max_index)
+        # the first operations may be missing (e.g. pruned history), the lowest known index is used instead
+        min_index = min(known)
+
+        # datetimes are compared with the timestamps (key 1), block numbers with the blocks (key 0)
+        targets = []
+        for blocktime in blocktimes:
+            if isinstance(blocktime, (datetime, date, time)):
+                targets.append((1, addTzInfo(blocktime)))
+            else:
+                targets.append((0, blocktime))
 
-        # requested blocknum/timestamp is after the latest account operation
-        if target_blocknum >= latest_blocknum:
-            return max_index
+        results = [None] * len(targets)
+        for i, (key, target) in enumerate(targets):
+            if max_index < stop_diff or target <= known[min_index][key] or known[max_index][key] == known[min_index][key]:
+                results[i] = 0
+            elif target >= known[max_index][key]:
+                results[i] = max_index
 
-        # all account ops in a single block
-        if latest_blocknum - created == 0:
-            return 0
-
-        # set initial search range
-        op_num = 0
-        op_lower = 0
-        block_lower = created
-        op_upper = max_index
-        block_upper = latest_blocknum
-        last_op_num = None
         cnt = 0
-
         while True:
-            # check if the maximum number of iterations was reached
-            if max_count != -1 and cnt >= max_count:
-                # did not converge, return the current state
-                return op_num
-
-            # linear approximation between the known upper and
-            # lower bounds for the first iteration
-            if cnt < 1:
-                op_num = int((target_blocknum - block_lower) / (block_upper - block_lower) * (op_upper - op_lower) + op_lower)
-            else:
-                # divide and conquer for the following iterations
-                op_num = int((op_upper + op_lower) / 2)
-                if op_upper == op_lower + 1:  # round up if we're close to target
-                    op_num += 1
-
-            # get block number for current op number estimation
-            if op_num != last_op_num:
-                block_num = get_blocknum(op_num)
-                last_op_num = op_num
-
-            # check if the required accuracy was reached
-            if op_upper - op_lower <= stop_diff or \
-               op_upper == op_lower + 1:
-                return op_num
-
-            # set new upper/lower boundaries for next iteration
-            if block_num < target_blocknum:
-                # current op number was too low -> search upwards
-                op_lower = op_num
-                block_lower = block_num
-            else:
-                # current op number was too high or matched the target block
-                # -> search downwards
-                op_upper = op_num
-                block_upper = block_num
+            indices = sorted(known)
+            requests = {}
+            for i, (key, target) in enumerate(targets):
+                if results[i] is not None:
+                    continue
+                pos = bisect_left([known[index][key] for index in indices], target)
+                op_lower, op_upper = indices[pos - 1], indices[pos]
+                # check if the required accuracy or the maximum number of iterations was reached
+                if op_upper - op_lower <= max(stop_diff, 1) or (max_count != -1 and cnt >= max_count):
+                    results[i] = op_upper
+                    continue
+                # linear interpolation between the known upper and lower bounds,
+                # the middle is probed as well, so that each iteration halves the range
+                op_num = op_lower + int(diff(target, known[op_lower][key]) / diff(known[op_upper][key], known[op_lower][key]) * (op_upper - op_lower))
+                op_nums = set(min(max(n, op_lower + 1), op_upper - 1) for n in [op_num, op_num + 1, (op_lower + op_upper) // 2])
+                requests[i] = sorted(op_nums)
+            if len(requests) == 0:
+                return results
+            probes = self._probe_history([n for op_nums in requests.values() for n in op_nums])
+            for i, op_nums in requests.items():
+                for op_num in op_nums:
+                    if op_num in probes:
+                        known[probes[op_num][0]] = probes[op_num][1]
+                    else:
+                        # the probe could not be received, return the current state
+                        results[i] = op_num
             cnt += 1
 
-    def get_curation_reward(self, days=7):
+    def _get_history_probes(self):
+        """Returns the cached probes (operation index -> (block, timestamp)) of the account"""
+        probes = Account._history_probe_cache.get(self["name"], None)
+        if probes is None:
+            probes = {}
+            Account._history_probe_cache[self["name"]] = probes
+        return probes
+
+    def _probe_history(self, indices):
+        """ Returns a dict, which maps each index to the operation index and to the
+            (block, timestamp) probe of the operation. Probes, which are not cached,
+            are received by :func:`_get_history_batch`. The index -1 (latest
+            operation) is received on each call.
+
+            :param list indices: operation indices
+        """
+        probes = self._get_history_probes()
+        result = {}
+        missing = []
+        for index in set(indices):
+            if index != -1 and index in probes:
+                result[index] = (index, probes[index])
+            else:
+                missing.append(index)
+        if len(missing) == 0:
+            return result
+        if len(probes) + len(missing) > HISTORY_PROBE_CACHE_SIZE:
+            probes.clear()
+        missing = sorted(missing)
+        for index, ret in zip(missing, self._get_history_batch(missing)):
+            if not ret:
+                continue
+            op_index, op = ret[-1]
+            probes[op_index] = (op["block"], formatTimeString(op["timestamp"]))
+            result[index] = (op_index, probes[op_index])
+        return result
+
+    def _get_history_probe(self, index, default=None):
+        """Returns the block number and the timestamp of the operation at index or default,
+            when no operation was received
+        """
+        probe = self._probe_history([index]).get(index)
+        if probe is None:
+            return default
+        return probe[1]
+
+    def _get_history_batch(self, indices):
+        """ Returns the results of ``get_account_history(start=index, limit=0)`` for all
+            indices. Appbase nodes receive the calls by a single batched rpc call, the
+            calls are sent one by one, when the batched call fails.
+
+            :param list indices: operation indices
+        """
+        if not self.hive.is_connected():
+            raise OfflineHasNoRPCException("No RPC available in offline mode!")
+        rpc = self.hive.rpc
+        if len(indices) > 1 and rpc.get_use_appbase():
+            try:
+                rpc.set_next_node_on_empty_reply(False)
+                for i, index in enumerate(indices):
+                    ret = rpc.get_account_history({'account': self["name"], 'start': index, 'limit': 0}, api="account_history",
+                                                  add_to_queue=i < len(indices) - 1)
+                if isinstance(ret, list) and len(ret) == len(indices):
+                    return [r["history"] if isinstance(r, dict) and "history" in r else r for r in ret]
+            except Exception as e:
+                log.debug("Batched get_account_history failed: %s" % str(e))
+                rpc.rpc_queue = []
+        return [self._get_account_history(start=index, limit=0) for index in indices]
+
+    def get_curation_reward(self, days=7, history_store=None):
         """Returns the curation reward of the last `days` days
 
             :param int days: limit number of days to be included int the return value
+            :param AccountHistoryStore history_store: When set, the rewards are read from
+                the local store (:class:`bhive.historystore.AccountHistoryStore`), which is
+                synced before (*optional*)
         """
         stop = addTzInfo(datetime.utcnow()) - timedelta(days=days)
         reward_vests = Amount(0, self.hive.vests_symbol, hive_instance=self.hive)
-        for reward in self.history_reverse(stop=stop, use_block_num=False, only_ops=["curation_reward"]):
+        if history_store is not None:
+            history_store.sync(self)
+            rewards = history_store.history_reverse(self, stop=stop, use_block_num=False, only_ops=["curation_reward"])
+        else:
+            rewards = self.history_reverse(stop=stop, use_block_num=False, only_ops=["curation_reward"])
+        for reward in rewards:
             reward_vests += Amount(reward['reward'], hive_instance=self.hive)
         return self.hive.vests_to_sp(float(reward_vests))
 
-    def curation_stats(self):
+    def curation_stats(self, history_store=None):
         """Returns the curation reward of the last 24h and 7d and the average
             of the last 7 days
 
+            :param AccountHistoryStore history_store: When set, the rewards are read from
+                the local store (:class:`bhive.historystore.AccountHistoryStore`) (*optional*)
             :returns: Account curation
             :rtype: dictionary
 
@@ -1734,9 +1842,10 @@ class Account(BlockchainObject):
                 }
 
         """
-        return {"24hr": self.get_curation_reward(days=1),
-                "7d": self.get_curation_reward(days=7),
-                "avg": self.get_curation_reward(days=7) / 7}
+        reward_7d = self.get_curation_reward(days=7, history_store=history_store)
+        return {"24hr": self.get_curation_reward(days=1, history_store=history_store),
+                "7d": reward_7d,
+                "avg": reward_7d / 7}
 
     def get_account_history(self, index, limit, order=-1, start=None, stop=None, use_block_num=True, only_ops=[], exclude_ops=[], raw_output=False):
         """ Returns a generator for individual account transactions. This call can be used in a
@@ -1842,9 +1951,28 @@ class Account(BlockchainObject):
             if not only_ops or op_type in only_ops:
                 yield construct_op(self["name"])
 
+    def _history_pages(self, pages, order=1, threading=False, thread_num=8, **kwargs):
+        """ Yields the operations of each (index, limit) page of ``pages`` in order,
+            see :func:`get_account_history`. With threading, up to ``thread_num`` pages
+            are received at the same time by the worker pool of the Hive instance.
+        """
+        pool = None
+        if threading:
+            pool = self.hive.get_worker_pool(thread_num)
+        if pool is None:
+            for index, limit in pages:
+                yield self.get_account_history(index, limit, start=None, stop=None, order=order, **kwargs)
+            return
+
+        def fetch(page):
+            return list(self.get_account_history(page[0], page[1], start=None, stop=None, order=order, **kwargs))
+        for items in pool.map(fetch, pages, window=thread_num):
+            yield items
+
     def history(
         self, start=None, stop=None, use_block_num=True,
-        only_ops=[], exclude_ops=[], batch_size=1000, raw_output=False
+        only_ops=[], exclude_ops=[], batch_size=1000, raw_output=False,
+        threading=False, thread_num=8
     ):
         """ Returns a generator for individual account transactions. The
             earlist operation will be first. This call can be used in a
@@ -1863,6 +1991,10 @@ class Account(BlockchainObject):
             :param int batch_size: internal api call batch size (*optional*)
             :param bool raw_output: if False, the output is a dict, which
                 includes all values. Otherwise, the output is list.
+            :param bool threading: When True, the pages of ``batch_size`` operations are
+                received by up to ``thread_num`` parallel calls and yielded in order (*optional*)
+            :param int thread_num: number of pages, which are received at the same time,
+                when threading is True (default is 8)
 
             .. note::
                 only_ops and exclude_ops takes an array of strings:
@@ -1931,23 +2063,20 @@ class Account(BlockchainObject):
             op_est = self.estimate_virtual_op_num(start, stop_diff=1)
             est_diff = 0
             if isinstance(start, (datetime, date, time)):
-                for h in self.get_account_history(op_est, 0):
-                    block_date = formatTimeString(h["timestamp"])
+                # a missing first probe stops the search, a later one keeps the last value
+                block_date = self._get_history_probe(op_est, (None, start))[1]
                 while(op_est > est_diff + batch_size and block_date > start):
                     est_diff += batch_size
                     if op_est - est_diff < 0:
                         est_diff = op_est
-                    for h in self.get_account_history(op_est - est_diff, 0):
-                        block_date = formatTimeString(h["timestamp"])
+                    block_date = self._get_history_probe(op_est - est_diff, (None, block_date))[1]
             elif not isinstance(start, (datetime, date, time)):
-                for h in self.get_account_history(op_est, 0):
-                    block_num = h["block"]
+                block_num = self._get_history_probe(op_est, (start, None))[0]
                 while(op_est > est_diff + batch_size and block_num > start):
                     est_diff += batch_size
                     if op_est - est_diff < 0:
                         est_diff = op_est
-                    for h in self.get_account_history(op_est - est_diff, 0):
-                        block_num = h["block"]
+                    block_num = self._get_history_probe(op_est - est_diff, (block_num, None))[0]
             start_index = op_est - est_diff
         else:
             start_index = 0
@@ -1956,12 +2085,27 @@ class Account(BlockchainObject):
         if first > max_index:
             _limit = max_index - start_index + 1
             first = start_index + _limit
-        last_round = False
         if _limit < 0:
             return
-        while True:
-            # RPC call
-            for item in self.get_account_history(first, _limit, start=None, stop=None, order=1, raw_output=raw_output):
+
+        def pages(first, _limit):
+            last_round = False
+            while True:
+                yield first, _limit
+                if first < max_index and first + _limit >= max_index and not last_round:
+                    _limit = max_index - first - 1
+                    first = max_index
+                    last_round = True
+                else:
+                    first += (_limit + 1)
+                    if stop is not None and not use_block_num and isinstance(stop, int) and first >= stop + _limit:
+                        break
+                    elif first > max_index or last_round:
+                        break
+
+        for items in self._history_pages(pages(first, _limit), order=1, threading=threading, thread_num=thread_num,
+                                         raw_output=raw_output):
+            for item in items:
                 if raw_output:
                     item_index, event = item
                     op_type, op = event['op']
@@ -1983,7 +2127,6 @@ class Account(BlockchainObject):
                 if stop is not None and isinstance(stop, (datetime, date, time)):
                     timediff = stop - formatTimeString(timestamp)
                     if timediff.total_seconds() < 0:
-                        first = max_index + _limit
                         return
                 elif stop is not None and use_block_num and block_num > stop:
                     return
@@ -1993,20 +2136,11 @@ class Account(BlockchainObject):
                     continue
                 if not only_ops or op_type in only_ops:
                     yield item
-            if first < max_index and first + _limit >= max_index and not last_round:
-                _limit = max_index - first - 1
-                first = max_index
-                last_round = True
-            else:
-                first += (_limit + 1)
-                if stop is not None and not use_block_num and isinstance(stop, int) and first >= stop + _limit:
-                    break
-                elif first > max_index or last_round:
-                    break
 
     def history_reverse(
         self, start=None, stop=None, use_block_num=True,
-        only_ops=[], exclude_ops=[], batch_size=1000, raw_output=False
+        only_ops=[], exclude_ops=[], batch_size=1000, raw_output=False,
+        threading=False, thread_num=8
     ):
         """ Returns a generator for individual account transactions. The
             latest operation will be first. This call can be used in a
@@ -2027,6 +2161,10 @@ class Account(BlockchainObject):
             :param int batch_size: internal api call batch size (*optional*)
             :param bool raw_output: if False, the output is a dict, which
                 includes all values. Otherwise, the output is list.
+            :param bool threading: When True, the pages of ``batch_size`` operations are
+                received by up to ``thread_num`` parallel calls and yielded in order (*optional*)
+            :param int thread_num: number of pages, which are received at the same time,
+                when threading is True (default is 8)
 
             .. note::
                 only_ops and exclude_ops takes an array of strings:
@@ -2097,32 +2235,36 @@ class Account(BlockchainObject):
             op_est = self.estimate_virtual_op_num(start, stop_diff=1)
             est_diff = 0
             if isinstance(start, (datetime, date, time)):
-                for h in self.get_account_history(op_est, 0):
-                    block_date = formatTimeString(h["timestamp"])
+                # a missing first probe stops the search, a later one keeps the last value
+                block_date = self._get_history_probe(op_est, (None, start))[1]
                 while(op_est + est_diff + batch_size < first and block_date < start):
                     est_diff += batch_size
                     if op_est + est_diff > first:
                         est_diff = first - op_est
-                    for h in self.get_account_history(op_est + est_diff, 0):
-                        block_date = formatTimeString(h["timestamp"])
+                    block_date = self._get_history_probe(op_est + est_diff, (None, block_date))[1]
             else:
-                for h in self.get_account_history(op_est, 0):
-                    block_num = h["block"]
+                block_num = self._get_history_probe(op_est, (start, None))[0]
                 while(op_est + est_diff + batch_size < first and block_num < start):
                     est_diff += batch_size
                     if op_est + est_diff > first:
                         est_diff = first - op_est
-                    for h in self.get_account_history(op_est + est_diff, 0):
-                        block_num = h["block"]
+                    block_num = self._get_history_probe(op_est + est_diff, (block_num, None))[0]
             first = op_est + est_diff
         if stop is not None and isinstance(stop, int) and stop < 0 and not use_block_num:
             stop += first
 
-        while True:
-            # RPC call
-            if first - _limit < 0:
-                _limit = first
-            for item in self.get_account_history(first, _limit, start=None, stop=None, order=-1, only_ops=only_ops, exclude_ops=exclude_ops, raw_output=raw_output):
+        def pages(first, _limit):
+            while True:
+                if first - _limit < 0:
+                    _limit = first
+                yield first, _limit
+                first -= (_limit + 1)
+                if first < 1:
+                    break
+
+        for items in self._history_pages(pages(first, _limit), order=-1, threading=threading, thread_num=thread_num,
+                                         only_ops=only_ops, exclude_ops=exclude_ops, raw_output=raw_output):
+            for item in items:
                 if raw_output:
                     item_index, event = item
                     op_type, op = event['op']
@@ -2144,21 +2286,15 @@ class Account(BlockchainObject):
                 if stop is not None and isinstance(stop, (datetime, date, time)):
                     timediff = stop - formatTimeString(timestamp)
                     if timediff.total_seconds() > 0:
-                        first = 0
                         return
                 elif stop is not None and use_block_num and block_num < stop:
-                    first = 0
                     return
                 elif stop is not None and not use_block_num and item_index < stop:
-                    first = 0
                     return
                 if exclude_ops and op_type in exclude_ops:
                     continue
                 if not only_ops or op_type in only_ops:
                     yield item
-            first -= (_limit + 1)
-            if first < 1:
-                break
 
     def mute(self, mute, account=None):
         """ Mute another account
@@ -3289,25 +3425,77 @@ class Accounts(AccountsObject):
             to fetch per call, defaults to 100
         :param Hive hive_instance: Hive() instance to use when
             accessing a RPCcreator = Account(creator, hive_instance=self)
+        :param bool threading: When True, up to ``thread_num`` calls of ``batch_limit``
+            accounts are sent at the same time by the worker pool of the Hive instance,
+            see :func:`bhive.hive.Hive.get_worker_pool` (default is False)
+        :param int thread_num: number of parallel calls, when threading is True (default is 8)
+        :param bool raw_data: When True, a plain list of the account dicts of the node is
+            returned instead of an Accounts object of :class:`Account` objects (default is False)
+
+        The accounts are returned in the order of ``name_list``, accounts which do not exist
+        are skipped and logged as warning.
+
+        .. code-block:: python
+
+            from bhive.account import Accounts
+            accounts = Accounts(["bhive.app", "gtg"], threading=True, raw_data=True)
+            print(accounts[0]["vesting_shares"])
+
     """
-    def __init__(self, name_list, batch_limit=100, lazy=False, full=True, hive_instance=None):
+    def __new__(cls, name_list, batch_limit=100, lazy=False, full=True, hive_instance=None,
+                threading=False, thread_num=8, raw_data=False):
+        if not raw_data:
+            return super(Accounts, cls).__new__(cls)
+        # The methods of AccountsObject need Account objects, the dicts are returned as list
+        hive = hive_instance or shared_hive_instance()
+        if not hive.is_connected():
+            return []
+        return cls._receive_accounts(hive, name_list, batch_limit=batch_limit, threading=threading,
+                                     thread_num=thread_num)
+
+    def __init__(self, name_list, batch_limit=100, lazy=False, full=True, hive_instance=None,
+                 threading=False, thread_num=8, raw_data=False):
         self.hive = hive_instance or shared_hive_instance()
         if not self.hive.is_connected():
             return
-        accounts = []
-        name_cnt = 0
-
-        while name_cnt < len(name_list):
-            self.hive.rpc.set_next_node_on_empty_reply(False)
-            if self.hive.rpc.get_use_appbase():
-                accounts += self.hive.rpc.find_accounts({'accounts': name_list[name_cnt:batch_limit + name_cnt]}, api="database")["accounts"]
-            else:
-                accounts += self.hive.rpc.get_accounts(name_list[name_cnt:batch_limit + name_cnt])
-            name_cnt += batch_limit
-
+        accounts = self._receive_accounts(self.hive, name_list, batch_limit=batch_limit, threading=threading,
+                                          thread_num=thread_num)
         super(Accounts, self).__init__(
             [
                 Account(x, lazy=lazy, full=full, hive_instance=self.hive)
                 for x in accounts
             ]
         )
+
+    @staticmethod
+    def _receive_accounts(hive, name_list, batch_limit=100, threading=False, thread_num=8):
+        """Returns the account dicts in the order of name_list, missing accounts are skipped"""
+        batches = [name_list[i:i + batch_limit] for i in range(0, len(name_list), batch_limit)]
+        pool = None
+        if threading and len(batches) > 1:
+            pool = hive.get_worker_pool(thread_num)
+        if pool is not None:
+            results = pool.map(lambda names: Accounts._get_accounts(hive, names), batches, window=thread_num)
+        else:
+            results = (Accounts._get_accounts(hive, names) for names in batches)
+        accounts = []
+        missing = []
+        for names, batch in zip(batches, results):
+            # the node does not need to keep the order of the requested names
+            batch = {account["name"]: account for account in batch if account}
+            for name in names:
+                if name in batch:
+                    accounts.append(batch[name])
+                else:
+                    missing.append(name)
+        if len(missing) > 0:
+            log.warning("Accounts not found: %s" % ", ".join(missing))
+        return accounts
+
+    @staticmethod
+    def _get_accounts(hive, names):
+        """Returns the account dicts of names, which are received by a single call"""
+        hive.rpc.set_next_node_on_empty_reply(False)
+        if hive.rpc.get_use_appbase():
+            return hive.rpc.find_accounts({'accounts': names}, api="database")["accounts"]
+        return hive.rpc.get_accounts(names)
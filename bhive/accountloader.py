@@ -0,0 +1,158 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import object
+import time
+import threading
+import logging
+from .account import Account
+from .instance import shared_hive_instance
+log = logging.getLogger(__name__)
+
+
+class AccountLoader(object):
+    """ Collects account requests and receives them by batched
+        ``find_accounts``/``get_accounts`` calls (dataloader pattern)
+
+        Inside a ``with`` block, the loader is set as ``account_loader`` of the Hive instance:
+
+        * ``Account(name, lazy=True)`` adds the name to the pending requests. All pending
+          names are received together, when one of these accounts is accessed.
+        * ``Account(name)`` receives its name together with all pending names and reads
+          already loaded accounts without an rpc call.
+
+        Received accounts are stored in the object cache of :class:`bhive.blockchainobject.BlockchainObject`.
+        The loaded data are not refreshed inside the block.
+
+        :param Hive hive_instance: Hive instance
+        :param int batch_limit: maximum number of accounts per call (default is 100)
+        :param float window: seconds, which a request waits for requests of other threads
+            before the batch is sent (default is 0)
+
+        .. code-block:: python
+
+            from bhive.account import Account
+            from bhive.accountloader import AccountLoader
+            with AccountLoader() as loader:
+                accounts = loader.load_many(["bhive.app", "gtg", "test"])
+                # the three accounts are received by a single call
+                print(accounts[0]["name"])
+                print(Account("gtg")["name"])
+
+    """
+    def __init__(self, hive_instance=None, batch_limit=100, window=0):
+        self.hive = hive_instance or shared_hive_instance()
+        self.batch_limit = batch_limit
+        self.window = window
+        self.calls = 0
+        self._data = {}
+        self._pending = []
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._previous_loader = None
+
+    def __enter__(self):
+        self._previous_loader = self.hive.account_loader
+        self.hive.account_loader = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.hive.account_loader = self._previous_loader
+        self._previous_loader = None
+
+    def add(self, name):
+        """ Adds a name to the pending requests, which are received by the next batch
+
+            :param str name: account name
+        """
+        with self._lock:
+            if name not in self._data and name not in self._inflight and name not in self._pending:
+                self._pending.append(name)
+
+    def load(self, name):
+        """ Returns a lazy :class:`bhive.account.Account`, which is received together
+            with all pending requests, when it is accessed
+
+            :param str name: account name
+        """
+        self.add(name)
+        account = Account(name, lazy=True, hive_instance=self.hive)
+        account.loader = self
+        return account
+
+    def load_many(self, names):
+        """ Returns lazy :class:`bhive.account.Account` objects for all names, see :func:`load`
+
+            :param list names: account names
+        """
+        return [self.load(name) for name in names]
+
+    def get(self, name):
+        """ Returns the account data of name as dict or None, when the account does not
+            exist. A name, which is not loaded, is received together with all pending requests.
+
+            :param str name: account name
+        """
+        while True:
+            with self._lock:
+                if name in self._data:
+                    data = self._data[name]
+                    return dict(data) if data is not None else None
+                event = self._inflight.get(name)
+                if event is None and name not in self._pending:
+                    self._pending.append(name)
+            if event is not None:
+                # the name is received by another thread
+                event.wait()
+                continue
+            if self.window > 0:
+                time.sleep(self.window)
+            self.dispatch()
+
+    def dispatch(self):
+        """ Receives all pending requests and returns the number of calls"""
+        with self._lock:
+            names = self._pending
+            self._pending = []
+            event = threading.Event()
+            for name in names:
+                self._inflight[name] = event
+        calls = 0
+        try:
+            for i in range(0, len(names), self.batch_limit):
+                self._receive(names[i:i + self.batch_limit])
+                calls += 1
+        finally:
+            with self._lock:
+                for name in names:
+                    self._inflight.pop(name, None)
+            event.set()
+        return calls
+
+    def _receive(self, names):
+        """Receives the accounts of names by a single call and stores them in the object cache"""
+        rpc = self.hive.rpc
+        rpc.set_next_node_on_empty_reply(False)
+        if rpc.get_use_appbase():
+            accounts = rpc.find_accounts({'accounts': names}, api="database")["accounts"]
+        else:
+            accounts = rpc.get_accounts(names)
+        self.calls += 1
+        received = {}
+        for account in accounts:
+            if account:
+                received[account["name"]] = account
+                Account(dict(account), hive_instance=self.hive)
+        with self._lock:
+            for name in names:
+                self._data[name] = received.get(name)
+
+    def clear(self):
+        """ Removes all loaded accounts"""
+        with self._lock:
+            self._data = {}
+
+    def __len__(self):
+        return len(self._data)
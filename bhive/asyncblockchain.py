@@ -0,0 +1,214 @@
+# This Python file uses the following encoding: utf-8
+"""asyncio block streaming, requires python >= 3.6 and aiohttp"""
+import asyncio
+import logging
+from collections import deque
+from itertools import islice
+from .block import Block
+from .blockchain import Blockchain
+from .exceptions import BlockWaitTimeExceeded
+from bhiveapi.exceptions import ApiNotSupported
+import bhive as hv
+log = logging.getLogger(__name__)
+
+
+class AsyncBlockchain(object):
+    """ asyncio version of :class:`bhive.blockchain.Blockchain` for
+        streaming blocks and operations
+
+        :param AsyncHiveNodeRPC rpc: rpc instance, which is used for all calls
+        :param Hive hive_instance: Hive instance, which is stored in the returned
+            blocks (default is an offline instance)
+        :param str mode: (default) Irreversible block (``irreversible``) or
+            actual head block (``head``)
+        :param int max_block_wait_repetition: maximum wait repetition for next block
+            where each repetition is block_interval long (default is 3)
+
+        .. code-block:: python
+
+            import asyncio
+            from bhiveapi.asynchivenoderpc import AsyncHiveNodeRPC
+            from bhive.asyncblockchain import AsyncBlockchain
+
+            async def main():
+                chain = AsyncBlockchain(AsyncHiveNodeRPC("https://api.hive.blog"))
+                async for op in chain.stream(opNames=["transfer"]):
+                    print(op)
+
+            asyncio.get_event_loop().run_until_complete(main())
+
+    """
+    def __init__(
+        self,
+        rpc,
+        hive_instance=None,
+        mode="irreversible",
+        max_block_wait_repetition=None,
+    ):
+        self.rpc = rpc
+        self.hive = hive_instance or hv.Hive(offline=True)
+        if mode == "irreversible":
+            self.mode = 'last_irreversible_block_num'
+        elif mode == "head":
+            self.mode = "head_block_number"
+        else:
+            raise ValueError("invalid value for 'mode'!")
+        if max_block_wait_repetition:
+            self.max_block_wait_repetition = max_block_wait_repetition
+        else:
+            self.max_block_wait_repetition = 3
+        self.block_interval = None
+
+    def is_irreversible_mode(self):
+        return self.mode == 'last_irreversible_block_num'
+
+    async def get_block_interval(self):
+        """Returns the block interval in seconds"""
+        if self.block_interval is None:
+            self.block_interval = 3
+            props = await self.rpc.get_config(api="database")
+            for key in props or {}:
+                if key[-14:] == "BLOCK_INTERVAL":
+                    self.block_interval = props[key]
+        return self.block_interval
+
+    async def get_current_block_num(self):
+        """ This call returns the current block number
+
+            .. note:: The block number returned depends on the ``mode`` used
+                      when instantiating from this class.
+        """
+        props = await self.rpc.get_dynamic_global_properties(api="database", next_node_on_empty_reply=True)
+        if props is None:
+            raise ValueError("Could not receive dynamic_global_properties!")
+        if self.mode not in props:
+            raise ValueError(self.mode + " is not in " + str(props))
+        return int(props.get(self.mode))
+
+    async def get_block(self, block_num, only_ops=False, only_virtual_ops=False):
+        """ Returns the block ``block_num`` or None, when it does not exist (yet)
+
+            :param int block_num: block number
+            :param bool only_ops: Returns block with operations only, when set to True (default: False)
+            :param bool only_virtual_ops: Includes only virtual operations (default: False)
+        """
+        if only_ops or only_virtual_ops:
+            if self.rpc.get_use_appbase():
+                try:
+                    ops = await self.rpc.get_ops_in_block({"block_num": block_num, 'only_virtual': only_virtual_ops}, api="account_history")
+                    ops = ops["ops"]
+                except ApiNotSupported:
+                    ops = await self.rpc.get_ops_in_block(block_num, only_virtual_ops, api="condenser")
+            else:
+                ops = await self.rpc.get_ops_in_block(block_num, only_virtual_ops)
+            if bool(ops):
+                block = {'block': ops[0]["block"],
+                         'timestamp': ops[0]["timestamp"],
+                         'operations': ops}
+            else:
+                block = {'block': block_num,
+                         'timestamp': "1970-01-01T00:00:00",
+                         'operations': []}
+        else:
+            if self.rpc.get_use_appbase():
+                try:
+                    block = await self.rpc.get_block({"block_num": block_num}, api="block")
+                    if block and "block" in block:
+                        block = block["block"]
+                except ApiNotSupported:
+                    block = await self.rpc.get_block(block_num, api="condenser")
+            else:
+                block = await self.rpc.get_block(block_num)
+        if not block:
+            return None
+        block = Block(block, only_ops=only_ops, only_virtual_ops=only_virtual_ops, hive_instance=self.hive)
+        block["id"] = block.block_num
+        block.identifier = block.block_num
+        return block
+
+    async def wait_for_and_get_block(self, block_number, only_ops=False, only_virtual_ops=False):
+        """ Get the desired block from the chain, waits when the block does not exist yet,
+            but a maximum of max_block_wait_repetition block intervals
+
+            :param int block_number: desired block number
+            :param bool only_ops: Returns blocks with operations only, when set to True (default: False)
+            :param bool only_virtual_ops: Includes only virtual operations (default: False)
+        """
+        block_interval = await self.get_block_interval()
+        repetition = 0
+        block = await self.get_block(block_number, only_ops=only_ops, only_virtual_ops=only_virtual_ops)
+        while block is None or block.block_num is None:
+            if repetition > self.max_block_wait_repetition:
+                raise BlockWaitTimeExceeded("Already waited %d s" % (self.max_block_wait_repetition * block_interval))
+            repetition += 1
+            await asyncio.sleep(block_interval)
+            block = await self.get_block(block_number, only_ops=only_ops, only_virtual_ops=only_virtual_ops)
+        return block
+
+    async def blocks(self, start=None, stop=None, only_ops=False, only_virtual_ops=False, concurrency=8):
+        """ Yields blocks starting from ``start`` in order, while up to ``concurrency``
+            blocks are requested at the same time.
+
+            :param int start: Starting block
+            :param int stop: Stop at this block
+            :param bool only_ops: Only yield operations (default: False).
+                Cannot be combined with ``only_virtual_ops=True``.
+            :param bool only_virtual_ops: Only yield virtual operations (default: False)
+            :param int concurrency: number of simultaneous block requests (default is 8)
+
+            .. note:: If you want instant confirmation, you need to instantiate
+                      class:`bhive.asyncblockchain.AsyncBlockchain` with
+                      ``mode="head"``, otherwise, the call will wait until
+                      confirmed in an irreversible block.
+
+        """
+        block_interval = await self.get_block_interval()
+        if not start:
+            start = await self.get_current_block_num()
+        window = deque()
+        try:
+            while True:
+                if stop:
+                    head_block = stop
+                else:
+                    head_block = await self.get_current_block_num()
+                block_nums = iter(range(start, head_block + 1))
+                for blocknum in islice(block_nums, concurrency):
+                    window.append(asyncio.ensure_future(self.wait_for_and_get_block(blocknum, only_ops=only_ops, only_virtual_ops=only_virtual_ops)))
+                while len(window) > 0:
+                    block = await window.popleft()
+                    # Refill the window before handing the block to the consumer
+                    for blocknum in islice(block_nums, 1):
+                        window.append(asyncio.ensure_future(self.wait_for_and_get_block(blocknum, only_ops=only_ops, only_virtual_ops=only_virtual_ops)))
+                    yield block
+                # Set new start
+                start = head_block + 1
+
+                if stop and start > stop:
+                    return
+
+                # Sleep for one block
+                await asyncio.sleep(block_interval)
+        finally:
+            for task in window:
+                task.cancel()
+
+    async def stream(self, opNames=[], raw_ops=False, *args, **kwargs):
+        """ Yield specific operations (e.g. comments) only, see :func:`bhive.blockchain.Blockchain.stream`
+
+            :param array opNames: List of operations to filter for
+            :param bool raw_ops: When set to True, it returns the unmodified operations (default: False)
+            :param bool op_views: When set to True, :class:`bhive.blockchain.OperationView` objects
+                are yielded instead of dicts (default: False)
+            :param int start: Start at this block
+            :param int stop: Stop at this block
+            :param bool only_ops: Only yield operations (default: False)
+                Cannot be combined with ``only_virtual_ops=True``
+            :param bool only_virtual_ops: Only yield virtual operations (default: False)
+            :param int concurrency: number of simultaneous block requests (default is 8)
+
+        """
+        op_views = kwargs.pop("op_views", False)
+        async for block in self.blocks(**kwargs):
+            for op in Blockchain.block_operations(block, opNames=opNames, raw_ops=raw_ops, op_views=op_views):
+                yield op
@@ -317,6 +317,8 @@ class BlockHeader(BlockchainObject):
         self.lazy = lazy
         if isinstance(block, float):
             block = int(block)
+        elif isinstance(block, dict):
+            block = self._parse_json_data(block)
         super(BlockHeader, self).__init__(
             block,
             lazy=lazy,
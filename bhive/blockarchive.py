@@ -0,0 +1,259 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import object
+import os
+import json
+import mmap
+import zlib
+import struct
+import threading
+import logging
+from .block import Block
+log = logging.getLogger(__name__)
+
+INDEX_MAGIC = b"BHIVEIDX"
+INDEX_HEADER = struct.Struct("<8sQ")
+INDEX_ENTRY = struct.Struct("<QI")
+
+
+class BlockArchive(object):
+    """ Append-only archive of blocks on the local disk
+
+        The blocks are stored zlib compressed in the segment file ``blocks.dat``.
+        The fixed-width index ``blocks.idx`` stores the offset and length of each
+        block and is memory-mapped for reading, so that a block is read with a single
+        lookup. Blocks can be appended in any order, missing blocks are allowed, but
+        blocks below ``first_block`` cannot be stored.
+
+        Several processes can read an archive, while a single process appends to it.
+        A block is added to the index after its data was written, readers therefore
+        never see incomplete blocks. Within a process, the archive can be used by
+        several threads.
+
+        :param str path: directory of the archive, which is created when needed
+        :param bool compress: When True, blocks are compressed (default is True)
+        :param bool read_only: When True, the archive is opened for reading only (default is False)
+        :param int first_block: lowest block number of a new archive (default is the
+            first appended block)
+
+        .. code-block:: python
+
+            from bhive.blockchain import Blockchain
+            from bhive.blockarchive import BlockArchive
+            archive = BlockArchive("blocks")
+            blockchain = Blockchain()
+            # Missing blocks are read from the node and stored in the archive
+            for block in blockchain.blocks(start=40000000, stop=40100000, archive=archive):
+                print(block.block_num)
+
+    """
+    def __init__(self, path, compress=True, read_only=False, first_block=None):
+        self.path = path
+        self.compress = compress
+        self.read_only = read_only
+        self.data_filename = os.path.join(path, "blocks.dat")
+        self.index_filename = os.path.join(path, "blocks.idx")
+        self._lock = threading.RLock()
+        # (map, size) of the index, which is replaced as a whole on a remap
+        self._index = (None, 0)
+        self.first_block = None
+        if not read_only:
+            if not os.path.isdir(path):
+                os.makedirs(path)
+            for filename in [self.data_filename, self.index_filename]:
+                if not os.path.isfile(filename):
+                    open(filename, "ab").close()
+            self._data_file = open(self.data_filename, "r+b")
+            self._index_file = open(self.index_filename, "r+b")
+        else:
+            self._data_file = open(self.data_filename, "rb")
+            self._index_file = open(self.index_filename, "rb")
+        self._read_header()
+        if self.first_block is None and first_block is not None and not read_only:
+            self._write_header(first_block)
+
+    def _write_header(self, first_block):
+        self._index_file.seek(0)
+        self._index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, first_block))
+        self._index_file.flush()
+        self.first_block = first_block
+
+    def _read_header(self):
+        self._index_file.seek(0)
+        header = self._index_file.read(INDEX_HEADER.size)
+        if len(header) < INDEX_HEADER.size:
+            return
+        magic, first_block = INDEX_HEADER.unpack(header)
+        if magic != INDEX_MAGIC:
+            raise ValueError("%s is not a block archive index" % self.index_filename)
+        self.first_block = first_block
+
+    def _remap(self):
+        """ Maps the index file again, when it has grown, and returns (map, size)
+            of the index. The previous map is not closed, as other threads may still
+            read from it, it is released with its last reference.
+        """
+        with self._lock:
+            index_map, index_size = self._index
+            size = os.fstat(self._index_file.fileno()).st_size
+            if size == index_size and index_map is not None:
+                return self._index
+            if self.first_block is None:
+                self._read_header()
+            index_map = None
+            if size > 0:
+                index_map = mmap.mmap(self._index_file.fileno(), size, access=mmap.ACCESS_READ)
+            self._index = (index_map, size)
+            return self._index
+
+    def _get_entry(self, block_num):
+        """Returns (offset, length) of block_num or None"""
+        index_map, index_size = self._index
+        if self.first_block is None:
+            index_map, index_size = self._remap()
+        if self.first_block is None or block_num < self.first_block:
+            return None
+        position = INDEX_HEADER.size + (block_num - self.first_block) * INDEX_ENTRY.size
+        if position + INDEX_ENTRY.size > index_size:
+            index_map, index_size = self._remap()
+            if position + INDEX_ENTRY.size > index_size:
+                return None
+        offset, length = INDEX_ENTRY.unpack_from(index_map, position)
+        if length == 0:
+            return None
+        return offset, length
+
+    @property
+    def last_block(self):
+        """Returns the highest block number in the index or None"""
+        index_map, index_size = self._remap()
+        if self.first_block is None or index_size <= INDEX_HEADER.size:
+            return None
+        block_num = self.first_block + (index_size - INDEX_HEADER.size) // INDEX_ENTRY.size - 1
+        while block_num >= self.first_block and self._get_entry(block_num) is None:
+            block_num -= 1
+        if block_num < self.first_block:
+            return None
+        return block_num
+
+    def __contains__(self, block_num):
+        return self._get_entry(int(block_num)) is not None
+
+    def get(self, block_num):
+        """ Returns the stored block as dict or None
+
+            :param int block_num: block number
+        """
+        entry = self._get_entry(int(block_num))
+        if entry is None:
+            return None
+        offset, length = entry
+        with self._lock:
+            self._data_file.seek(offset)
+            data = self._data_file.read(length)
+        if data[:1] != b"{":
+            data = zlib.decompress(data)
+        return json.loads(data.decode("utf-8"))
+
+    def get_block(self, block_num, hive_instance=None):
+        """ Returns the stored block as :class:`bhive.block.Block` or None
+
+            :param int block_num: block number
+            :param Hive hive_instance: Hive instance
+        """
+        block = self.get(block_num)
+        if block is None:
+            return None
+        block = Block(block, hive_instance=hive_instance)
+        block["id"] = block.block_num
+        block.identifier = block.block_num
+        return block
+
+    def blocks(self, start, stop):
+        """ Yields the stored blocks from start to stop (including stop) as dict,
+            missing blocks are skipped
+
+            :param int start: first block
+            :param int stop: last block
+        """
+        for block_num in range(start, stop + 1):
+            block = self.get(block_num)
+            if block is not None:
+                yield block
+
+    def missing_blocks(self, start, stop):
+        """ Returns the block numbers from start to stop (including stop),
+            which are not stored
+
+            :param int start: first block
+            :param int stop: last block
+        """
+        return [block_num for block_num in range(start, stop + 1) if self._get_entry(block_num) is None]
+
+    def append(self, block):
+        """ Stores a block, an already stored block is not replaced
+
+            :param block: full block as dict or :class:`bhive.block.Block`
+        """
+        if self.read_only:
+            raise IOError("BlockArchive is read only")
+        if isinstance(block, Block):
+            block_num = block.block_num
+            block = block.json()
+        else:
+            block_num = int(block["block_id"][:8], base=16)
+            block = dict(block)
+        block.pop("id", None)
+        data = json.dumps(block, separators=(',', ':')).encode("utf-8")
+        if self.compress:
+            data = zlib.compress(data)
+        with self._lock:
+            if self.first_block is None:
+                self._write_header(block_num)
+            if block_num < self.first_block:
+                raise ValueError("Block %d is lower than the first block %d of the archive" % (block_num, self.first_block))
+            if self._get_entry(block_num) is not None:
+                return
+            self._data_file.seek(0, os.SEEK_END)
+            offset = self._data_file.tell()
+            self._data_file.write(data)
+            self._data_file.flush()
+            # The index entry is written after the data
+            position = INDEX_HEADER.size + (block_num - self.first_block) * INDEX_ENTRY.size
+            self._index_file.seek(0, os.SEEK_END)
+            if self._index_file.tell() < position:
+                self._index_file.write(b"\x00" * (position - self._index_file.tell()))
+            self._index_file.seek(position)
+            self._index_file.write(INDEX_ENTRY.pack(offset, len(data)))
+            self._index_file.flush()
+
+    def flush(self):
+        """ Writes all appended blocks to disk"""
+        if self.read_only:
+            return
+        with self._lock:
+            for f in [self._data_file, self._index_file]:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def close(self):
+        """ Closes the archive files"""
+        with self._lock:
+            index_map, index_size = self._index
+            if index_map is not None:
+                index_map.close()
+            self._index = (None, 0)
+            self._data_file.close()
+            self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return "<BlockArchive %s first_block=%s last_block=%s>" % (self.path, str(self.first_block), str(self.last_block))
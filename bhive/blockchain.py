@@ -14,18 +14,20 @@ import json
 import math
 from threading import Thread, Event
 from time import sleep
+from collections import deque
+from itertools import cycle, islice
 import logging
 from datetime import datetime, timedelta
-from .utils import formatTimeString, addTzInfo
+from .utils import formatTimeString, addTzInfo, windowed_map
 from .block import Block, BlockHeader
+from .blockdecoder import BlockDecoderPool
 from bhiveapi.node import Nodes
 from bhiveapi.hivenoderpc import HiveNodeRPC
 from .exceptions import BatchedCallsNotSupported, BlockDoesNotExistsException, BlockWaitTimeExceeded, OfflineHasNoRPCException
-from bhiveapi.exceptions import NumRetriesReached
+from bhiveapi.exceptions import NumRetriesReached, ApiNotSupported, NoApiWithName, NoMethodWithName, RPCError
 from bhivegraphenebase.py23 import py23_bytes
 from bhive.instance import shared_hive_instance
 from .amount import Amount
-import bhive as hv
 log = logging.getLogger(__name__)
 if sys.version_info < (3, 0):
     from Queue import Queue
@@ -34,7 +36,7 @@ else:
 FUTURES_MODULE = None
 if not FUTURES_MODULE:
     try:
-        from concurrent.futures import ThreadPoolExecutor, wait, as_completed
+        from concurrent.futures import wait
         FUTURES_MODULE = "futures"
         # FUTURES_MODULE = None
     except ImportError:
@@ -172,6 +174,120 @@ class Pool:
         return results
 
 
+OPERATION_VIEW_KEYS = ("type", "_id", "timestamp", "block_num", "trx_num", "trx_id")
+
+
+class OperationView(object):
+    """ Lightweight read-only view of a streamed operation, which is yielded by
+        :func:`Blockchain.stream` with ``op_views=True``
+
+        The operation fields are read from the operation dict of the block, which is
+        not copied. ``type``, ``block_num``, ``trx_num``, ``trx_id`` and ``timestamp`` are
+        attributes, ``_id`` is computed when it is accessed for the first time.
+        Item access (``op["from"]``) works as for the dicts of :func:`Blockchain.stream`,
+        :func:`as_dict` returns such a dict.
+
+        .. note:: The view must not be changed and keeps a reference to the block data.
+    """
+    __slots__ = ["type", "block_num", "trx_num", "trx_id", "timestamp", "op", "_event", "_hash"]
+
+    def __init__(self, op_type, op, block_num, trx_num, trx_id, timestamp, event):
+        self.type = op_type
+        self.op = op
+        self.block_num = block_num
+        self.trx_num = trx_num
+        self.trx_id = trx_id
+        self.timestamp = timestamp
+        self._event = event
+        self._hash = None
+
+    @property
+    def _id(self):
+        """Returns the operation hash, see :func:`Blockchain.hash_op`"""
+        if self._hash is None:
+            self._hash = Blockchain.hash_op(self._event)
+        return self._hash
+
+    def __getitem__(self, key):
+        if key in OPERATION_VIEW_KEYS:
+            return getattr(self, key)
+        return self.op[key]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in OPERATION_VIEW_KEYS or key in self.op
+
+    def keys(self):
+        return ["type"] + list(self.op.keys()) + list(OPERATION_VIEW_KEYS[1:])
+
+    def as_dict(self):
+        """Returns the operation as dict in the output format of :func:`Blockchain.stream`"""
+        updated_op = {"type": self.type}
+        updated_op.update(self.op.copy())
+        updated_op.update({"_id": self._id,
+                           "timestamp": self.timestamp,
+                           "block_num": self.block_num,
+                           "trx_num": self.trx_num,
+                           "trx_id": self.trx_id})
+        return updated_op
+
+    def __repr__(self):
+        return "<OperationView %s block_num=%s trx_num=%s>" % (self.type, str(self.block_num), str(self.trx_num))
+
+
+class ForkTracker(object):
+    """ Stores the block ids of the last yielded blocks, in order to detect
+        blocks which are not built on the previously yielded block (micro forks)
+
+        :param int max_blocks: number of block ids which are stored (default is 50)
+    """
+    def __init__(self, max_blocks=50):
+        self.blocks = deque(maxlen=max_blocks)
+
+    def add(self, block):
+        """Stores a block, which follows the last stored block"""
+        self.blocks.append(block)
+
+    @property
+    def last_block_num(self):
+        if len(self.blocks) == 0:
+            return None
+        return self.blocks[-1].block_num
+
+    def is_continuous(self, block):
+        """ Returns False, when block follows the last stored block, but its
+            previous block id differs. The stored blocks are removed, when block
+            does not follow the last stored block.
+        """
+        if len(self.blocks) == 0:
+            return True
+        if block.block_num != self.last_block_num + 1:
+            self.blocks.clear()
+            return True
+        return block.get("previous") == self.blocks[-1].get("block_id")
+
+    def get_block_id(self, block_num):
+        """Returns the stored block id of block_num or None"""
+        if len(self.blocks) == 0:
+            return None
+        index = block_num - self.blocks[0].block_num
+        if index < 0 or index >= len(self.blocks):
+            return None
+        return self.blocks[index].get("block_id")
+
+    def rollback(self, block_num):
+        """Removes and returns all stored blocks above block_num, the newest block first"""
+        removed = []
+        while len(self.blocks) > 0 and self.blocks[-1].block_num > block_num:
+            removed.append(self.blocks.pop())
+        return removed
+
+
 @python_2_unicode_compatible
 class Blockchain(object):
     """ This class allows to access the blockchain and read data
@@ -182,6 +298,9 @@ class Blockchain(object):
             actual head block (``head``)
         :param int max_block_wait_repetition: maximum wait repetition for next block
             where each repetition is block_interval long (default is 3)
+        :param BlockSource block_source: When set, blocks are read from this source
+            (:class:`bhive.blocksource.BlockSource`) instead of the node, e.g. from a
+            file, an archive or from memory
 
         This class let's you deal with blockchain related data and methods.
         Read blockchain related data:
@@ -228,8 +347,10 @@ class Blockchain(object):
         mode="irreversible",
         max_block_wait_repetition=None,
         data_refresh_time_seconds=900,
+        block_source=None,
     ):
         self.hive = hive_instance or shared_hive_instance()
+        self.block_source = block_source
 
         if mode == "irreversible":
             self.mode = 'last_irreversible_block_num'
@@ -242,6 +363,9 @@ class Blockchain(object):
         else:
             self.max_block_wait_repetition = 3
         self.block_interval = self.hive.get_block_interval()
+        self.enum_virtual_ops_supported = None
+        self.block_range_supported = None
+        self.max_block_range = 1000
 
     def is_irreversible_mode(self):
         return self.mode == 'last_irreversible_block_num'
@@ -280,6 +404,8 @@ class Blockchain(object):
             .. note:: The block number returned depends on the ``mode`` used
                       when instantiating from this class.
         """
+        if self.block_source is not None:
+            return self.block_source.get_current_block_num()
         props = self.hive.get_dynamic_global_properties(False)
         if props is None:
             raise ValueError("Could not receive dynamic_global_properties!")
@@ -354,6 +480,11 @@ class Blockchain(object):
                     delta = -1
                 elif delta == 0 and block_time_diff.total_seconds() > 0:
                     delta = 1
+                if abs(block_time_diff.total_seconds()) > self.block_interval and abs(delta) <= 10 and self.hive.rpc.get_use_appbase():
+                    # Close to the target, all neighbouring headers are received at once
+                    headers = list(self.block_headers(max(int(block_number + delta) - 10, 1), min(int(block_number + delta) + 10, last_block.identifier)))
+                    if len(headers) > 0:
+                        return int(min(headers, key=lambda h: abs((date - h.time()).total_seconds())).block_num)
                 block_number += delta
                 if block_number < 1:
                     break
@@ -368,7 +499,7 @@ class Blockchain(object):
 
             :param int block_num: Block number
         """
-        return Block(
+        return BlockHeader(
             block_num,
             hive_instance=self.hive
         ).time()
@@ -379,24 +510,67 @@ class Blockchain(object):
 
             :param int block_num: Block number
         """
-        block_time = Block(
+        block_time = BlockHeader(
             block_num,
             hive_instance=self.hive
         ).time()
         return int(time.mktime(block_time.timetuple()))
 
-    def blocks(self, start=None, stop=None, max_batch_size=None, threading=False, thread_num=8, only_ops=False, only_virtual_ops=False):
+    def blocks(
+        self,
+        start=None,
+        stop=None,
+        max_batch_size=None,
+        threading=False,
+        thread_num=8,
+        only_ops=False,
+        only_virtual_ops=False,
+        virtual_op_range=None,
+        use_block_range=False,
+        checkpoint=None,
+        on_rollback=None,
+        fork_depth=50,
+        archive=None,
+        block_source=None,
+    ):
         """ Yields blocks starting from ``start``.
 
             :param int start: Starting block
             :param int stop: Stop at this block
             :param int max_batch_size: only for appbase nodes. When not None, batch calls of are used.
-                Cannot be combined with threading
-            :param bool threading: Enables threading. Cannot be combined with batch calls
+                When combined with threading, the batches are distributed over ``thread_num`` connections.
+            :param bool threading: Enables threading.
             :param int thread_num: Defines the number of threads, when `threading` is set.
+                Up to ``thread_num`` blocks (or batches) are fetched ahead of the yielded block.
             :param bool only_ops: Only yield operations (default: False).
                 Cannot be combined with ``only_virtual_ops=True``.
             :param bool only_virtual_ops: Only yield virtual operations (default: False)
+            :param int virtual_op_range: When set and only_virtual_ops is True, the virtual
+                operations of irreversible blocks are received by ``enum_virtual_ops`` calls,
+                which cover up to virtual_op_range blocks (appbase only, e.g. 1000).
+                When None (default), ``get_ops_in_block`` is called for each block.
+            :param bool use_block_range: When True, blocks are received by ``get_block_range``
+                calls of up to ``max_block_range`` blocks (appbase only, default is False).
+                When combined with threading, each thread receives ``max_batch_size``
+                (or ``max_block_range``) blocks per call.
+            :param Checkpoint checkpoint: When set, the stream continues after the last processed
+                block stored in the checkpoint (:class:`bhive.checkpoint.Checkpoint`), the stored
+                position has priority over ``start``. A block counts as processed, when the next
+                block is requested. The last yielded block is yielded again after a restart, when
+                the stream was closed before (e.g. by ``break`` or an exception of the consumer).
+            :param on_rollback: When set, the block ids of the last ``fork_depth`` blocks are tracked.
+                When a new block is not built on the previously yielded block (micro fork in
+                ``mode="head"``), ``on_rollback(blocks)`` is called with the orphaned blocks (newest
+                first) and the replacing blocks are yielded again. Needs full blocks.
+            :param int fork_depth: number of blocks which can be rolled back (default is 50)
+            :param BlockArchive archive: When set, blocks are read from the local archive
+                (:class:`bhive.blockarchive.BlockArchive`) and only missing blocks are received
+                from the node. In irreversible mode, received blocks are added to the archive.
+                Needs full blocks.
+            :param BlockSource block_source: When set, blocks are read from this source
+                (:class:`bhive.blocksource.BlockSource`) instead of the ``block_source`` of the
+                Blockchain instance or the node. A source which does not receive new blocks
+                ends the stream after its last block, when ``stop`` is not set.
 
             .. note:: If you want instant confirmation, you need to instantiate
                       class:`bhive.blockchain.Blockchain` with
@@ -404,24 +578,73 @@ class Blockchain(object):
                       confirmed in an irreversible block.
 
         """
+        if on_rollback is not None and (only_ops or only_virtual_ops):
+            raise ValueError("on_rollback needs full blocks, only_ops and only_virtual_ops must be False")
+        if archive is not None and (only_ops or only_virtual_ops):
+            raise ValueError("archive needs full blocks, only_ops and only_virtual_ops must be False")
+        if checkpoint is not None:
+            if checkpoint.get_start_block() is not None:
+                start = checkpoint.get_start_block()
+            if on_rollback is not None:
+                on_rollback = self._get_checkpoint_rollback_handler(checkpoint, on_rollback)
+            try:
+                for block in self.blocks(start=start, stop=stop, max_batch_size=max_batch_size, threading=threading,
+                                         thread_num=thread_num, only_ops=only_ops, only_virtual_ops=only_virtual_ops,
+                                         virtual_op_range=virtual_op_range, use_block_range=use_block_range,
+                                         on_rollback=on_rollback, fork_depth=fork_depth, archive=archive,
+                                         block_source=block_source):
+                    yield block
+                    # The consumer requests the next block, so the yielded block was processed
+                    checkpoint.set(block.block_num)
+            finally:
+                checkpoint.flush()
+            return
+        if on_rollback is not None:
+            blocks = self.blocks(start=start, stop=stop, max_batch_size=max_batch_size, threading=threading,
+                                 thread_num=thread_num, virtual_op_range=virtual_op_range,
+                                 use_block_range=use_block_range, archive=archive, block_source=block_source)
+            for block in self._fork_aware_blocks(blocks, on_rollback, fork_depth):
+                yield block
+            return
+        if archive is not None:
+            for block in self._archive_blocks(archive, start, stop, max_batch_size=max_batch_size, threading=threading,
+                                              thread_num=thread_num, use_block_range=use_block_range,
+                                              block_source=block_source):
+                yield block
+            return
+        if block_source is None:
+            block_source = self.block_source
+        if block_source is not None:
+            # Only changed parameters are passed, so that the defaults of the source are kept
+            source_kwargs = {}
+            if max_batch_size is not None:
+                source_kwargs["max_batch_size"] = max_batch_size
+            if threading:
+                source_kwargs.update({"threading": threading, "thread_num": thread_num})
+            if virtual_op_range is not None:
+                source_kwargs["virtual_op_range"] = virtual_op_range
+            if use_block_range:
+                source_kwargs["use_block_range"] = use_block_range
+            for block in self._source_blocks(block_source, start, stop, only_ops=only_ops,
+                                             only_virtual_ops=only_virtual_ops, **source_kwargs):
+                yield block
+            return
         # Let's find out how often blocks are generated!
         current_block = self.get_current_block()
         current_block_num = current_block.block_num
         if not start:
             start = current_block_num
         head_block_reached = False
-        if threading and FUTURES_MODULE is not None:
-            pool = ThreadPoolExecutor(max_workers=thread_num)
-        elif threading:
+        pool = None
+        if threading:
+            # The worker threads and their connections are reused by later calls
+            pool = self.hive.get_worker_pool(thread_num)
+        prefetch = pool is not None
+        if threading and pool is None:
             pool = Pool(thread_num, batch_mode=True)
         if threading:
-            hive_instance = [self.hive]
-            nodelist = self.hive.rpc.nodes.export_working_nodes()
-            for i in range(thread_num - 1):
-                hive_instance.append(hv.Hive(node=nodelist,
-                                                num_retries=self.hive.rpc.num_retries,
-                                                num_retries_call=self.hive.rpc.num_retries_call,
-                                                timeout=self.hive.rpc.timeout))
+            # The rpc instance is shared, each thread uses its own connection
+            hive_instance = [self.hive] * thread_num
         # We are going to loop indefinitely
         latest_block = 0
         while True:
@@ -430,46 +653,50 @@ class Blockchain(object):
             else:
                 current_block_num = self.get_current_block_num()
                 head_block = current_block_num
-            if threading and not head_block_reached:
+            if only_virtual_ops and virtual_op_range and self._enum_virtual_ops_supported():
+                for block in self.virtual_op_blocks(start, head_block, block_range=virtual_op_range,
+                                                    block_number_check_cnt=5,
+                                                    last_current_block_num=current_block_num):
+                    yield block
+            elif use_block_range and not (only_ops or only_virtual_ops) and self._block_range_supported():
+                if prefetch and not head_block_reached:
+                    for block in self._prefetch_blocks(range(start, head_block + 1), pool, hive_instance,
+                                                       batch_size=max_batch_size or self.max_block_range,
+                                                       block_range=True):
+                        yield block
+                else:
+                    for block in self.range_blocks(start, head_block, block_number_check_cnt=5,
+                                                   last_current_block_num=current_block_num):
+                        yield block
+            elif prefetch and not head_block_reached:
+                for block in self._prefetch_blocks(range(start, head_block + 1), pool, hive_instance,
+                                                   only_ops=only_ops, only_virtual_ops=only_virtual_ops,
+                                                   batch_size=max_batch_size):
+                    yield block
+            elif threading and not head_block_reached:
                 latest_block = start - 1
                 result_block_nums = []
                 for blocknum in range(start, head_block + 1, thread_num):
-                    # futures = []
                     i = 0
-                    if FUTURES_MODULE is not None:
-                        futures = []
                     block_num_list = []
-                    # freeze = self.hive.rpc.nodes.freeze_current_node
+                    results = []
                     num_retries = self.hive.rpc.nodes.num_retries
-                    # self.hive.rpc.nodes.freeze_current_node = True
                     self.hive.rpc.nodes.num_retries = thread_num
                     error_cnt = self.hive.rpc.nodes.node.error_cnt
                     while i < thread_num and blocknum + i <= head_block:
                         block_num_list.append(blocknum + i)
-                        results = []
-                        if FUTURES_MODULE is not None:
-                            futures.append(pool.submit(Block, blocknum + i, only_ops=only_ops, only_virtual_ops=only_virtual_ops, hive_instance=hive_instance[i]))
-                        else:
-                            pool.enqueue(Block, blocknum + i, only_ops=only_ops, only_virtual_ops=only_virtual_ops, hive_instance=hive_instance[i])
+                        pool.enqueue(Block, blocknum + i, only_ops=only_ops, only_virtual_ops=only_virtual_ops, hive_instance=hive_instance[i])
                         i += 1
-                    if FUTURES_MODULE is not None:
-                        try:
-                            results = [r.result() for r in as_completed(futures)]
-                        except Exception as e:
-                            log.error(str(e))
-                    else:
-                        pool.run(True)
-                        pool.join()
-                        for result in pool.results():
-                            results.append(result)
-                        pool.abort()
+                    pool.run(True)
+                    pool.join()
+                    for result in pool.results():
+                        results.append(result)
+                    pool.abort()
                     self.hive.rpc.nodes.num_retries = num_retries
-                    # self.hive.rpc.nodes.freeze_current_node = freeze
                     new_error_cnt = self.hive.rpc.nodes.node.error_cnt
                     self.hive.rpc.nodes.node.error_cnt = error_cnt
                     if new_error_cnt > error_cnt:
                         self.hive.rpc.nodes.node.error_cnt += 1
-                    #    self.hive.rpc.next()
 
                     checked_results = []
                     for b in results:
@@ -573,6 +800,543 @@ class Blockchain(object):
             # Sleep for one block
             time.sleep(self.block_interval)
 
+    def _fork_aware_blocks(self, blocks, on_rollback, fork_depth=50):
+        """ Yields the blocks of ``blocks``, while micro forks are detected by the
+            previous block ids. After a fork, ``on_rollback`` is called with the
+            orphaned blocks and the blocks of the new fork are yielded.
+        """
+        tracker = ForkTracker(max_blocks=fork_depth)
+        for block in blocks:
+            while not tracker.is_continuous(block):
+                # Walk back until the stored block id matches the block of the node
+                replacements = []
+                block_num = block.block_num - 1
+                while block_num >= tracker.blocks[0].block_num:
+                    canonical = Block(block_num, hive_instance=self.hive)
+                    canonical["id"] = canonical.block_num
+                    canonical.identifier = canonical.block_num
+                    if canonical["block_id"] == tracker.get_block_id(block_num):
+                        break
+                    replacements.insert(0, canonical)
+                    block_num -= 1
+                if block_num == block.block_num - 1:
+                    # The stored blocks are still valid, block belongs to an orphaned fork
+                    block = Block(block.block_num, hive_instance=self.hive)
+                    block["id"] = block.block_num
+                    block.identifier = block.block_num
+                    continue
+                if block_num < tracker.blocks[0].block_num:
+                    log.warning("Fork is deeper than %d blocks" % fork_depth)
+                orphaned = tracker.rollback(block_num)
+                log.warning("Micro fork detected, %d blocks were replaced" % len(orphaned))
+                on_rollback(orphaned)
+                for replacement in replacements:
+                    if not tracker.is_continuous(replacement):
+                        # The node has switched to another fork in between
+                        break
+                    tracker.add(replacement)
+                    yield replacement
+            tracker.add(block)
+            yield block
+
+    def _source_blocks(self, block_source, start, stop, only_ops=False, only_virtual_ops=False, **kwargs):
+        """ Yields the blocks from start to stop of ``block_source``. When stop is not set,
+            new blocks of a live source are awaited, other sources stop after their last block.
+            The remaining kwargs are passed to the source.
+        """
+        if not start:
+            if block_source.is_live:
+                start = block_source.get_current_block_num()
+            else:
+                start = block_source.get_first_block_num()
+        while True:
+            if stop:
+                head_block = stop
+            else:
+                head_block = block_source.get_current_block_num()
+            if start is None or head_block is None:
+                return
+            if start <= head_block:
+                for block in block_source.blocks(start, head_block, only_ops=only_ops,
+                                                 only_virtual_ops=only_virtual_ops, **kwargs):
+                    yield block
+            start = max(start, head_block + 1)
+            if (stop and start > stop) or not block_source.is_live:
+                return
+            # Sleep for one block
+            time.sleep(self.block_interval)
+
+    def _archive_blocks(self, archive, start, stop, **kwargs):
+        """ Yields the blocks from start to stop, stored blocks are read from archive
+            and the gaps are filled by :func:`blocks`. In irreversible mode, the received
+            blocks are appended to the archive, when they are not below its first block.
+        """
+        store = self.is_irreversible_mode() and not archive.read_only
+        if not start:
+            start = self.get_current_block_num()
+        blocknum = start
+        while stop is None or blocknum <= stop:
+            block = archive.get_block(blocknum, hive_instance=self.hive)
+            if block is not None:
+                yield block
+                blocknum += 1
+                continue
+            # Find the end of the gap
+            gap_stop = blocknum
+            last_block = archive.last_block
+            if last_block is None or last_block < blocknum:
+                gap_stop = stop
+            else:
+                while (stop is None or gap_stop < stop) and (gap_stop + 1) not in archive:
+                    gap_stop += 1
+            for block in self.blocks(start=blocknum, stop=gap_stop, **kwargs):
+                if store and (archive.first_block is None or block.block_num >= archive.first_block):
+                    archive.append(block)
+                yield block
+                blocknum = block.block_num + 1
+            if gap_stop is None:
+                return
+            blocknum = gap_stop + 1
+
+    def _get_checkpoint_rollback_handler(self, checkpoint, on_rollback):
+        """Returns a rollback handler, which moves the checkpoint before the orphaned blocks"""
+        def handler(blocks):
+            if len(blocks) > 0:
+                checkpoint.set(blocks[-1].block_num - 1)
+                checkpoint.flush()
+            on_rollback(blocks)
+        return handler
+
+    def _prefetch_blocks(self, block_nums, pool, hive_instances, only_ops=False, only_virtual_ops=False,
+                         batch_size=None, block_range=False, max_block_retries=5):
+        """ Yields the blocks of ``block_nums`` in order, while a sliding window of
+            ``len(hive_instances)`` requests is kept in flight.
+
+            A new request is submitted as soon as a request leaves the window, so that
+            a single slow response only delays the blocks behind it.
+
+            :param iterable block_nums: ascending block numbers
+            :param WorkerPool pool: pool on which the requests are submitted
+            :param list hive_instances: Hive instances, which are used in turns
+            :param bool only_ops: Only yield operations (default: False)
+            :param bool only_virtual_ops: Only yield virtual operations (default: False)
+            :param int batch_size: When set, each request is a batched rpc call for
+                ``batch_size`` blocks. A failed batch is retried on the next instance.
+            :param bool block_range: When True, each request is a get_block_range call
+                for ``batch_size`` blocks
+            :param int max_block_retries: When all instances failed, each block of the
+                request is received on its own, with up to max_block_retries tries (default is 5)
+        """
+        block_nums = iter(block_nums)
+        instances = cycle(hive_instances)
+
+        def fetch(nums, hive_instance):
+            if block_range:
+                return [Block(block, hive_instance=hive_instance) for block in self.get_block_range(nums[0], nums[-1])]
+            if batch_size is None:
+                return [Block(nums[0], only_ops=only_ops, only_virtual_ops=only_virtual_ops, hive_instance=hive_instance)]
+            return self._get_block_batch(nums, hive_instance, only_ops=only_ops, only_virtual_ops=only_virtual_ops)
+
+        def submit(nums):
+            return nums, pool.submit(fetch, nums, next(instances))
+
+        def receive(request):
+            nums, future = request
+            for retries in range(len(hive_instances)):
+                if retries > 0:
+                    future = pool.submit(fetch, nums, next(instances))
+                try:
+                    blocks = future.result()
+                except Exception as e:
+                    log.error(str(e))
+                    blocks = None
+                if blocks is not None and [b.block_num for b in blocks] == nums:
+                    return blocks
+            blocks = []
+            for blocknum in nums:
+                block = None
+                error = None
+                for i in range(max_block_retries):
+                    try:
+                        block = Block(blocknum, only_ops=only_ops, only_virtual_ops=only_virtual_ops, hive_instance=self.hive)
+                    except Exception as e:
+                        log.error(str(e))
+                        error = e
+                        block = None
+                    if block is not None and block.block_num is not None and int(block.block_num) == blocknum:
+                        break
+                    block = None
+                if block is None:
+                    if error is not None:
+                        raise error
+                    raise BlockDoesNotExistsException(str(blocknum))
+                blocks.append(block)
+            return blocks
+
+        requests = iter(lambda: list(islice(block_nums, batch_size or 1)), [])
+        for blocks in windowed_map(submit, requests, len(hive_instances), result=receive,
+                                   cancel=lambda request: request[1].cancel()):
+            for block in blocks:
+                block["id"] = block.block_num
+                block.identifier = block.block_num
+                yield block
+
+    def _get_block_batch(self, block_nums, hive_instance, only_ops=False, only_virtual_ops=False):
+        """ Returns the blocks of ``block_nums`` in order, which are received by a
+            single batched rpc call (using ``add_to_queue``)
+
+            :param list block_nums: block numbers
+            :param Hive hive_instance: Hive instance, which sends the batch
+            :param bool only_ops: Only return operations (default: False)
+            :param bool only_virtual_ops: Only return virtual operations (default: False)
+        """
+        rpc = hive_instance.rpc
+        rpc.set_next_node_on_empty_reply(False)
+        use_appbase = rpc.get_use_appbase()
+        for i, blocknum in enumerate(block_nums):
+            add_to_queue = i < len(block_nums) - 1
+            if only_ops or only_virtual_ops:
+                if use_appbase:
+                    batch = rpc.get_ops_in_block({"block_num": blocknum, 'only_virtual': only_virtual_ops}, api="account_history", add_to_queue=add_to_queue)
+                else:
+                    batch = rpc.get_ops_in_block(blocknum, only_virtual_ops, add_to_queue=add_to_queue)
+            else:
+                if use_appbase:
+                    batch = rpc.get_block({"block_num": blocknum}, api="block", add_to_queue=add_to_queue)
+                else:
+                    batch = rpc.get_block(blocknum, add_to_queue=add_to_queue)
+        if len(block_nums) == 1:
+            batch = [batch]
+        if not bool(batch) or not isinstance(batch, list) or len(batch) != len(block_nums):
+            raise BatchedCallsNotSupported()
+        blocks = []
+        for blocknum, block in zip(block_nums, batch):
+            if only_ops or only_virtual_ops:
+                if isinstance(block, dict) and "ops" in block:
+                    block = block["ops"]
+                if bool(block):
+                    block = {'block': block[0]["block"],
+                             'timestamp': block[0]["timestamp"],
+                             'operations': block}
+                else:
+                    block = {'block': blocknum,
+                             'timestamp': "1970-01-01T00:00:00",
+                             'operations': []}
+            elif isinstance(block, dict) and "block" in block:
+                block = block["block"]
+            if not bool(block):
+                raise BlockDoesNotExistsException(str(blocknum))
+            blocks.append(Block(block, only_ops=only_ops, only_virtual_ops=only_virtual_ops, hive_instance=hive_instance))
+        return blocks
+
+    def _block_range_supported(self):
+        """Returns False, when get_block_range is known to be unavailable"""
+        if not self.hive.is_connected() or not self.hive.rpc.get_use_appbase():
+            return False
+        return self.block_range_supported is not False
+
+    def get_block_range(self, start, stop):
+        """ Returns the blocks from start to stop (including stop) as list of dicts, which
+            are received by ``block_api.get_block_range`` calls of up to ``max_block_range``
+            blocks. ``max_block_range`` is reduced, when a node refuses the range.
+            The list ends early, when a block does not exist yet.
+
+            :param int start: first block
+            :param int stop: last block
+
+            .. note:: Only appbase nodes with block_api support this call.
+        """
+        if not self.hive.is_connected():
+            raise OfflineHasNoRPCException("No RPC available in offline mode!")
+        self.hive.rpc.set_next_node_on_empty_reply(False)
+        blocks = []
+        blocknum = start
+        while blocknum <= stop:
+            count = min(self.max_block_range, stop - blocknum + 1)
+            try:
+                ret = self.hive.rpc.get_block_range({"starting_block_num": blocknum, "count": count}, api="block")
+            except (ApiNotSupported, NoApiWithName, NoMethodWithName):
+                raise
+            except RPCError as e:
+                if count == 1:
+                    raise
+                log.warning("get_block_range failed for %d blocks: %s" % (count, str(e)))
+                self.max_block_range = max(count // 2, 1)
+                continue
+            if ret is not None and "blocks" in ret:
+                ret = ret["blocks"]
+            if not bool(ret):
+                break
+            blocks.extend(ret)
+            blocknum += len(ret)
+        return blocks
+
+    def range_blocks(self, start, stop, block_number_check_cnt=-1, last_current_block_num=None):
+        """ Yields the blocks from start to stop (including stop), which are received by
+            :func:`get_block_range` in chunks of up to ``max_block_range`` blocks.
+            Blocks, which are not returned, and all blocks of nodes without get_block_range
+            support are received one by one.
+
+            :param int start: first block
+            :param int stop: last block
+        """
+        blocknum = start
+        while blocknum <= stop and self._block_range_supported():
+            range_stop = min(blocknum + self.max_block_range - 1, stop)
+            try:
+                blocks = self.get_block_range(blocknum, range_stop)
+                self.block_range_supported = True
+            except (ApiNotSupported, NoApiWithName, NoMethodWithName) as e:
+                log.warning("get_block_range is not supported: %s" % str(e))
+                self.block_range_supported = False
+                break
+            for block in blocks:
+                block = Block(block, hive_instance=self.hive)
+                if block.block_num != blocknum:
+                    raise BlockDoesNotExistsException("get_block_range returned block %s instead of %d" % (str(block.block_num), blocknum))
+                block["id"] = block.block_num
+                block.identifier = block.block_num
+                yield block
+                blocknum += 1
+            if blocknum <= range_stop:
+                break
+        for blocknum in range(blocknum, stop + 1):
+            yield self.wait_for_and_get_block(blocknum, block_number_check_cnt=block_number_check_cnt, last_current_block_num=last_current_block_num)
+
+    def raw_blocks(self, start, stop):
+        """ Yields the blocks from start to stop (including stop) as unparsed dicts, as they
+            are returned by the node. :func:`get_block_range` is used, when the node supports it.
+            The generator ends at the first block, which does not exist yet.
+
+            :param int start: first block
+            :param int stop: last block
+        """
+        blocknum = start
+        while blocknum <= stop and self._block_range_supported():
+            range_stop = min(blocknum + self.max_block_range - 1, stop)
+            try:
+                blocks = self.get_block_range(blocknum, range_stop)
+                self.block_range_supported = True
+            except (ApiNotSupported, NoApiWithName, NoMethodWithName) as e:
+                log.warning("get_block_range is not supported: %s" % str(e))
+                self.block_range_supported = False
+                break
+            for block in blocks:
+                yield block
+                blocknum += 1
+            if blocknum <= range_stop:
+                return
+        if blocknum > stop:
+            return
+        if not self.hive.is_connected():
+            raise OfflineHasNoRPCException("No RPC available in offline mode!")
+        self.hive.rpc.set_next_node_on_empty_reply(False)
+        for blocknum in range(blocknum, stop + 1):
+            if self.hive.rpc.get_use_appbase():
+                block = self.hive.rpc.get_block({"block_num": blocknum}, api="block")
+                if block and "block" in block:
+                    block = block["block"]
+            else:
+                block = self.hive.rpc.get_block(blocknum)
+            if not block:
+                return
+            yield block
+
+    def op_records(self, start=None, stop=None, opNames=[], processes=None, chunksize=20, block_source=None):
+        """ Yields the operations from start to stop as compact
+            :class:`bhive.blockdecoder.OpRecord` tuples in order. The unparsed blocks are
+            decoded by a :class:`bhive.blockdecoder.BlockDecoderPool` of worker processes,
+            while the next blocks are received.
+
+            :param int start: Starting block (default is the first block of ``block_source``
+                or the current block)
+            :param int stop: Stop at this block (default is the current block, new
+                blocks are not awaited)
+            :param array opNames: List of operations to filter for
+            :param int processes: number of worker processes (default is the number of CPUs)
+            :param int chunksize: number of blocks, which are sent to a worker at once (default is 20)
+            :param BlockSource block_source: When set, the blocks are read from this source
+                (:class:`bhive.blocksource.BlockSource`) instead of the node
+
+            .. code-block:: python
+
+                from bhive.blockchain import Blockchain
+                blockchain = Blockchain()
+                for record in blockchain.op_records(start=40000000, stop=40010000, opNames=["vote"]):
+                    print(record.block_num, record.op["voter"])
+
+        """
+        if block_source is None:
+            block_source = self.block_source
+        if block_source is not None:
+            if start is None:
+                start = block_source.get_first_block_num()
+            if stop is None:
+                stop = block_source.get_current_block_num()
+            if start is None or stop is None:
+                return
+            blocks = block_source.raw_blocks(start, stop)
+        else:
+            if stop is None:
+                stop = self.get_current_block_num()
+            if start is None:
+                start = stop
+            blocks = self.raw_blocks(start, stop)
+        with BlockDecoderPool(processes=processes, chunksize=chunksize) as pool:
+            for record in pool.records(blocks, opNames=opNames):
+                yield record
+
+    def block_headers(self, start, stop):
+        """ Yields the block headers (:class:`bhive.block.BlockHeader`) from start to
+            stop (including stop). The headers are taken from :func:`get_block_range`,
+            when the node supports it, otherwise they are received by batched
+            ``get_block_header`` calls.
+
+            :param int start: first block
+            :param int stop: last block
+
+            .. code-block:: python
+
+                from bhive.blockchain import Blockchain
+                blockchain = Blockchain()
+                times = [header.time() for header in blockchain.block_headers(40000000, 40001000)]
+
+        """
+        header_keys = ["previous", "timestamp", "witness", "transaction_merkle_root", "extensions"]
+        blocknum = start
+        while blocknum <= stop and self._block_range_supported():
+            range_stop = min(blocknum + self.max_block_range - 1, stop)
+            try:
+                blocks = self.get_block_range(blocknum, range_stop)
+                self.block_range_supported = True
+            except (ApiNotSupported, NoApiWithName, NoMethodWithName) as e:
+                log.warning("get_block_range is not supported: %s" % str(e))
+                self.block_range_supported = False
+                break
+            if len(blocks) == 0:
+                raise BlockDoesNotExistsException(str(blocknum))
+            for block in blocks:
+                header = {key: block[key] for key in header_keys if key in block}
+                header["id"] = blocknum
+                yield BlockHeader(header, hive_instance=self.hive)
+                blocknum += 1
+        batch_size = 100 if self.hive.rpc.get_use_appbase() else 1
+        while blocknum <= stop:
+            block_nums = list(range(blocknum, min(blocknum + batch_size - 1, stop) + 1))
+            if len(block_nums) == 1:
+                yield BlockHeader(blocknum, hive_instance=self.hive)
+                blocknum += 1
+                continue
+            for i, num in enumerate(block_nums):
+                ret = self.hive.rpc.get_block_header({"block_num": num}, api="block", add_to_queue=i < len(block_nums) - 1)
+            if not isinstance(ret, list) or len(ret) != len(block_nums):
+                raise BatchedCallsNotSupported()
+            for num, header in zip(block_nums, ret):
+                if header is not None and "header" in header:
+                    header = header["header"]
+                if not bool(header):
+                    raise BlockDoesNotExistsException(str(num))
+                header["id"] = num
+                yield BlockHeader(header, hive_instance=self.hive)
+            blocknum += len(block_nums)
+
+    def _enum_virtual_ops_supported(self):
+        """Returns False, when enum_virtual_ops is known to be unavailable"""
+        if not self.hive.is_connected() or not self.hive.rpc.get_use_appbase():
+            return False
+        return self.enum_virtual_ops_supported is not False
+
+    def enum_virtual_ops(self, start, stop):
+        """ Returns the virtual operations of the blocks from start to stop (including stop)
+            by ``account_history_api.enum_virtual_ops`` calls. The pagination of the
+            call is handled, so that the result is complete.
+
+            :param int start: first block
+            :param int stop: last block
+            :returns: dict with block numbers as keys and lists of operations as values
+
+            .. note:: Only irreversible blocks are returned by most nodes, and only
+                      appbase nodes with account_history_api support this call.
+        """
+        if not self.hive.is_connected():
+            raise OfflineHasNoRPCException("No RPC available in offline mode!")
+        self.hive.rpc.set_next_node_on_empty_reply(False)
+        ops_by_block = {}
+        range_begin = start
+        operation_begin = None
+        while range_begin <= stop:
+            params = {"block_range_begin": range_begin, "block_range_end": stop + 1}
+            if operation_begin:
+                params["operation_begin"] = operation_begin
+            ret = self.hive.rpc.enum_virtual_ops(params, api="account_history")
+            if ret is None:
+                raise BlockDoesNotExistsException("enum_virtual_ops returned no result for %d - %d" % (range_begin, stop))
+            for op in ret.get("ops", []):
+                ops_by_block.setdefault(int(op["block"]), []).append(op)
+            next_block = int(ret.get("next_block_range_begin", 0) or 0)
+            next_operation = int(ret.get("next_operation_begin", 0) or 0)
+            if next_block < range_begin or next_block > stop or (next_block == range_begin and next_operation in [0, operation_begin]):
+                break
+            if not next_operation:
+                # The next page starts with block next_block, which may be incomplete
+                for block_num in range(next_block, stop + 1):
+                    ops_by_block.pop(block_num, None)
+            range_begin = next_block
+            operation_begin = next_operation
+        return ops_by_block
+
+    def virtual_op_blocks(self, start, stop, block_range=1000, block_number_check_cnt=-1, last_current_block_num=None):
+        """ Yields blocks with virtual operations only (like ``Block(only_virtual_ops=True)``)
+            from start to stop (including stop).
+
+            Irreversible blocks are received by :func:`enum_virtual_ops` for up to
+            block_range blocks at once, the remaining blocks and all blocks of nodes
+            without ``enum_virtual_ops`` support are received by ``get_ops_in_block``.
+
+            :param int start: first block
+            :param int stop: last block
+            :param int block_range: number of blocks for a single enum_virtual_ops call (default is 1000)
+
+            .. code-block:: python
+
+                from bhive.blockchain import Blockchain
+                blockchain = Blockchain()
+                for block in blockchain.virtual_op_blocks(40000000, 40100000):
+                    for op in block.operations:
+                        print(op)
+
+        """
+        # In both modes, the blocks above the last irreversible block are awaited by wait_for_and_get_block
+        last_irreversible_block = self.hive.get_dynamic_global_properties(False)["last_irreversible_block_num"]
+        blocknum = start
+        while blocknum <= min(stop, last_irreversible_block) and self._enum_virtual_ops_supported():
+            range_stop = min(blocknum + block_range - 1, stop, last_irreversible_block)
+            try:
+                ops_by_block = self.enum_virtual_ops(blocknum, range_stop)
+                self.enum_virtual_ops_supported = True
+            except (ApiNotSupported, NoApiWithName, NoMethodWithName) as e:
+                log.warning("enum_virtual_ops is not supported: %s" % str(e))
+                self.enum_virtual_ops_supported = False
+                break
+            for block_num in range(blocknum, range_stop + 1):
+                ops = ops_by_block.get(block_num, [])
+                if bool(ops):
+                    block = {'block': block_num,
+                             'timestamp': ops[0]["timestamp"],
+                             'operations': ops}
+                else:
+                    block = {'block': block_num,
+                             'timestamp': "1970-01-01T00:00:00",
+                             'operations': []}
+                block = Block(block, only_virtual_ops=True, hive_instance=self.hive)
+                block["id"] = block.block_num
+                block.identifier = block.block_num
+                yield block
+            blocknum = range_stop + 1
+        for blocknum in range(blocknum, stop + 1):
+            yield self.wait_for_and_get_block(blocknum, only_virtual_ops=True, block_number_check_cnt=block_number_check_cnt,
+                                              last_current_block_num=last_current_block_num)
+
     def wait_for_and_get_block(self, block_number, blocks_waiting_for=None, only_ops=False, only_virtual_ops=False, block_number_check_cnt=-1, last_current_block_num=None):
         """ Get the desired block from the chain, if the current head block is smaller (for both head and irreversible)
             then we wait, but a maxmimum of blocks_waiting_for * max_block_wait_repetition time before failure.
@@ -626,7 +1390,7 @@ class Blockchain(object):
         """
         raise DeprecationWarning('Blockchain.ops() is deprecated. Please use Blockchain.stream() instead.')
 
-    def ops_statistics(self, start, stop=None, add_to_ops_stat=None, with_virtual_ops=True, verbose=False):
+    def ops_statistics(self, start, stop=None, add_to_ops_stat=None, with_virtual_ops=True, verbose=False, block_source=None):
         """ Generates statistics for all operations (including virtual operations) starting from
             ``start``.
 
@@ -634,6 +1398,8 @@ class Blockchain(object):
             :param int stop: Stop at this block, if set to None, the current_block_num is taken
             :param dict add_to_ops_stat: if set, the result is added to add_to_ops_stat
             :param bool verbose: if True, the current block number and timestamp is printed
+            :param BlockSource block_source: When set, the blocks are read from this source
+                (:class:`bhive.blocksource.BlockSource`)
 
             This call returns a dict with all possible operations and their occurrence.
 
@@ -645,17 +1411,20 @@ class Blockchain(object):
                 ops_stat[key] = 0
         else:
             ops_stat = add_to_ops_stat.copy()
-        current_block = self.get_current_block_num()
-        if start > current_block:
+        if block_source is not None:
+            current_block = block_source.get_current_block_num()
+        else:
+            current_block = self.get_current_block_num()
+        if current_block is None or start > current_block:
             return
         if stop is None:
             stop = current_block
-        for block in self.blocks(start=start, stop=stop, only_ops=False, only_virtual_ops=False):
+        for block in self.blocks(start=start, stop=stop, only_ops=False, only_virtual_ops=False, block_source=block_source):
             if verbose:
                 print(block["identifier"] + " " + block["timestamp"])
             ops_stat = block.ops_statistics(add_to_ops_stat=ops_stat)
         if with_virtual_ops:
-            for block in self.blocks(start=start, stop=stop, only_ops=True, only_virtual_ops=True):
+            for block in self.blocks(start=start, stop=stop, only_ops=True, only_virtual_ops=True, block_source=block_source):
                 if verbose:
                     print(block["identifier"] + " " + block["timestamp"])
                 ops_stat = block.ops_statistics(add_to_ops_stat=ops_stat)
@@ -666,15 +1435,32 @@ class Blockchain(object):
 
             :param array opNames: List of operations to filter for
             :param bool raw_ops: When set to True, it returns the unmodified operations (default: False)
+            :param bool op_views: When set to True, :class:`OperationView` objects are yielded
+                instead of dicts. They are not copied from the block data and compute
+                ``_id`` only when it is accessed (default: False)
             :param int start: Start at this block
             :param int stop: Stop at this block
             :param int max_batch_size: only for appbase nodes. When not None, batch calls of are used.
-                Cannot be combined with threading
-            :param bool threading: Enables threading. Cannot be combined with batch calls
+                When combined with threading, the batches are distributed over ``thread_num`` connections.
+            :param bool threading: Enables threading.
             :param int thread_num: Defines the number of threads, when `threading` is set.
             :param bool only_ops: Only yield operations (default: False)
                 Cannot be combined with ``only_virtual_ops=True``
             :param bool only_virtual_ops: Only yield virtual operations (default: False)
+            :param int virtual_op_range: number of blocks for a single enum_virtual_ops call,
+                when only_virtual_ops is True (default is None, which calls get_ops_in_block
+                for each block)
+            :param on_rollback: When set, ``on_rollback(blocks)`` is called with the orphaned blocks
+                (newest first) after a micro fork, and the operations of the replacing blocks are
+                yielded (see :func:`blocks`)
+            :param Checkpoint checkpoint: When set, the stream continues after the last processed
+                operation stored in the checkpoint (:class:`bhive.checkpoint.Checkpoint`), the stored
+                position has priority over ``start``. An operation counts as processed, when the next
+                operation is requested. The last yielded operation is yielded again after a restart,
+                when the stream was closed before (e.g. by ``break`` or an exception of the consumer).
+                The other parameters should not change between restarts.
+            :param BlockSource block_source: When set, the blocks are read from this source
+                (:class:`bhive.blocksource.BlockSource`), e.g. from a file or from memory
 
             The dict output is formated such that ``type`` carries the
             operation type. Timestamp and block_num are taken from the
@@ -720,71 +1506,113 @@ class Blockchain(object):
                 }
 
         """
-        for block in self.blocks(**kwargs):
-            if "transactions" in block:
-                trx = block["transactions"]
-            else:
-                trx = [block]
-            block_num = 0
-            trx_id = ""
-            _id = ""
-            timestamp = ""
-            for trx_nr in range(len(trx)):
-                if "operations" not in trx[trx_nr]:
-                    continue
-                for event in trx[trx_nr]["operations"]:
-                    if isinstance(event, list):
-                        op_type, op = event
-                        trx_id = block["transaction_ids"][trx_nr]
-                        block_num = block.get("id")
-                        _id = self.hash_op(event)
-                        timestamp = block.get("timestamp")
-                    elif isinstance(event, dict) and "type" in event and "value" in event:
-                        op_type = event["type"]
-                        if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
-                            op_type = op_type[:-10]
-                        op = event["value"]
-                        trx_id = block["transaction_ids"][trx_nr]
-                        block_num = block.get("id")
-                        _id = self.hash_op(event)
-                        timestamp = block.get("timestamp")
-                    elif "op" in event and isinstance(event["op"], dict) and "type" in event["op"] and "value" in event["op"]:
-                        op_type = event["op"]["type"]
-                        if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
-                            op_type = op_type[:-10]
-                        op = event["op"]["value"]
-                        trx_id = event.get("trx_id")
-                        block_num = event.get("block")
-                        _id = self.hash_op(event["op"])
-                        timestamp = event.get("timestamp")
+        checkpoint = kwargs.pop("checkpoint", None)
+        op_views = kwargs.pop("op_views", False)
+        if checkpoint is None:
+            for block in self.blocks(**kwargs):
+                for op in self.block_operations(block, opNames=opNames, raw_ops=raw_ops, op_views=op_views):
+                    yield op
+            return
+        if checkpoint.get_start_block() is not None:
+            kwargs["start"] = checkpoint.get_start_block()
+        if kwargs.get("on_rollback") is not None:
+            kwargs["on_rollback"] = self._get_checkpoint_rollback_handler(checkpoint, kwargs["on_rollback"])
+        try:
+            for block in self.blocks(**kwargs):
+                block_num = block.block_num
+                for trx_nr, op_nr, op in self._block_operations(block, opNames=opNames, raw_ops=raw_ops, op_views=op_views):
+                    if checkpoint.is_processed(block_num, trx_nr, op_nr):
+                        continue
+                    yield op
+                    checkpoint.set(block_num, trx_nr, op_nr)
+                checkpoint.set(block_num)
+        finally:
+            checkpoint.flush()
+
+    @staticmethod
+    def block_operations(block, opNames=[], raw_ops=False, op_views=False):
+        """ Yields the operations of a single block in the output format of :func:`stream`
+
+            :param Block block: block (or only_ops block) from which the operations are taken
+            :param array opNames: List of operations to filter for
+            :param bool raw_ops: When set to True, it returns the unmodified operations (default: False)
+            :param bool op_views: When set to True, :class:`OperationView` objects are yielded (default: False)
+        """
+        for trx_nr, op_nr, op in Blockchain._block_operations(block, opNames=opNames, raw_ops=raw_ops, op_views=op_views):
+            yield op
+
+    @staticmethod
+    def _block_operations(block, opNames=[], raw_ops=False, op_views=False):
+        """ Yields (trx_num, op_num, operation) for the operations of a single block,
+            op_num is the position of the operation in its transaction
+        """
+        if "transactions" in block:
+            trx = block["transactions"]
+        else:
+            trx = [block]
+        block_num = 0
+        trx_id = ""
+        timestamp = ""
+        for trx_nr in range(len(trx)):
+            if "operations" not in trx[trx_nr]:
+                continue
+            for op_nr, event in enumerate(trx[trx_nr]["operations"]):
+                if isinstance(event, list):
+                    op_type, op = event
+                    trx_id = block["transaction_ids"][trx_nr]
+                    block_num = block.get("id")
+                    hash_event = event
+                    timestamp = block.get("timestamp")
+                elif isinstance(event, dict) and "type" in event and "value" in event:
+                    op_type = event["type"]
+                    if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
+                        op_type = op_type[:-10]
+                    op = event["value"]
+                    trx_id = block["transaction_ids"][trx_nr]
+                    block_num = block.get("id")
+                    hash_event = event
+                    timestamp = block.get("timestamp")
+                elif "op" in event and isinstance(event["op"], dict) and "type" in event["op"] and "value" in event["op"]:
+                    op_type = event["op"]["type"]
+                    if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
+                        op_type = op_type[:-10]
+                    op = event["op"]["value"]
+                    trx_id = event.get("trx_id")
+                    block_num = event.get("block")
+                    hash_event = event["op"]
+                    timestamp = event.get("timestamp")
+                else:
+                    op_type, op = event["op"]
+                    trx_id = event.get("trx_id")
+                    block_num = event.get("block")
+                    hash_event = event["op"]
+                    timestamp = event.get("timestamp")
+                if not bool(opNames) or op_type in opNames and block_num > 0:
+                    if raw_ops:
+                        yield trx_nr, op_nr, {"block_num": block_num,
+                                              "trx_num": trx_nr,
+                                              "op": [op_type, op],
+                                              "timestamp": timestamp}
+                    elif op_views:
+                        yield trx_nr, op_nr, OperationView(op_type, op, block_num, trx_nr, trx_id, timestamp, hash_event)
                     else:
-                        op_type, op = event["op"]
-                        trx_id = event.get("trx_id")
-                        block_num = event.get("block")
-                        _id = self.hash_op(event["op"])
-                        timestamp = event.get("timestamp")
-                    if not bool(opNames) or op_type in opNames and block_num > 0:
-                        if raw_ops:
-                            yield {"block_num": block_num,
-                                   "trx_num": trx_nr,
-                                   "op": [op_type, op],
-                                   "timestamp": timestamp}
-                        else:
-                            updated_op = {"type": op_type}
-                            updated_op.update(op.copy())
-                            updated_op.update({"_id": _id,
-                                               "timestamp": timestamp,
-                                               "block_num": block_num,
-                                               "trx_num": trx_nr,
-                                               "trx_id": trx_id})
-                            yield updated_op
-
-    def awaitTxConfirmation(self, transaction, limit=10):
+                        updated_op = {"type": op_type}
+                        updated_op.update(op.copy())
+                        updated_op.update({"_id": Blockchain.hash_op(hash_event),
+                                           "timestamp": timestamp,
+                                           "block_num": block_num,
+                                           "trx_num": trx_nr,
+                                           "trx_id": trx_id})
+                        yield trx_nr, op_nr, updated_op
+
+    def awaitTxConfirmation(self, transaction, limit=10, block_source=None):
         """ Returns the transaction as seen by the blockchain after being
             included into a block
 
             :param dict transaction: transaction to wait for
             :param int limit: (optional) number of blocks to wait for the transaction (default: 10)
+            :param BlockSource block_source: (optional) When set, the blocks are read from this source
+                (:class:`bhive.blocksource.BlockSource`)
 
             .. note:: If you want instant confirmation, you need to instantiate
                       class:`bhive.blockchain.Blockchain` with
@@ -799,7 +1627,7 @@ class Blockchain(object):
                       uniquely.
         """
         counter = 0
-        for block in self.blocks():
+        for block in self.blocks(block_source=block_source):
             counter += 1
             for tx in block["transactions"]:
                 if sorted(
@@ -7,76 +7,164 @@ from builtins import str
 from future.utils import python_2_unicode_compatible
 from bhivegraphenebase.py23 import bytes_types, integer_types, string_types, text_type
 from bhive.instance import shared_hive_instance
-from datetime import datetime, timedelta
+from collections import OrderedDict, deque
 import json
+import sys
+import time
 import threading
 
 
 @python_2_unicode_compatible
 class ObjectCache(dict):
-
-    def __init__(self, initial_data={}, default_expiration=10, auto_clean=True):
-        super(ObjectCache, self).__init__(initial_data)
+    """ Thread safe cache, in which each entry expires after a given time
+
+        :param dict initial_data: initial entries
+        :param float default_expiration: lifetime of an entry in seconds (default is 10)
+        :param bool auto_clean: When True, expired entries are removed on each insert (default is True)
+        :param int max_entries: maximum number of entries, the least recently used entries
+            are removed when it is reached (default is None)
+        :param int max_bytes: maximum estimated size of all entries in bytes, the least recently
+            used entries are removed when it is reached (default is None)
+        :param dict class_expirations: lifetime in seconds for entries of the given class names,
+            e.g. ``{"Block": 60, "Account": 5}`` (default is None)
+
+        Entries with the same lifetime are kept in a queue ordered by insertion time,
+        so that expired entries are removed in amortized O(1).
+    """
+    def __init__(self, initial_data={}, default_expiration=10, auto_clean=True,
+                 max_entries=None, max_bytes=None, class_expirations=None):
+        super(ObjectCache, self).__init__()
         self.default_expiration = default_expiration
         self.auto_clean = auto_clean
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.class_expirations = dict(class_expirations or {})
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
         self.lock = threading.RLock()
+        self._expiration_queues = {}
+        self._lru = OrderedDict()
+        for key in initial_data:
+            self[key] = initial_data[key]
+
+    def get_expiration(self, value):
+        """Returns the lifetime in seconds for the given value"""
+        if self.class_expirations:
+            for klass in getattr(type(value), "__mro__", [type(value)]):
+                if klass.__name__ in self.class_expirations:
+                    return self.class_expirations[klass.__name__]
+        return self.default_expiration
+
+    def set_expiration(self, expiration, klass=None):
+        """ Sets the lifetime in seconds
+
+            :param float expiration: lifetime in seconds
+            :param klass: When set, the lifetime is only used for this class (class or class name)
+        """
+        if klass is None:
+            self.default_expiration = expiration
+        elif isinstance(klass, string_types):
+            self.class_expirations[klass] = expiration
+        else:
+            self.class_expirations[klass.__name__] = expiration
+
+    def _get_size(self, value):
+        """Returns the estimated size of value in bytes"""
+        try:
+            return len(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            return sys.getsizeof(value)
 
     def __setitem__(self, key, value):
-        data = {
-            "expires": datetime.utcnow() + timedelta(
-                seconds=self.default_expiration),
-            "data": value
-        }
+        expiration = self.get_expiration(value)
+        expires = time.time() + expiration
+        size = 0
+        if self.max_bytes is not None:
+            size = self._get_size(value)
         with self.lock:
-            if key in self:
-                del self[key]
-            dict.__setitem__(self, key, data)
-        if self.auto_clean:
-            self.clear_expired_items()
+            if dict.__contains__(self, key):
+                self._remove(key)
+            dict.__setitem__(self, key, {"expires": expires, "data": value, "size": size})
+            self._lru[key] = None
+            self.n_bytes += size
+            if expiration not in self._expiration_queues:
+                self._expiration_queues[expiration] = deque()
+            self._expiration_queues[expiration].append((expires, key))
+            if self.auto_clean:
+                self.clear_expired_items()
+            self._evict()
 
     def __getitem__(self, key):
+        return self.get(key, None)
+
+    def __delitem__(self, key):
         with self.lock:
-            if key in self:
-                value = dict.__getitem__(self, key)
-                if value is not None:
-                    return value["data"]
+            if not dict.__contains__(self, key):
+                raise KeyError(key)
+            self._remove(key)
 
     def get(self, key, default):
         with self.lock:
-            if key in self:
-                if self[key] is not None:
-                    return self[key]
-                else:
-                    return default
-            else:
-                return default
+            if dict.__contains__(self, key):
+                value = dict.__getitem__(self, key)
+                if time.time() < value["expires"]:
+                    self.hits += 1
+                    self._lru[key] = self._lru.pop(key)
+                    return value["data"]
+            self.misses += 1
+            return default
+
+    def _remove(self, key):
+        value = dict.pop(self, key)
+        self._lru.pop(key, None)
+        self.n_bytes -= value["size"]
+
+    def _evict(self):
+        """Removes the least recently used entries, until max_entries and max_bytes are met"""
+        while len(self._lru) > 0 and (
+            (self.max_entries is not None and len(self._lru) > self.max_entries) or
+            (self.max_bytes is not None and self.n_bytes > self.max_bytes)
+        ):
+            key = next(iter(self._lru))
+            self._remove(key)
+            self.evictions += 1
 
     def clear_expired_items(self):
         with self.lock:
-            del_list = []
-            utc_now = datetime.utcnow()
-            for key in self:
-                value = dict.__getitem__(self, key)
-                if value is None:
-                    del_list.append(key)
-                    continue
-                if utc_now >= value["expires"]:
-                    del_list.append(key)
-            for key in del_list:
-                del self[key]
+            utc_now = time.time()
+            for expiration in list(self._expiration_queues):
+                queue = self._expiration_queues[expiration]
+                while len(queue) > 0 and queue[0][0] <= utc_now:
+                    expires, key = queue.popleft()
+                    # Skip keys which were removed or stored again
+                    if dict.__contains__(self, key) and dict.__getitem__(self, key)["expires"] == expires:
+                        self._remove(key)
+                if len(queue) == 0:
+                    del self._expiration_queues[expiration]
+
+    def clear(self):
+        with self.lock:
+            dict.clear(self)
+            self._lru.clear()
+            self._expiration_queues = {}
+            self.n_bytes = 0
 
     def __contains__(self, key):
         with self.lock:
             if dict.__contains__(self, key):
                 value = dict.__getitem__(self, key)
-                if value is None:
-                    return False
-                if datetime.utcnow() < value["expires"]:
+                if time.time() < value["expires"]:
                     return True
-                else:
-                    value["data"] = None
             return False
 
+    def get_stats(self):
+        """Returns the number of entries, their estimated size and the hit, miss and eviction counters"""
+        with self.lock:
+            return {"entries": len(self), "bytes": self.n_bytes, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
     def __str__(self):
         if self.auto_clean:
             self.clear_expired_items()
@@ -158,7 +246,7 @@ class BlockchainObject(dict):
 
     @staticmethod
     def clear_cache():
-        BlockchainObject._cache = ObjectCache()
+        BlockchainObject._cache.clear()
 
     def test_valid_objectid(self, i):
         if isinstance(i, string_types):
@@ -195,6 +283,21 @@ class BlockchainObject(dict):
     def get_cache_auto_clean(self):
         return BlockchainObject._cache.auto_clean
 
+    def set_cache_class_expiration(self, expiration):
+        """Sets the cache expiration in seconds for objects of this class"""
+        BlockchainObject._cache.set_expiration(expiration, klass=self.__class__)
+
+    def set_cache_max_entries(self, max_entries):
+        BlockchainObject._cache.max_entries = max_entries
+
+    def set_cache_max_bytes(self, max_bytes):
+        """Sets the maximum estimated cache size, only objects cached afterwards are counted"""
+        BlockchainObject._cache.max_bytes = max_bytes
+
+    def get_cache_stats(self):
+        """Returns the number of cached objects and the hit, miss and eviction counters"""
+        return BlockchainObject._cache.get_stats()
+
     def iscached(self, id):
         return id in BlockchainObject._cache
 
@@ -0,0 +1,123 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import object
+import multiprocessing
+import logging
+from collections import namedtuple
+from itertools import islice
+from .utils import formatTimeString, windowed_map
+log = logging.getLogger(__name__)
+
+OpRecord = namedtuple("OpRecord", ["block_num", "trx_num", "op_num", "trx_id", "timestamp", "type", "op"])
+OpRecord.__doc__ = """ Compact record of an operation, which is returned by :func:`decode_block`.
+    ``timestamp`` is a datetime, ``type`` has no ``_operation`` suffix and ``op``
+    is the operation dict of the block."""
+
+
+def decode_block(block, opNames=None):
+    """ Returns the operations of an unparsed full block (as received from the node)
+        as list of :class:`OpRecord`
+
+        :param dict block: full block
+        :param list opNames: operation types which are returned, all types when empty or None
+    """
+    block_num = int(block["block_id"][:8], base=16)
+    timestamp = formatTimeString(block["timestamp"])
+    trx_ids = block.get("transaction_ids", [])
+    records = []
+    for trx_num, trx in enumerate(block.get("transactions", [])):
+        trx_id = trx_ids[trx_num] if trx_num < len(trx_ids) else trx.get("transaction_id")
+        for op_num, event in enumerate(trx.get("operations", [])):
+            if isinstance(event, dict):
+                op_type = event["type"]
+                op = event["value"]
+            else:
+                op_type, op = event
+            if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
+                op_type = op_type[:-10]
+            if opNames and op_type not in opNames:
+                continue
+            records.append(OpRecord(block_num, trx_num, op_num, trx_id, timestamp, op_type, op))
+    return records
+
+
+def decode_blocks(blocks, opNames=None):
+    """ Returns a list of :class:`OpRecord` lists, one for each block of blocks
+        (see :func:`decode_block`)
+    """
+    return [decode_block(block, opNames=opNames) for block in blocks]
+
+
+class BlockDecoderPool(object):
+    """ Decodes unparsed blocks in worker processes with :func:`decode_block`, so that
+        parsing scales with the number of CPU cores, e.g. for historical replays.
+        The records are returned in block order.
+
+        The blocks are read by the consumer thread, while up to ``max_chunks`` chunks are
+        decoded or wait for the consumer, so that a slow consumer also slows down reading.
+
+        :param int processes: number of worker processes (default is the number of CPUs)
+        :param int chunksize: number of blocks, which are sent to a worker at once (default is 20)
+        :param int max_chunks: number of chunks in flight (default is twice the number of processes)
+
+        .. code-block:: python
+
+            from bhive.blockchain import Blockchain
+            from bhive.blockdecoder import BlockDecoderPool
+            blockchain = Blockchain()
+            with BlockDecoderPool(processes=4) as pool:
+                for record in pool.records(blockchain.raw_blocks(40000000, 40010000), opNames=["transfer"]):
+                    print(record.block_num, record.op["amount"])
+
+    """
+    def __init__(self, processes=None, chunksize=20, max_chunks=None):
+        self.processes = processes
+        self.chunksize = chunksize
+        if max_chunks is None:
+            max_chunks = 2 * (processes or multiprocessing.cpu_count())
+        self.max_chunks = max(1, max_chunks)
+        self._pool = multiprocessing.Pool(processes=processes)
+
+    def decode(self, blocks, opNames=None):
+        """ Yields a list of :class:`OpRecord` for each block in order. The blocks are
+            read while the workers decode the previous blocks. Errors of the blocks
+            iterator and of the workers are raised.
+
+            :param iterable blocks: unparsed full blocks as dict
+            :param list opNames: operation types which are returned, all types when empty or None
+        """
+        if self._pool is None:
+            raise RuntimeError("BlockDecoderPool was closed")
+        opNames = list(opNames) if opNames else None
+        blocks = iter(blocks)
+        chunks = iter(lambda: list(islice(blocks, self.chunksize)), [])
+        for chunk_records in windowed_map(lambda chunk: self._pool.apply_async(decode_blocks, (chunk, opNames)),
+                                          chunks, self.max_chunks, result=lambda async_result: async_result.get()):
+            for records in chunk_records:
+                yield records
+
+    def records(self, blocks, opNames=None):
+        """ Yields the :class:`OpRecord` of all blocks in order
+
+            :param iterable blocks: unparsed full blocks as dict
+            :param list opNames: operation types which are returned, all types when empty or None
+        """
+        for records in self.decode(blocks, opNames=opNames):
+            for record in records:
+                yield record
+
+    def close(self):
+        """Stops the worker processes"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
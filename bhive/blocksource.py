@@ -0,0 +1,419 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import object
+import io
+import gzip
+import json
+import pickle
+import logging
+from bisect import bisect_left
+from .block import Block
+from .blockchain import Blockchain
+from .instance import shared_hive_instance
+log = logging.getLogger(__name__)
+
+
+class BlockSource(object):
+    """ Base class of all block sources, which can be used by
+        :func:`bhive.blockchain.Blockchain.blocks`, :func:`bhive.blockchain.Blockchain.stream`,
+        :func:`bhive.blockchain.Blockchain.ops_statistics` and
+        :func:`bhive.blockchain.Blockchain.awaitTxConfirmation`.
+
+        A source returns :class:`bhive.block.Block` objects. Sources with ``is_live = True``
+        receive new blocks, so that a stream without ``stop`` waits for them. Other sources
+        end the stream after their last block.
+
+        :param Hive hive_instance: Hive instance, which is set in the returned blocks
+
+        .. code-block:: python
+
+            from bhive.blockchain import Blockchain
+            from bhive.blocksource import FileBlockSource
+            source = FileBlockSource("blocks.jsonl.gz")
+            blockchain = Blockchain(block_source=source)
+            for op in blockchain.stream(opNames=["transfer"]):
+                print(op)
+
+    """
+    is_live = False
+
+    def __init__(self, hive_instance=None):
+        self.hive = hive_instance or shared_hive_instance()
+
+    def get_current_block_num(self):
+        """Returns the number of the newest block of the source or None"""
+        raise NotImplementedError
+
+    def get_first_block_num(self):
+        """Returns the number of the oldest block of the source or None"""
+        raise NotImplementedError
+
+    def get_block(self, block_num, only_ops=False, only_virtual_ops=False):
+        """ Returns a single block or None, when the block is not available
+
+            :param int block_num: block number
+            :param bool only_ops: Only operations are needed (default: False)
+            :param bool only_virtual_ops: Only virtual operations are needed (default: False)
+        """
+        raise NotImplementedError
+
+    def blocks(self, start, stop, only_ops=False, only_virtual_ops=False, **kwargs):
+        """ Yields the available blocks from start to stop (including stop) in order
+
+            :param int start: first block
+            :param int stop: last block
+            :param bool only_ops: Only operations are needed (default: False)
+            :param bool only_virtual_ops: Only virtual operations are needed (default: False)
+        """
+        for block_num in range(start, stop + 1):
+            block = self.get_block(block_num, only_ops=only_ops, only_virtual_ops=only_virtual_ops)
+            if block is not None:
+                yield block
+
+    def raw_blocks(self, start, stop):
+        """ Yields the available full blocks from start to stop (including stop) as
+            unparsed dicts, e.g. for :class:`bhive.blockdecoder.BlockDecoderPool`
+
+            :param int start: first block
+            :param int stop: last block
+        """
+        for block in self.blocks(start, stop):
+            block = block.json()
+            block.pop("id", None)
+            yield block
+
+    def _to_block(self, block):
+        """Returns block as :class:`bhive.block.Block` with id and identifier set"""
+        if not isinstance(block, Block):
+            only_ops = "operations" in block and "transactions" not in block
+            block = Block(block, only_ops=only_ops, hive_instance=self.hive)
+        block["id"] = block.block_num
+        block.identifier = block.block_num
+        return block
+
+    @staticmethod
+    def _select(block, only_ops=False, only_virtual_ops=False):
+        """ Returns the stored block, when it contains the requested data, or None.
+            Full blocks contain all operations, but no virtual operations.
+        """
+        if block is None:
+            return None
+        if only_virtual_ops and "transactions" in block:
+            return None
+        if not (only_ops or only_virtual_ops) and "transactions" not in block:
+            return None
+        return block
+
+    def close(self):
+        """Releases the resources of the source"""
+        pass
+
+    def __repr__(self):
+        return "<%s first_block=%s last_block=%s>" % (
+            self.__class__.__name__, str(self.get_first_block_num()), str(self.get_current_block_num()))
+
+
+class RPCBlockSource(BlockSource):
+    """ Receives the blocks from the node of a Hive instance, see
+        :func:`bhive.blockchain.Blockchain.blocks`
+
+        :param Hive hive_instance: Hive instance
+        :param str mode: (default) Irreversible block (``irreversible``) or
+            actual head block (``head``)
+        :param kwargs: default parameters of :func:`bhive.blockchain.Blockchain.blocks`,
+            e.g. ``threading=True`` or ``max_batch_size=50``
+
+        .. code-block:: python
+
+            from bhive.blocksource import RPCBlockSource
+            source = RPCBlockSource(mode="head", threading=True, thread_num=8)
+
+    """
+    is_live = True
+
+    def __init__(self, hive_instance=None, mode="irreversible", **kwargs):
+        super(RPCBlockSource, self).__init__(hive_instance=hive_instance)
+        self.blockchain = Blockchain(hive_instance=self.hive, mode=mode)
+        self.kwargs = kwargs
+
+    def get_current_block_num(self):
+        return self.blockchain.get_current_block_num()
+
+    def get_first_block_num(self):
+        return 1
+
+    def get_block(self, block_num, only_ops=False, only_virtual_ops=False):
+        block = Block(block_num, only_ops=only_ops, only_virtual_ops=only_virtual_ops, hive_instance=self.hive)
+        block["id"] = block.block_num
+        block.identifier = block.block_num
+        return block
+
+    def raw_blocks(self, start, stop):
+        return self.blockchain.raw_blocks(start, stop)
+
+    def blocks(self, start, stop, only_ops=False, only_virtual_ops=False, **kwargs):
+        blocks_kwargs = self.kwargs.copy()
+        blocks_kwargs.update(kwargs)
+        for block in self.blockchain.blocks(start=start, stop=stop, only_ops=only_ops,
+                                            only_virtual_ops=only_virtual_ops, **blocks_kwargs):
+            yield block
+
+
+class ArchiveBlockSource(BlockSource):
+    """ Reads the blocks of a :class:`bhive.blockarchive.BlockArchive`,
+        missing blocks are skipped
+
+        :param BlockArchive archive: block archive
+        :param Hive hive_instance: Hive instance
+        :param bool is_live: When True, a stream without stop waits for blocks, which are
+            appended by another process (default is False)
+    """
+    def __init__(self, archive, hive_instance=None, is_live=False):
+        super(ArchiveBlockSource, self).__init__(hive_instance=hive_instance)
+        self.archive = archive
+        self.is_live = is_live
+
+    def get_current_block_num(self):
+        return self.archive.last_block
+
+    def get_first_block_num(self):
+        return self.archive.first_block
+
+    def get_block(self, block_num, only_ops=False, only_virtual_ops=False):
+        return self._select(self.archive.get_block(block_num, hive_instance=self.hive),
+                            only_ops=only_ops, only_virtual_ops=only_virtual_ops)
+
+    def raw_blocks(self, start, stop):
+        return self.archive.blocks(start, stop)
+
+    def close(self):
+        self.archive.close()
+
+
+class MemoryBlockSource(BlockSource):
+    """ Keeps the blocks in memory, e.g. as fixture for tests and benchmarks
+
+        Full blocks as well as operation blocks (``only_ops=True``) can be stored,
+        a full block is returned for only_ops requests, but not for only_virtual_ops requests.
+
+        :param list blocks: blocks as dict or :class:`bhive.block.Block`
+        :param Hive hive_instance: Hive instance
+
+        .. code-block:: python
+
+            from bhive.blockchain import Blockchain
+            from bhive.blocksource import MemoryBlockSource
+            blockchain = Blockchain()
+            source = MemoryBlockSource(blockchain.blocks(start=40000000, stop=40000100))
+            ops_stat = Blockchain(block_source=source).ops_statistics(40000000, with_virtual_ops=False)
+
+    """
+    def __init__(self, blocks=None, hive_instance=None):
+        super(MemoryBlockSource, self).__init__(hive_instance=hive_instance)
+        self._blocks = {}
+        for block in blocks or []:
+            self.append(block)
+
+    def append(self, block):
+        """ Adds a block, a stored block with the same number is replaced
+
+            :param block: block as dict or :class:`bhive.block.Block`
+        """
+        block = self._to_block(block)
+        self._blocks[block.block_num] = block
+
+    def __len__(self):
+        return len(self._blocks)
+
+    def get_current_block_num(self):
+        if len(self._blocks) == 0:
+            return None
+        return max(self._blocks)
+
+    def get_first_block_num(self):
+        if len(self._blocks) == 0:
+            return None
+        return min(self._blocks)
+
+    def get_block(self, block_num, only_ops=False, only_virtual_ops=False):
+        return self._select(self._blocks.get(block_num), only_ops=only_ops, only_virtual_ops=only_virtual_ops)
+
+    def blocks(self, start, stop, only_ops=False, only_virtual_ops=False, **kwargs):
+        for block_num in sorted(self._blocks):
+            if block_num < start:
+                continue
+            if block_num > stop:
+                break
+            block = self._select(self._blocks[block_num], only_ops=only_ops, only_virtual_ops=only_virtual_ops)
+            if block is not None:
+                yield block
+
+
+class FileBlockSource(BlockSource):
+    """ Reads blocks from a file, which stores one block after another in
+        ascending order. The file is read sequentially by :func:`blocks`. On the
+        first lookup, the block numbers and their file offsets are read once,
+        so that :func:`get_block` seeks directly to the block.
+
+        Supported formats are ``jsonl`` (one json block per line) and ``pickle``
+        (consecutive pickled dicts). The format is taken from the file name, when not set,
+        and files ending with ``.gz`` are gzip compressed.
+        Files are created with :func:`FileBlockSource.write`.
+
+        :param str filename: file name
+        :param str file_format: ``jsonl`` or ``pickle`` (default is taken from filename)
+        :param Hive hive_instance: Hive instance
+
+        .. code-block:: python
+
+            from bhive.blockchain import Blockchain
+            from bhive.blocksource import FileBlockSource
+            blockchain = Blockchain()
+            FileBlockSource.write("blocks.jsonl.gz", blockchain.blocks(start=40000000, stop=40001000))
+            source = FileBlockSource("blocks.jsonl.gz")
+
+    """
+    def __init__(self, filename, file_format=None, hive_instance=None):
+        super(FileBlockSource, self).__init__(hive_instance=hive_instance)
+        self.filename = filename
+        self.file_format = file_format or self.get_file_format(filename)
+        self._first_block_num = None
+        self._last_block_num = None
+        self._block_nums = None
+        self._offsets = None
+
+    @staticmethod
+    def get_file_format(filename):
+        """Returns the file format, which is used for filename"""
+        name = filename[:-3] if filename.endswith(".gz") else filename
+        if name.endswith(".pkl") or name.endswith(".pickle"):
+            return "pickle"
+        return "jsonl"
+
+    @staticmethod
+    def _open(filename, mode):
+        if filename.endswith(".gz"):
+            return gzip.open(filename, mode)
+        return io.open(filename, mode)
+
+    @staticmethod
+    def write(filename, blocks, file_format=None):
+        """ Writes blocks to a file and returns the number of written blocks
+
+            :param str filename: file name, a name ending with ``.gz`` is compressed
+            :param iterable blocks: blocks in ascending order as dict or :class:`bhive.block.Block`
+            :param str file_format: ``jsonl`` or ``pickle`` (default is taken from filename)
+        """
+        file_format = file_format or FileBlockSource.get_file_format(filename)
+        cnt = 0
+        with FileBlockSource._open(filename, "wb") as f:
+            for block in blocks:
+                if isinstance(block, Block):
+                    block = block.json()
+                else:
+                    block = dict(block)
+                block.pop("id", None)
+                if file_format == "pickle":
+                    pickle.dump(block, f, protocol=2)
+                else:
+                    f.write(json.dumps(block, separators=(',', ':')).encode("utf-8"))
+                    f.write(b"\n")
+                cnt += 1
+        return cnt
+
+    def _read(self, offset=0):
+        """Yields (offset, block) of the stored blocks from the file offset on, blocks are dicts"""
+        with self._open(self.filename, "rb") as f:
+            if offset > 0:
+                f.seek(offset)
+            while True:
+                offset = f.tell()
+                if self.file_format == "pickle":
+                    try:
+                        block = pickle.load(f)
+                    except EOFError:
+                        return
+                else:
+                    line = f.readline()
+                    if len(line) == 0:
+                        return
+                    line = line.strip()
+                    if len(line) == 0:
+                        continue
+                    block = json.loads(line.decode("utf-8"))
+                yield offset, block
+
+    def _read_block_nums(self):
+        """Reads the block numbers and builds the index of their file offsets"""
+        block_nums = []
+        offsets = []
+        for offset, block in self._read():
+            block_nums.append(self._to_block(block).block_num)
+            offsets.append(offset)
+        self._block_nums = block_nums
+        self._offsets = offsets
+        if len(block_nums) > 0:
+            self._first_block_num = block_nums[0]
+            self._last_block_num = block_nums[-1]
+
+    def _get_offset(self, start):
+        """ Returns the file offset of the first block >= start, or None when there is no
+            such block. Before the index is built, the file is read from the start.
+        """
+        if self._offsets is None:
+            return 0
+        i = bisect_left(self._block_nums, start)
+        if i >= len(self._offsets):
+            return None
+        return self._offsets[i]
+
+    def get_current_block_num(self):
+        if self._last_block_num is None:
+            self._read_block_nums()
+        return self._last_block_num
+
+    def get_first_block_num(self):
+        if self._first_block_num is None:
+            self._read_block_nums()
+        return self._first_block_num
+
+    def raw_blocks(self, start, stop):
+        offset = self._get_offset(start)
+        if offset is None:
+            return
+        for offset, block in self._read(offset):
+            if "block_id" not in block:
+                continue
+            block_num = int(block["block_id"][:8], base=16)
+            if block_num < start:
+                continue
+            if block_num > stop:
+                break
+            yield block
+
+    def get_block(self, block_num, only_ops=False, only_virtual_ops=False):
+        if self._offsets is None:
+            self._read_block_nums()
+        i = bisect_left(self._block_nums, block_num)
+        if i >= len(self._block_nums) or self._block_nums[i] != block_num:
+            return None
+        for offset, block in self._read(self._offsets[i]):
+            return self._select(self._to_block(block), only_ops=only_ops, only_virtual_ops=only_virtual_ops)
+        return None
+
+    def blocks(self, start, stop, only_ops=False, only_virtual_ops=False, **kwargs):
+        offset = self._get_offset(start)
+        if offset is None:
+            return
+        for offset, block in self._read(offset):
+            block = self._to_block(block)
+            if block.block_num < start:
+                continue
+            if block.block_num > stop:
+                break
+            block = self._select(block, only_ops=only_ops, only_virtual_ops=only_virtual_ops)
+            if block is not None:
+                yield block
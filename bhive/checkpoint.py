@@ -0,0 +1,223 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import object
+import os
+import json
+import time
+import sqlite3
+import logging
+log = logging.getLogger(__name__)
+
+
+class Checkpoint(object):
+    """ Stores the position of a block or operation stream, so that
+        :func:`bhive.blockchain.Blockchain.stream` and
+        :func:`bhive.blockchain.Blockchain.blocks` can resume after a restart.
+
+        The position is the last processed operation (block_num, trx_num, op_num).
+        When trx_num and op_num are None, the whole block was processed.
+        This class keeps the position in memory only, :class:`FileCheckpoint`
+        and :class:`SqliteCheckpoint` store it persistently.
+
+        :param float flush_interval: the position is written at least every
+            flush_interval seconds (default is 10)
+        :param int flush_count: the position is written after flush_count
+            changes (default is 1000)
+
+        .. code-block:: python
+
+            from bhive.blockchain import Blockchain
+            from bhive.checkpoint import FileCheckpoint
+            blockchain = Blockchain()
+            checkpoint = FileCheckpoint("transfers.json", flush_interval=5)
+            for op in blockchain.stream(opNames=["transfer"], start=40000000, checkpoint=checkpoint):
+                print(op)
+
+    """
+    def __init__(self, flush_interval=10, flush_count=1000):
+        self.flush_interval = flush_interval
+        self.flush_count = flush_count
+        self.block_num = None
+        self.trx_num = None
+        self.op_num = None
+        self._changes = 0
+        self._last_flush = time.time()
+        self.load()
+
+    def _read(self):
+        """Returns the stored (block_num, trx_num, op_num) or None"""
+        return None
+
+    def _write(self, block_num, trx_num, op_num):
+        """Stores the position"""
+        pass
+
+    def load(self):
+        """Reads the stored position"""
+        position = self._read()
+        if position is None:
+            self.block_num, self.trx_num, self.op_num = None, None, None
+        else:
+            self.block_num, self.trx_num, self.op_num = position
+        self._changes = 0
+
+    def set(self, block_num, trx_num=None, op_num=None):
+        """ Sets a new position, which is written when flush_count or
+            flush_interval is reached
+
+            :param int block_num: block number
+            :param int trx_num: transaction number in the block or None, when the
+                block was processed completely
+            :param int op_num: operation number in the transaction or None
+        """
+        self.block_num = int(block_num)
+        self.trx_num = trx_num
+        self.op_num = op_num
+        self._changes += 1
+        if self._changes >= self.flush_count or time.time() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Writes the position, when it has changed"""
+        if self._changes > 0 and self.block_num is not None:
+            self._write(self.block_num, self.trx_num, self.op_num)
+        self._changes = 0
+        self._last_flush = time.time()
+
+    def reset(self):
+        """Removes the stored position"""
+        self.block_num, self.trx_num, self.op_num = None, None, None
+        self._changes = 0
+        self._clear()
+
+    def _clear(self):
+        pass
+
+    @property
+    def block_completed(self):
+        """Returns True, when all operations of block_num were processed"""
+        return self.block_num is not None and self.trx_num is None
+
+    def get_start_block(self):
+        """Returns the block number, at which a stream continues, or None"""
+        if self.block_num is None:
+            return None
+        if self.block_completed:
+            return self.block_num + 1
+        return self.block_num
+
+    def is_processed(self, block_num, trx_num=None, op_num=None):
+        """Returns True, when the given block or operation was already processed"""
+        if self.block_num is None or block_num is None:
+            return False
+        block_num = int(block_num)
+        if block_num != self.block_num:
+            return block_num < self.block_num
+        if self.block_completed:
+            return True
+        if trx_num is None:
+            return False
+        return (trx_num, op_num) <= (self.trx_num, self.op_num)
+
+    def __repr__(self):
+        return "<%s block_num=%s trx_num=%s op_num=%s>" % (
+            self.__class__.__name__, str(self.block_num), str(self.trx_num), str(self.op_num))
+
+
+class FileCheckpoint(Checkpoint):
+    """ Stores the stream position in a json file, see :class:`Checkpoint`
+
+        :param str path: file name
+        :param float flush_interval: the position is written at least every
+            flush_interval seconds (default is 10)
+        :param int flush_count: the position is written after flush_count
+            changes (default is 1000)
+    """
+    def __init__(self, path, flush_interval=10, flush_count=1000):
+        self.path = path
+        super(FileCheckpoint, self).__init__(flush_interval=flush_interval, flush_count=flush_count)
+
+    def _read(self):
+        if not os.path.isfile(self.path):
+            return None
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        return data["block_num"], data.get("trx_num"), data.get("op_num")
+
+    def _write(self, block_num, trx_num, op_num):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"block_num": block_num, "trx_num": trx_num, "op_num": op_num}, f)
+        # The file is replaced at once, so that a crash cannot leave a partial file
+        getattr(os, "replace", os.rename)(tmp_path, self.path)
+
+    def _clear(self):
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+
+class SqliteCheckpoint(Checkpoint):
+    """ Stores the stream position in the `checkpoints` table of a SQLite3
+        database, see :class:`Checkpoint`. Several streams can use the same
+        database with different names.
+
+        :param str path: database file
+        :param str name: name of the stream (default is "stream")
+        :param float flush_interval: the position is written at least every
+            flush_interval seconds (default is 10)
+        :param int flush_count: the position is written after flush_count
+            changes (default is 1000)
+    """
+    __tablename__ = 'checkpoints'
+
+    def __init__(self, path, name="stream", flush_interval=10, flush_count=1000):
+        self.path = path
+        self.name = name
+        self.create_table()
+        super(SqliteCheckpoint, self).__init__(flush_interval=flush_interval, flush_count=flush_count)
+
+    def create_table(self):
+        """ Create the table, when it does not exist"""
+        query = ("CREATE TABLE IF NOT EXISTS {0} ("
+                 "name STRING(256) PRIMARY KEY,"
+                 "block_num INTEGER,"
+                 "trx_num INTEGER,"
+                 "op_num INTEGER,"
+                 "updated REAL)".format(self.__tablename__))
+        connection = sqlite3.connect(self.path)
+        cursor = connection.cursor()
+        cursor.execute(query)
+        connection.commit()
+        connection.close()
+
+    def _read(self):
+        query = ("SELECT block_num, trx_num, op_num FROM {0} WHERE name=?".format(self.__tablename__), (self.name, ))
+        connection = sqlite3.connect(self.path)
+        cursor = connection.cursor()
+        cursor.execute(*query)
+        result = cursor.fetchone()
+        connection.close()
+        if result is None:
+            return None
+        return result[0], result[1], result[2]
+
+    def _write(self, block_num, trx_num, op_num):
+        query = ("INSERT OR REPLACE INTO {0} (name, block_num, trx_num, op_num, updated) "
+                 "VALUES (?, ?, ?, ?, ?)".format(self.__tablename__),
+                 (self.name, block_num, trx_num, op_num, time.time()))
+        connection = sqlite3.connect(self.path)
+        cursor = connection.cursor()
+        cursor.execute(*query)
+        connection.commit()
+        connection.close()
+
+    def _clear(self):
+        query = ("DELETE FROM {0} WHERE name=?".format(self.__tablename__), (self.name, ))
+        connection = sqlite3.connect(self.path)
+        cursor = connection.cursor()
+        cursor.execute(*query)
+        connection.commit()
+        connection.close()
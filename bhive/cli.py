@@ -136,6 +136,20 @@ def unlock_wallet(hv, password=None):
         return True
 
 
+def format_node_latency(latency):
+    if latency is None:
+        return "-"
+    return "%.2f" % (latency * 1000)
+
+
+def format_node_head_block(head_block, lagging=False):
+    if head_block is None:
+        return "-"
+    if lagging:
+        return "%d (lagging)" % head_block
+    return str(head_block)
+
+
 def node_answer_time(node):
     try:
         hv_local = Hive(node=node, num_retries=2, num_retries_call=2, timeout=10)
@@ -319,8 +333,20 @@ def pingnode(raw, sort, remove, threading):
         hv.rpc.rpcconnect()
     nodes = hv.get_default_nodes()
     if not raw:
-        t = PrettyTable(["Node", "Answer time [ms]"])
+        t = PrettyTable(["Node", "Answer time [ms]", "Avg. latency [ms]", "Error rate", "Head block"])
         t.align = "l"
+
+    def node_stats_row(node, answer_time):
+        node_stats = None
+        if hv.rpc is not None:
+            node_stats = hv.rpc.nodes.get_node(node)
+        if node_stats is None:
+            return [node, "%.2f" % (answer_time * 1000), "-", "-", "-"]
+        if answer_time != float("inf"):
+            node_stats.update_latency(answer_time, alpha=hv.rpc.nodes.ewma_alpha)
+        lagging = hv.rpc.nodes.is_lagging(node_stats)
+        return [node, "%.2f" % (answer_time * 1000), format_node_latency(node_stats.latency),
+                "%.2f" % node_stats.error_rate, format_node_head_block(node_stats.head_block, lagging)]
     if sort:
         ping_times = []
         for node in nodes:
@@ -349,7 +375,7 @@ def pingnode(raw, sort, remove, threading):
         hv.set_default_nodes(sorted_nodes)
         if not raw:
             for i in sorted_arg:
-                t.add_row([nodes[i], "%.2f" % (ping_times[i] * 1000)])
+                t.add_row(node_stats_row(nodes[i], ping_times[i]))
             print(t)
         else:
             print(ping_times[sorted_arg])
@@ -360,7 +386,7 @@ def pingnode(raw, sort, remove, threading):
         if raw:
             print(rpc_time_str)
             return
-        t.add_row([node, rpc_time_str])
+        t.add_row(node_stats_row(node, rpc_answer_time))
         print(t)
 
 
@@ -397,6 +423,11 @@ def currentnode(version, url):
         t.add_row(["Node-Url", node[0]])
     if not offline:
         t.add_row(["Version", hv.get_blockchain_version()])
+        node_stats = hv.rpc.nodes.node.get_stats()
+        lagging = hv.rpc.nodes.is_lagging(hv.rpc.nodes.node)
+        t.add_row(["Avg. latency [ms]", format_node_latency(node_stats["latency"])])
+        t.add_row(["Error rate", "%.2f" % node_stats["error_rate"]])
+        t.add_row(["Head block", format_node_head_block(node_stats["head_block"], lagging)])
     else:
         t.add_row(["Version", "hivepy is in offline mode..."])
     print(t)
@@ -0,0 +1,307 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import object
+import sys
+import threading
+import logging
+import multiprocessing
+from collections import deque
+from .blockchain import Blockchain
+if sys.version_info < (3, 0):
+    from Queue import Queue
+else:
+    from queue import Queue
+FUTURES_MODULE = None
+if not FUTURES_MODULE:
+    try:
+        from concurrent.futures import ProcessPoolExecutor, wait
+        FUTURES_MODULE = "futures"
+    except ImportError:
+        FUTURES_MODULE = None
+log = logging.getLogger(__name__)
+
+ACCOUNT_KEYS = frozenset([
+    "account", "author", "voter", "from", "to", "owner", "creator", "new_account_name",
+    "producer", "curator", "comment_author", "parent_author", "delegator", "delegatee",
+    "from_account", "to_account", "current_owner", "open_owner", "witness", "publisher",
+    "agent", "who", "receiver", "benefactor", "required_auths", "required_posting_auths",
+])
+
+_STOP = object()
+
+
+def involves_accounts(accounts):
+    """ Returns a predicate for :func:`OperationDispatcher.register`, which is True
+        for operations with one of the given accounts in an account field
+        (e.g. voter, author, from, to or required_posting_auths)
+
+        :param list accounts: account names
+    """
+    accounts = frozenset(accounts)
+
+    def predicate(op):
+        for key in ACCOUNT_KEYS:
+            if key not in op:
+                continue
+            value = op[key]
+            if isinstance(value, list):
+                if not accounts.isdisjoint(value):
+                    return True
+            elif value in accounts:
+                return True
+        return False
+    return predicate
+
+
+def custom_json_ids(ids):
+    """ Returns a predicate for :func:`OperationDispatcher.register`, which is True
+        for custom_json operations with one of the given ids
+
+        :param list ids: custom_json ids, e.g. ``["follow", "community"]``
+    """
+    ids = frozenset(ids)
+
+    def predicate(op):
+        return op.get("id") in ids
+    return predicate
+
+
+class OperationHandler(object):
+    """ Handler of an :class:`OperationDispatcher`, which is returned by
+        :func:`OperationDispatcher.register`
+
+        :param func: function which is called with each matching operation
+        :param list op_types: operation types or None for all operations
+        :param predicate: function which returns True for operations that are handled
+        :param str mode: ``None`` (handler runs in the stream thread), ``thread``
+            (handler runs in its own thread) or ``process`` (handler runs in the process pool)
+        :param int max_queue_size: number of waiting operations of a thread or process handler
+        :param str name: name of the handler
+    """
+    def __init__(self, func, op_types=None, predicate=None, mode=None, max_queue_size=1000, name=None):
+        if mode not in [None, "thread", "process"]:
+            raise ValueError("invalid value for 'mode'!")
+        self.func = func
+        self.op_types = op_types
+        self.predicate = predicate
+        self.mode = mode
+        self.name = name or getattr(func, "__name__", repr(func))
+        self.queue = Queue(maxsize=max_queue_size) if mode is not None else None
+        self.count = 0
+        self._thread = None
+
+    def __repr__(self):
+        return "<OperationHandler %s mode=%s count=%d>" % (self.name, str(self.mode), self.count)
+
+
+class OperationDispatcher(object):
+    """ Streams the operations once and routes them to the registered handlers
+
+        Handlers are registered for operation types and/or a predicate. Operations are
+        routed by their type with a single dict lookup, so that many consumers can share
+        one stream, in which each block is received and parsed only once.
+
+        Handlers run in the stream thread by default. With ``mode="thread"`` or
+        ``mode="process"``, a handler receives the operations in order through its own
+        bounded queue. When the queue is full, the stream waits (backpressure).
+        A process handler keeps up to ``process_workers`` operations in the process pool,
+        so that its calls run in parallel and may finish out of order.
+        Process handlers and the operations have to be picklable.
+
+        :param Blockchain blockchain: Blockchain instance, which is streamed
+        :param Hive hive_instance: Hive instance, when blockchain is not set
+        :param int max_queue_size: default queue size of thread and process handlers (default is 1000)
+        :param int process_workers: number of worker processes for process handlers
+            (default is the number of CPUs)
+
+        .. code-block:: python
+
+            from bhive.blockchain import Blockchain
+            from bhive.dispatcher import OperationDispatcher, involves_accounts
+            dispatcher = OperationDispatcher(Blockchain(mode="head"))
+
+            @dispatcher.on("vote", "comment")
+            def on_post_or_vote(op):
+                print(op["type"], op["author"])
+
+            dispatcher.register(print, op_types=["transfer"], predicate=involves_accounts(["hiveio"]),
+                                mode="thread")
+            dispatcher.run()
+
+    """
+    def __init__(self, blockchain=None, hive_instance=None, max_queue_size=1000, process_workers=None):
+        self.blockchain = blockchain or Blockchain(hive_instance=hive_instance)
+        self.max_queue_size = max_queue_size
+        self.process_workers = process_workers
+        self.handlers = []
+        self._routes = {}
+        self._any_handlers = []
+        self._process_pool = None
+        self._process_window = 1
+        self._exception = None
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def _get_op_type(op_type):
+        if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
+            return op_type[:-10]
+        return op_type
+
+    def register(self, func, op_types=None, predicate=None, mode=None, max_queue_size=None, name=None):
+        """ Registers a handler and returns the :class:`OperationHandler`
+
+            :param func: function which is called with each matching operation
+            :param list op_types: operation types (e.g. ``["vote", "transfer"]``) or
+                None for all operations
+            :param predicate: function which is called with the operation and returns True,
+                when the operation should be handled (e.g. :func:`involves_accounts`)
+            :param str mode: ``None`` (handler runs in the stream thread), ``thread``
+                or ``process``
+            :param int max_queue_size: queue size of a thread or process handler
+                (default is the max_queue_size of the dispatcher)
+            :param str name: name of the handler
+        """
+        if mode == "process" and FUTURES_MODULE is None:
+            raise Exception("concurrent.futures is needed for process handlers")
+        if op_types is not None:
+            op_types = [self._get_op_type(op_type) for op_type in op_types]
+        handler = OperationHandler(func, op_types=op_types, predicate=predicate, mode=mode,
+                                   max_queue_size=max_queue_size or self.max_queue_size, name=name)
+        self.handlers.append(handler)
+        if op_types is None:
+            self._any_handlers.append(handler)
+        else:
+            for op_type in op_types:
+                self._routes.setdefault(op_type, []).append(handler)
+        return handler
+
+    def on(self, *op_types, **kwargs):
+        """ Decorator which registers a function for the given operation types,
+            the keyword arguments are passed to :func:`register`
+        """
+        def decorator(func):
+            self.register(func, op_types=list(op_types) or None, **kwargs)
+            return func
+        return decorator
+
+    def get_op_names(self):
+        """ Returns the operation types which are streamed, an empty list means all types"""
+        if len(self._any_handlers) > 0:
+            return []
+        return sorted(self._routes)
+
+    def dispatch(self, op):
+        """ Passes a single operation to the matching handlers
+
+            :param op: operation in the output format of :func:`bhive.blockchain.Blockchain.stream`
+        """
+        if self._exception is not None:
+            raise self._exception
+        if "type" in op:
+            op_type = op["type"]
+        else:
+            op_type = op["op"][0]
+        handlers = self._routes.get(op_type)
+        if handlers is None:
+            handlers = self._any_handlers
+        elif len(self._any_handlers) > 0:
+            handlers = handlers + self._any_handlers
+        for handler in handlers:
+            if handler.predicate is not None and not handler.predicate(op):
+                continue
+            handler.count += 1
+            if handler.queue is None:
+                handler.func(op)
+            else:
+                handler.queue.put(op)
+
+    def _set_exception(self, handler, e):
+        log.error("Handler %s raised %s" % (handler.name, str(e)))
+        if self._exception is None:
+            self._exception = e
+
+    def _worker(self, handler):
+        """Passes the queued operations of a thread or process handler"""
+        # Submitted operations of a process handler, the oldest is waited for first
+        pending = deque()
+
+        def done_callback(future):
+            if not future.cancelled() and future.exception() is not None:
+                self._set_exception(handler, future.exception())
+
+        while True:
+            op = handler.queue.get()
+            try:
+                if op is _STOP:
+                    wait(pending)
+                    return
+                # After an error, the remaining operations are discarded
+                if self._exception is not None:
+                    continue
+                if handler.mode == "process":
+                    future = self._process_pool.submit(handler.func, op)
+                    future.add_done_callback(done_callback)
+                    pending.append(future)
+                    if len(pending) >= self._process_window:
+                        wait([pending.popleft()])
+                else:
+                    handler.func(op)
+            except Exception as e:
+                self._set_exception(handler, e)
+            finally:
+                handler.queue.task_done()
+
+    def _start_workers(self):
+        self._exception = None
+        self._stop_event.clear()
+        if any(handler.mode == "process" for handler in self.handlers):
+            self._process_window = self.process_workers or multiprocessing.cpu_count()
+            self._process_pool = ProcessPoolExecutor(max_workers=self._process_window)
+        for handler in self.handlers:
+            if handler.mode is None:
+                continue
+            handler._thread = threading.Thread(target=self._worker, args=(handler, ), name="handler-%s" % handler.name)
+            handler._thread.daemon = True
+            handler._thread.start()
+
+    def _stop_workers(self):
+        """Waits until the queued operations were handled"""
+        for handler in self.handlers:
+            if handler._thread is None:
+                continue
+            handler.queue.put(_STOP)
+            handler._thread.join()
+            handler._thread = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
+
+    def run(self, **kwargs):
+        """ Streams the operations and passes them to the handlers. Returns the number
+            of streamed operations, after all queued operations were handled.
+            The first exception of a handler is raised.
+
+            :param kwargs: parameters of :func:`bhive.blockchain.Blockchain.stream`,
+                e.g. ``start``, ``stop``, ``checkpoint`` or ``op_views``
+        """
+        kwargs.pop("opNames", None)
+        self._start_workers()
+        cnt = 0
+        try:
+            for op in self.blockchain.stream(opNames=self.get_op_names(), **kwargs):
+                self.dispatch(op)
+                cnt += 1
+                if self._stop_event.is_set():
+                    break
+        finally:
+            self._stop_workers()
+        if self._exception is not None:
+            raise self._exception
+        return cnt
+
+    def stop(self):
+        """Ends :func:`run` after the current operation"""
+        self._stop_event.set()
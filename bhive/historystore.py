@@ -0,0 +1,253 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import object
+import json
+import sqlite3
+import logging
+from datetime import datetime, date, time
+from .account import Account
+from .instance import shared_hive_instance
+from .utils import addTzInfo, formatTimeString
+log = logging.getLogger(__name__)
+
+
+class AccountHistoryStore(object):
+    """ Stores the account history of several accounts in a SQLite3 database,
+        so that reports read it locally instead of receiving it again.
+
+        The operations are stored in the output format of
+        :func:`bhive.account.Account.history` with the operation index as key.
+        :func:`sync` receives only the operations after the highest stored index
+        and stores only operations from irreversible blocks, so that a fork cannot
+        leave dropped operations in the store.
+
+        :param str path: database file
+        :param Hive hive_instance: Hive instance
+
+        .. code-block:: python
+
+            from bhive.account import Account
+            from bhive.historystore import AccountHistoryStore
+            from bhive.snapshot import AccountSnapshot
+            store = AccountHistoryStore("history.sqlite")
+            store.sync("bhive.app")
+            for op in store.history("bhive.app", only_ops=["transfer"]):
+                print(op)
+            print(Account("bhive.app").curation_stats(history_store=store))
+            snapshot = AccountSnapshot("bhive.app")
+            snapshot.get_account_history(history_store=store)
+
+    """
+    __tablename__ = 'account_history'
+
+    def __init__(self, path, hive_instance=None):
+        self.path = path
+        self.hive = hive_instance or shared_hive_instance()
+        self.create_table()
+
+    def create_table(self):
+        """ Create the table and its indices, when they do not exist"""
+        queries = ["CREATE TABLE IF NOT EXISTS {0} ("
+                   "account STRING(16),"
+                   "idx INTEGER,"
+                   "block INTEGER,"
+                   "timestamp STRING(19),"
+                   "type STRING(64),"
+                   "op TEXT,"
+                   "PRIMARY KEY (account, idx))".format(self.__tablename__),
+                   "CREATE INDEX IF NOT EXISTS {0}_block ON {0} (account, block)".format(self.__tablename__),
+                   "CREATE INDEX IF NOT EXISTS {0}_timestamp ON {0} (account, timestamp)".format(self.__tablename__),
+                   "CREATE INDEX IF NOT EXISTS {0}_type ON {0} (account, type, idx)".format(self.__tablename__)]
+        connection = sqlite3.connect(self.path)
+        cursor = connection.cursor()
+        for query in queries:
+            cursor.execute(query)
+        connection.commit()
+        connection.close()
+
+    @staticmethod
+    def _get_name(account):
+        if isinstance(account, Account):
+            return account["name"]
+        return account
+
+    def get_max_index(self, account):
+        """ Returns the highest stored operation index of an account or None
+
+            :param str account: account name
+        """
+        query = ("SELECT MAX(idx) FROM {0} WHERE account=?".format(self.__tablename__), (self._get_name(account), ))
+        connection = sqlite3.connect(self.path)
+        cursor = connection.cursor()
+        cursor.execute(*query)
+        result = cursor.fetchone()
+        connection.close()
+        return result[0]
+
+    def get_count(self, account):
+        """ Returns the number of stored operations of an account
+
+            :param str account: account name
+        """
+        query = ("SELECT COUNT(*) FROM {0} WHERE account=?".format(self.__tablename__), (self._get_name(account), ))
+        connection = sqlite3.connect(self.path)
+        cursor = connection.cursor()
+        cursor.execute(*query)
+        result = cursor.fetchone()
+        connection.close()
+        return result[0]
+
+    def get_accounts(self):
+        """ Returns the names of all stored accounts"""
+        connection = sqlite3.connect(self.path)
+        cursor = connection.cursor()
+        cursor.execute("SELECT DISTINCT account FROM {0} ORDER BY account".format(self.__tablename__))
+        result = [row[0] for row in cursor.fetchall()]
+        connection.close()
+        return result
+
+    def _row(self, account, op):
+        timestamp = op["timestamp"]
+        if isinstance(timestamp, (datetime, date, time)):
+            timestamp = formatTimeString(timestamp)
+        return (account, op["index"], op["block"], timestamp, op["type"], json.dumps(op, separators=(',', ':')))
+
+    def add(self, account, ops):
+        """ Stores operations in the output format of :func:`bhive.account.Account.history`,
+            stored operations with the same index are replaced
+
+            :param str account: account name
+            :param list ops: operations
+        """
+        account = self._get_name(account)
+        rows = [self._row(account, op) for op in ops]
+        if len(rows) == 0:
+            return
+        query = "INSERT OR REPLACE INTO {0} (account, idx, block, timestamp, type, op) VALUES (?, ?, ?, ?, ?, ?)".format(self.__tablename__)
+        connection = sqlite3.connect(self.path)
+        cursor = connection.cursor()
+        cursor.executemany(query, rows)
+        connection.commit()
+        connection.close()
+
+    def sync(self, account, batch_size=1000, threading=False, thread_num=8, commit_count=10000):
+        """ Receives and stores the operations after the highest stored index and
+            returns the number of new operations. Operations from blocks after the
+            last irreversible block are not stored, they are received by a later sync.
+            An interrupted sync continues after the last stored operation.
+
+            :param str account: account name
+            :param int batch_size: operations per api call (default is 1000)
+            :param bool threading: When True, the pages are received in parallel, see
+                :func:`bhive.account.Account.history`
+            :param int thread_num: number of parallel pages, when threading is True (default is 8)
+            :param int commit_count: operations are written after commit_count operations (default is 10000)
+        """
+        if not isinstance(account, Account):
+            account = Account(account, hive_instance=self.hive)
+        max_index = self.get_max_index(account)
+        start = 0 if max_index is None else max_index + 1
+        if start > account.virtual_op_count():
+            return 0
+        last_irreversible_block = self.hive.get_dynamic_global_properties(False)["last_irreversible_block_num"]
+        cnt = 0
+        ops = []
+        for op in account.history(start=start, use_block_num=False, batch_size=batch_size,
+                                  threading=threading, thread_num=thread_num):
+            if op["block"] > last_irreversible_block:
+                break
+            ops.append(op)
+            if len(ops) >= commit_count:
+                self.add(account, ops)
+                cnt += len(ops)
+                ops = []
+        self.add(account, ops)
+        cnt += len(ops)
+        return cnt
+
+    def delete(self, account):
+        """ Removes all stored operations of an account
+
+            :param str account: account name
+        """
+        query = ("DELETE FROM {0} WHERE account=?".format(self.__tablename__), (self._get_name(account), ))
+        connection = sqlite3.connect(self.path)
+        cursor = connection.cursor()
+        cursor.execute(*query)
+        connection.commit()
+        connection.close()
+
+    def _get_column(self, value, use_block_num):
+        """Returns the column and the value for a start or stop parameter"""
+        if isinstance(value, (datetime, date, time)):
+            return "timestamp", formatTimeString(addTzInfo(value))
+        elif use_block_num:
+            return "block", value
+        return "idx", value
+
+    def _query(self, account, lower=None, upper=None, use_block_num=True, only_ops=[], exclude_ops=[], order=1):
+        conditions = ["account=?"]
+        params = [self._get_name(account)]
+        for value, operator in [(lower, ">="), (upper, "<=")]:
+            if value is None:
+                continue
+            column, value = self._get_column(value, use_block_num)
+            conditions.append("%s%s?" % (column, operator))
+            params.append(value)
+        if only_ops:
+            conditions.append("type IN (%s)" % ",".join(["?"] * len(only_ops)))
+            params.extend(only_ops)
+        if exclude_ops:
+            conditions.append("type NOT IN (%s)" % ",".join(["?"] * len(exclude_ops)))
+            params.extend(exclude_ops)
+        query = "SELECT op FROM {0} WHERE {1} ORDER BY idx {2}".format(
+            self.__tablename__, " AND ".join(conditions), "ASC" if order == 1 else "DESC")
+        connection = sqlite3.connect(self.path)
+        try:
+            cursor = connection.cursor()
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(1000)
+                if len(rows) == 0:
+                    break
+                for row in rows:
+                    yield json.loads(row[0])
+        finally:
+            connection.close()
+
+    def history(self, account, start=None, stop=None, use_block_num=True, only_ops=[], exclude_ops=[]):
+        """ Yields the stored operations of an account, the earliest operation will be
+            first. The parameters are the same as for :func:`bhive.account.Account.history`.
+
+            :param str account: account name
+            :param start: start number/date of operations to return (*optional*)
+            :type start: int, datetime
+            :param stop: stop number/date of operations to return (*optional*)
+            :type stop: int, datetime
+            :param bool use_block_num: if true, start and stop are block numbers,
+                otherwise virtual OP count numbers.
+            :param array only_ops: Limit generator by these operations (*optional*)
+            :param array exclude_ops: Exclude thse operations from generator (*optional*)
+        """
+        return self._query(account, lower=start, upper=stop, use_block_num=use_block_num,
+                           only_ops=only_ops, exclude_ops=exclude_ops, order=1)
+
+    def history_reverse(self, account, start=None, stop=None, use_block_num=True, only_ops=[], exclude_ops=[]):
+        """ Yields the stored operations of an account, the latest operation will be
+            first. The parameters are the same as for :func:`bhive.account.Account.history_reverse`.
+
+            :param str account: account name
+            :param start: start number/date of operations to return (*optional*)
+            :type start: int, datetime
+            :param stop: stop number/date of operations to return (*optional*)
+            :type stop: int, datetime
+            :param bool use_block_num: if true, start and stop are block numbers,
+                otherwise virtual OP count numbers.
+            :param array only_ops: Limit generator by these operations (*optional*)
+            :param array exclude_ops: Exclude thse operations from generator (*optional*)
+        """
+        return self._query(account, lower=stop, upper=start, use_block_num=use_block_num,
+                           only_ops=only_ops, exclude_ops=exclude_ops, order=-1)
@@ -12,6 +12,7 @@ import os
 import math
 import ast
 import time
+import threading
 from bhivegraphenebase.py23 import bytes_types, integer_types, string_types, text_type
 from datetime import datetime, timedelta, date
 from bhiveapi.hivenoderpc import HiveNodeRPC
@@ -29,6 +30,7 @@ from .exceptions import (
     AccountDoesNotExistsException
 )
 from .wallet import Wallet
+from .workerpool import WorkerPool, FUTURES_MODULE
 from .hiveconnect import HiveConnect
 from .transactionbuilder import TransactionBuilder
 from .utils import formatTime, resolve_authorperm, derive_permlink, sanitize_permlink, remove_from_dict, addTzInfo, formatToTimeStamp
@@ -73,6 +75,13 @@ class Hive(object):
             broadcast posting op or creating hot_links (default is False)
         :param HiveConnect hiveconnect: A HiveConnect object can be set manually, set use_sc2 to True
         :param dict custom_chains: custom chain which should be added to the known chains
+        :param bool hedge_requests: When True, idempotent calls to https nodes are repeated on a
+            second node, when the current node answers slower than usual (default is False)
+        :param RPCCache rpc_cache: On-disk cache (:class:`bhiveapi.rpccache.RPCCache`) for blocks and
+            block operations at or below the last irreversible block (default is None)
+        :param bool background_data_refresh: When True, the chain parameters used by
+            :func:`refresh_data` are refreshed by a background thread and stored data is
+            returned without waiting for the refresh (default is False)
 
         Three wallet operation modes are possible:
 
@@ -198,6 +207,12 @@ class Hive(object):
                      'network': None, 'witness_schedule': None,
                      'config': None, 'reward_funds': None}
         self.data_refresh_time_seconds = data_refresh_time_seconds
+        self.background_data_refresh = bool(kwargs.get("background_data_refresh", False))
+        self._data_refresh_thread = None
+        self._data_refresh_stop = None
+        self._data_rpc = None
+        self._worker_pool = None
+        self.account_loader = None
         # self.refresh_data()
 
         # txbuffers/propbuffer are initialized and cleared
@@ -263,25 +278,147 @@ class Hive(object):
             return
         if data_refresh_time_seconds is not None:
             self.data_refresh_time_seconds = data_refresh_time_seconds
-        if self.data['last_refresh'] is not None and not force_refresh and self.data["last_node"] == self.rpc.url:
+        # The node url is not compared, as it differs between threads which share the rpc
+        if self.data['last_refresh'] is not None and not force_refresh and self._data_rpc is self.rpc:
             if (datetime.utcnow() - self.data['last_refresh']).total_seconds() < self.data_refresh_time_seconds:
                 return
+            if self.background_data_refresh:
+                # Stale data is used until the background thread has refreshed it
+                self.start_background_data_refresh()
+                return
         self.data['last_refresh'] = datetime.utcnow()
         self.data["last_node"] = self.rpc.url
-        self.data["dynamic_global_properties"] = self.get_dynamic_global_properties(False)
+        self._data_rpc = self.rpc
+        self.data.update(self._fetch_data(self.rpc))
+        if self.background_data_refresh:
+            self.start_background_data_refresh(refresh_now=False)
+
+    def _get_data_calls(self, rpc):
+        """ Returns the rpc calls of refresh_data as list of (data key, method name, args, ignore errors)"""
+        if rpc.get_use_appbase():
+            hardfork_call = ("hardfork_properties", "get_hardfork_properties", [], True)
+            reward_funds_call = ("reward_funds", "get_reward_funds", [], False)
+        else:
+            hardfork_call = ("hardfork_properties", "get_next_scheduled_hardfork", [], True)
+            reward_funds_call = ("reward_funds", "get_reward_fund", ["post"], False)
+        return [("dynamic_global_properties", "get_dynamic_global_properties", [], False),
+                ("feed_history", "get_feed_history", [], True),
+                hardfork_call,
+                ("witness_schedule", "get_witness_schedule", [], False),
+                ("config", "get_config", [], False),
+                reward_funds_call]
+
+    def _fetch_data(self, rpc):
+        """ Reads the hive blockchain parameters of refresh_data with a single batched rpc call.
+            When the batched call fails, the parameters are read one by one.
+
+            :param HiveNodeRPC rpc: rpc instance which is used
+        """
+        calls = self._get_data_calls(rpc)
+        results = None
         try:
-            self.data['feed_history'] = self.get_feed_history(False)
-        except:
-            self.data['feed_history'] = None
-        self.data['get_feed_history'] = self.data['feed_history']
+            for key, name, args, ignore_errors in calls[:-1]:
+                getattr(rpc, name)(*args, api="database", add_to_queue=True)
+            key, name, args, ignore_errors = calls[-1]
+            rpc.set_next_node_on_empty_reply(True)
+            results = getattr(rpc, name)(*args, api="database")
+            if not isinstance(results, list) or len(results) != len(calls):
+                results = None
+        except Exception as e:
+            log.debug("Batched refresh_data failed: %s" % str(e))
+            rpc.rpc_queue = []
+            results = None
+        if results is None:
+            results = []
+            for key, name, args, ignore_errors in calls:
+                try:
+                    rpc.set_next_node_on_empty_reply(True)
+                    results.append(getattr(rpc, name)(*args, api="database"))
+                except Exception:
+                    if not ignore_errors:
+                        raise
+                    results.append(None)
+        data = {}
+        for i in range(len(calls)):
+            data[calls[i][0]] = results[i]
+        if rpc.get_use_appbase() and data["reward_funds"] is not None:
+            funds = data["reward_funds"]['funds']
+            if len(funds) > 0:
+                funds = funds[0]
+            data["reward_funds"] = funds
+        data['get_feed_history'] = data['feed_history']
         try:
-            self.data['hardfork_properties'] = self.get_hardfork_properties(False)
+            data['network'] = rpc.get_network(props=data['config'])
         except:
-            self.data['hardfork_properties'] = None
-        self.data['network'] = self.get_network(False)
-        self.data['witness_schedule'] = self.get_witness_schedule(False)
-        self.data['config'] = self.get_config(False)
-        self.data['reward_funds'] = self.get_reward_funds(False)
+            data['network'] = known_chains["HIVEAPPBASE"]
+        return data
+
+    def start_background_data_refresh(self, refresh_now=True):
+        """ Starts a thread, which refreshes the stored blockchain parameters
+            every data_refresh_time_seconds with its own rpc connection
+
+            :param bool refresh_now: When True, the first refresh is started immediately
+        """
+        if self.offline or self.rpc is None:
+            return
+        if self._data_refresh_thread is not None and self._data_refresh_thread.is_alive():
+            return
+        self._data_refresh_stop = threading.Event()
+        self._data_refresh_thread = threading.Thread(target=self._background_data_refresh,
+                                                     args=(self._data_refresh_stop, refresh_now))
+        self._data_refresh_thread.daemon = True
+        self._data_refresh_thread.start()
+
+    def stop_background_data_refresh(self):
+        """ Stops the background refresh thread"""
+        if self._data_refresh_stop is not None:
+            self._data_refresh_stop.set()
+        self._data_refresh_thread = None
+
+    def get_worker_pool(self, max_workers=8):
+        """ Returns the worker pool (:class:`bhive.workerpool.WorkerPool`) of this
+            instance, which is used for parallel rpc calls. The pool is created on the
+            first call and grows to max_workers threads. Returns None, when
+            concurrent.futures is not available.
+
+            :param int max_workers: minimum number of worker threads (default is 8)
+        """
+        if FUTURES_MODULE is None:
+            return None
+        if self._worker_pool is None:
+            self._worker_pool = WorkerPool(self, max_workers=max_workers)
+        else:
+            self._worker_pool.resize(max_workers)
+        return self._worker_pool
+
+    def close_worker_pool(self, wait=True):
+        """ Stops the threads of the worker pool"""
+        if self._worker_pool is not None:
+            self._worker_pool.shutdown(wait=wait)
+            self._worker_pool = None
+
+    def _background_data_refresh(self, stop_event, refresh_now):
+        rpc = None
+        if not refresh_now and stop_event.wait(self.data_refresh_time_seconds):
+            return
+        while not stop_event.is_set():
+            try:
+                if rpc is None:
+                    nodes = [self.rpc.url] + [n for n in self.rpc.nodes.export_working_nodes() if n != self.rpc.url]
+                    rpc = HiveNodeRPC(nodes, self.rpc.user, self.rpc.password,
+                                      num_retries=self.rpc.num_retries,
+                                      num_retries_call=self.rpc.num_retries_call,
+                                      timeout=self.rpc.timeout,
+                                      use_condenser=self.rpc.use_condenser,
+                                      custom_chains=self.custom_chains)
+                data = self._fetch_data(rpc)
+                data['last_refresh'] = datetime.utcnow()
+                data['last_node'] = rpc.url
+                self.data.update(data)
+            except Exception as e:
+                log.warning("Background data refresh failed: %s" % str(e))
+            if stop_event.wait(self.data_refresh_time_seconds):
+                return
 
     def get_dynamic_global_properties(self, use_stored_data=True):
         """ This call returns the *dynamic global properties*
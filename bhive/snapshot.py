@@ -151,7 +151,7 @@ class AccountSnapshot(list):
         return {"timestamp": ts, "vests": own, "delegated_vests_in": din, "delegated_vests_out": dout,
                 "hp_own": hp_own, "hp_eff": hp_eff, "hive": hive, "hbd": hbd, "index": index}
 
-    def get_account_history(self, start=None, stop=None, use_block_num=True):
+    def get_account_history(self, start=None, stop=None, use_block_num=True, history_store=None):
         """ Uses account history to fetch all related ops
 
             :param start: start number/date of transactions to
@@ -162,12 +162,20 @@ class AccountSnapshot(list):
             :type stop: int, datetime
             :param bool use_block_num: if true, start and stop are block numbers,
                 otherwise virtual OP count numbers.
+            :param AccountHistoryStore history_store: When set, the ops are read from the
+                local store (:class:`bhive.historystore.AccountHistoryStore`), which is
+                synced before (*optional*)
 
         """
+        if history_store is not None:
+            history_store.sync(self.account)
+            history = history_store.history(self.account, start=start, stop=stop, use_block_num=use_block_num)
+        else:
+            history = self.account.history(start=start, stop=stop, use_block_num=use_block_num)
         super(AccountSnapshot, self).__init__(
             [
                 h
-                for h in self.account.history(start=start, stop=stop, use_block_num=use_block_num)
+                for h in history
             ]
         )
 
@@ -183,10 +183,11 @@ class TransactionBuilder(dict):
                     pass
 
             if sum([x[1] for x in r]) < required_treshold:
-                # go one level deeper
-                for authority in account[perm]["account_auths"]:
-                    auth_account = Account(
-                        authority[0], hive_instance=self.hive)
+                # go one level deeper, an active AccountLoader receives all accounts by one call
+                lazy = self.hive.account_loader is not None
+                auth_accounts = [Account(authority[0], lazy=lazy, hive_instance=self.hive)
+                                 for authority in account[perm]["account_auths"]]
+                for auth_account in auth_accounts:
                     r.extend(fetchkeys(auth_account, perm, level + 1))
 
             return r
@@ -466,10 +467,13 @@ class TransactionBuilder(dict):
             self.update({"required_authorities": {
                 accountObj["name"]: authority
             }})
-            for account_auth in authority["account_auths"]:
-                account_auth_account = Account(account_auth[0], hive_instance=self.hive)
+            # an active AccountLoader receives all accounts by one call
+            lazy = self.hive.account_loader is not None
+            account_auth_accounts = [Account(account_auth[0], lazy=lazy, hive_instance=self.hive)
+                                     for account_auth in authority["account_auths"]]
+            for account_auth, account_auth_account in zip(authority["account_auths"], account_auth_accounts):
                 self["required_authorities"].update({
-                    account_auth[0]: account_auth_account.get(permission)
+                    account_auth[0]: account_auth_account[permission] if permission in account_auth_account else None
                 })
 
             # Try to resolve required signatures for offline signing
@@ -477,8 +481,7 @@ class TransactionBuilder(dict):
                 x[0] for x in authority["key_auths"]
             ]
             # Add one recursion of keys from account_auths:
-            for account_auth in authority["account_auths"]:
-                account_auth_account = Account(account_auth[0], hive_instance=self.hive)
+            for account_auth_account in account_auth_accounts:
                 self["missing_signatures"].extend(
                     [x[0] for x in account_auth_account[permission]["key_auths"]]
                 )
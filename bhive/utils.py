@@ -12,8 +12,15 @@ from datetime import datetime, tzinfo, timedelta, date, time
 import pytz
 import difflib
 import yaml
+from collections import deque
+try:
+    from functools import lru_cache
+except ImportError:
+    lru_cache = None
 
 timeFormat = "%Y-%m-%dT%H:%M:%S"
+# Number of parsed timestamps, which are kept by formatTimeString and parse_time
+TIME_CACHE_SIZE = 4096
 # https://github.com/matiasb/python-unidiff/blob/master/unidiff/constants.py#L37
 # @@ (source offset, length) (target offset, length) @@ (section header)
 RE_HUNK_HEADER = re.compile(
@@ -33,17 +40,37 @@ def formatTime(t):
 def addTzInfo(t, timezone="UTC"):
     """Returns a datetime object with tzinfo added"""
     if t and isinstance(t, (datetime, date, time)) and t.tzinfo is None:
-        utc = pytz.timezone(timezone)
-        t = utc.localize(t)
+        if timezone == "UTC":
+            t = pytz.utc.localize(t)
+        else:
+            t = pytz.timezone(timezone).localize(t)
     return t
 
 
+def _parse_time_string(t):
+    """ Parses a chain timestamp (``%Y-%m-%dT%H:%M:%S``) into a datetime with UTC
+        tzinfo. The fixed positions are read directly, other strings are parsed by strptime.
+    """
+    if len(t) == 19 and t[4] == "-" and t[7] == "-" and t[10] == "T" and t[13] == ":" and t[16] == ":" and \
+            (t[0:4] + t[5:7] + t[8:10] + t[11:13] + t[14:16] + t[17:19]).isdigit():
+        return datetime(int(t[0:4]), int(t[5:7]), int(t[8:10]), int(t[11:13]), int(t[14:16]), int(t[17:19]),
+                        tzinfo=pytz.utc)
+    return pytz.utc.localize(datetime.strptime(t, timeFormat))
+
+
+if lru_cache is not None:
+    # Timestamps repeat for all operations of a block, datetime objects are immutable
+    _parse_time_string = lru_cache(maxsize=TIME_CACHE_SIZE)(_parse_time_string)
+
+
 def formatTimeString(t):
     """ Properly Format Time for permlinks
     """
-    if isinstance(t, (datetime, date, time)):
+    if isinstance(t, datetime) and t.year >= 1000:
+        return "%04d-%02d-%02dT%02d:%02d:%02d" % (t.year, t.month, t.day, t.hour, t.minute, t.second)
+    if isinstance(t, (date, time)):
         return t.strftime(timeFormat)
-    return addTzInfo(datetime.strptime(t, timeFormat))
+    return _parse_time_string(t)
 
 
 def formatToTimeStamp(t):
@@ -88,8 +115,7 @@ def parse_time(block_time):
     """Take a string representation of time from the blockchain, and parse it
        into datetime object.
     """
-    utc = pytz.timezone("UTC")
-    return utc.localize(datetime.strptime(str(block_time), timeFormat))
+    return _parse_time_string(str(block_time))
 
 
 def assets_from_string(text):
@@ -370,3 +396,40 @@ def load_dirty_json(dirty_json):
         dirty_json = re.sub(r, s, dirty_json)
     clean_json = json.loads(dirty_json)
     return clean_json    
+
+
+def windowed_map(submit, items, window, result=None, cancel=None):
+    """ Yields the results of the tasks, which ``submit(item)`` starts for all items,
+        in the order of items, while up to ``window`` tasks are running ahead of the
+        yielded result. The next item is submitted before a result is yielded, so that
+        a single slow task only delays the results behind it and a slow consumer
+        slows down the submission.
+
+        :param submit: function which starts the task of an item and returns it
+            (e.g. a future)
+        :param iterable items: items
+        :param int window: number of submitted tasks
+        :param result: function which waits for a task and returns its result
+            (default is ``task.result()``)
+        :param cancel: function which is called with each submitted task, which is
+            left when the generator is closed or fails (*optional*)
+    """
+    items = iter(items)
+    tasks = deque()
+    window = max(1, window)
+    try:
+        for item in items:
+            tasks.append(submit(item))
+            if len(tasks) >= window:
+                break
+        while len(tasks) > 0:
+            task = tasks.popleft()
+            value = task.result() if result is None else result(task)
+            for item in items:
+                tasks.append(submit(item))
+                break
+            yield value
+    finally:
+        if cancel is not None:
+            for task in tasks:
+                cancel(task)
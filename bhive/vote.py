@@ -393,13 +393,32 @@ class AccountVotes(VotesObject):
 
         :param str account: Account name
         :param Hive hive_instance: Hive() instance to use when accesing a RPC
+        :param AccountHistoryStore history_store: When set, the votes are taken from the
+            vote operations of the account in the local store
+            (:class:`bhive.historystore.AccountHistoryStore`), which is synced before.
+            Only the latest vote on each post is returned, a removed vote has a ``percent`` of 0.
+            The votes contain ``percent`` and ``time``, but no ``rshares`` and ``weight``,
+            as they are not part of the vote operation.
     """
-    def __init__(self, account, start=None, stop=None, lazy=False, full=False, hive_instance=None):
+    def __init__(self, account, start=None, stop=None, lazy=False, full=False, hive_instance=None, history_store=None):
         self.hive = hive_instance or shared_hive_instance()
         start = addTzInfo(start)
         stop = addTzInfo(stop)
         account = Account(account, hive_instance=self.hive)
-        votes = account.get_account_votes()
+        if history_store is not None:
+            history_store.sync(account)
+            # A new vote on the same post replaces the previous one
+            latest_votes = {}
+            for op in history_store.history(account, start=start, stop=stop, use_block_num=False, only_ops=["vote"]):
+                if op["voter"] != account["name"]:
+                    continue
+                latest_votes.pop((op["author"], op["permlink"]), None)
+                latest_votes[(op["author"], op["permlink"])] = {
+                    "voter": op["voter"], "author": op["author"], "permlink": op["permlink"],
+                    "percent": op["weight"], "time": op["timestamp"]}
+            votes = sorted(latest_votes.values(), key=lambda vote: vote["time"])
+        else:
+            votes = account.get_account_votes()
         self.identifier = account["name"]
         vote_list = []
         if votes is None:
@@ -278,6 +278,14 @@ class GetWitnesses(WitnessesObject):
             to fetch per call, defaults to 100
         :param Hive hive_instance: Hive() instance to use when
             accessing a RPCcreator = Witness(creator, hive_instance=self)
+        :param bool threading: When True, up to ``thread_num`` calls are sent at the
+            same time by the worker pool of the Hive instance, see
+            :func:`bhive.hive.Hive.get_worker_pool` (default is False)
+        :param int thread_num: number of parallel calls, when threading is True (default is 8)
+        :param bool raw_data: When True, the witness dicts of the node are stored
+            instead of :class:`Witness` objects (default is False)
+
+        The witnesses are returned in the order of ``name_list``.
 
         .. code-block:: python
 
@@ -287,21 +295,31 @@ class GetWitnesses(WitnessesObject):
             print(w[1].json())
 
     """
-    def __init__(self, name_list, batch_limit=100, lazy=False, full=True, hive_instance=None):
+    def __init__(self, name_list, batch_limit=100, lazy=False, full=True, hive_instance=None,
+                 threading=False, thread_num=8, raw_data=False):
         self.hive = hive_instance or shared_hive_instance()
         if not self.hive.is_connected():
             return
-        witnesses = []
-        name_cnt = 0
         if self.hive.rpc.get_use_appbase():
-            while name_cnt < len(name_list):
-                self.hive.rpc.set_next_node_on_empty_reply(False)
-                witnesses += self.hive.rpc.find_witnesses({'owners': name_list[name_cnt:batch_limit + name_cnt]}, api="database")["witnesses"]
-                name_cnt += batch_limit
+            batches = [name_list[i:i + batch_limit] for i in range(0, len(name_list), batch_limit)]
         else:
-            for witness in name_list:
-                witnesses.append(self.hive.rpc.get_witness_by_account(witness))
+            batches = [[witness] for witness in name_list]
+        pool = None
+        if threading and len(batches) > 1:
+            pool = self.hive.get_worker_pool(thread_num)
+        if pool is not None:
+            results = pool.map(self._get_witnesses, batches, window=thread_num)
+        else:
+            results = (self._get_witnesses(names) for names in batches)
+        witnesses = []
+        for names, batch in zip(batches, results):
+            # the node does not need to keep the order of the requested names
+            batch = {witness["owner"]: witness for witness in batch if witness}
+            witnesses.extend([batch[name] for name in names if name in batch])
         self.identifier = ""
+        if raw_data:
+            super(GetWitnesses, self).__init__(witnesses)
+            return
         super(GetWitnesses, self).__init__(
             [
                 Witness(x, lazy=lazy, full=full, hive_instance=self.hive)
@@ -309,6 +327,13 @@ class GetWitnesses(WitnessesObject):
             ]
         )
 
+    def _get_witnesses(self, names):
+        """Returns the witness dicts of names, which are received by a single call"""
+        self.hive.rpc.set_next_node_on_empty_reply(False)
+        if self.hive.rpc.get_use_appbase():
+            return self.hive.rpc.find_witnesses({'owners': names}, api="database")["witnesses"]
+        return [self.hive.rpc.get_witness_by_account(names[0])]
+
 
 class Witnesses(WitnessesObject):
     """ Obtain a list of **active** witnesses and the current schedule
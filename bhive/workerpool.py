@@ -0,0 +1,116 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import object
+import threading
+import logging
+from .utils import windowed_map
+FUTURES_MODULE = None
+if not FUTURES_MODULE:
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+        FUTURES_MODULE = "futures"
+    except ImportError:
+        FUTURES_MODULE = None
+log = logging.getLogger(__name__)
+
+
+class WorkerPool(object):
+    """ Reusable pool of worker threads for parallel rpc calls of a Hive instance
+
+        All workers share the rpc instance of ``hive_instance``, while each worker
+        thread keeps its own node connection between tasks. Parallel calls therefore
+        do not need new Hive instances and do not reconnect for every stream.
+        The pool is created with :func:`bhive.hive.Hive.get_worker_pool` and grows,
+        when more workers are requested.
+
+        Before a task is started, the connection of the worker is checked. It is moved
+        to another node, when its node became unhealthy or lagging, or when another node
+        answers more than ``latency_factor`` times faster.
+
+        :param Hive hive_instance: Hive instance, whose rpc is used by all workers
+        :param int max_workers: number of worker threads (default is 8)
+        :param float latency_factor: workers switch to a node which is latency_factor
+            times faster than their current node (default is 4)
+
+        .. code-block:: python
+
+            from bhive import Hive
+            hv = Hive()
+            pool = hv.get_worker_pool(4)
+            futures = [pool.submit(hv.rpc.get_block, {"block_num": i}, api="block") for i in range(1, 9)]
+            blocks = [f.result() for f in futures]
+
+    """
+    def __init__(self, hive_instance, max_workers=8, latency_factor=4.):
+        if FUTURES_MODULE is None:
+            raise Exception("concurrent.futures is needed for WorkerPool")
+        self.hive = hive_instance
+        self.latency_factor = latency_factor
+        self.max_workers = 0
+        self._executor = None
+        self._lock = threading.Lock()
+        self.resize(max_workers)
+
+    def resize(self, max_workers):
+        """ Grows the pool to max_workers threads, the pool never shrinks
+
+            :param int max_workers: requested number of worker threads
+        """
+        with self._lock:
+            if self._executor is not None and max_workers <= self.max_workers:
+                return
+            old_executor = self._executor
+            self.max_workers = max(max_workers, self.max_workers)
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        if old_executor is not None:
+            # Running tasks are finished, the idle threads of the old executor exit
+            old_executor.shutdown(wait=False)
+
+    def _check_connection(self):
+        """Moves the connection of the current worker to a better node, when needed"""
+        rpc = self.hive.rpc
+        if rpc is None or not rpc.is_thread_connected():
+            return
+        try:
+            if rpc.nodes.is_node_switch_needed(latency_factor=self.latency_factor):
+                log.debug("Worker switches from node %s" % rpc.url)
+                rpc.rpcconnect()
+        except Exception as e:
+            log.warning("Worker node switch failed: %s" % str(e))
+
+    def _run(self, fn, args, kwargs):
+        self._check_connection()
+        return fn(*args, **kwargs)
+
+    def submit(self, fn, *args, **kwargs):
+        """ Schedules fn(*args, **kwargs) on a worker and returns a future"""
+        with self._lock:
+            if self._executor is None:
+                raise RuntimeError("WorkerPool was shut down")
+            return self._executor.submit(self._run, fn, args, kwargs)
+
+    def map(self, fn, iterable, window=None):
+        """ Yields fn(item) for all items in order, while up to ``window``
+            (default is max_workers) calls are running at the same time
+
+            :param fn: function which is called with a single item
+            :param iterable iterable: items
+            :param int window: number of calls, which are running ahead of the
+                yielded result
+        """
+        if window is None:
+            window = self.max_workers
+        return windowed_map(lambda item: self.submit(fn, item), iterable, window,
+                            cancel=lambda future: future.cancel())
+
+    def shutdown(self, wait=True):
+        """ Stops all worker threads"""
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self.max_workers = 0
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -7,4 +7,5 @@ __all__ = [
     "rpcutils",
     "graphenerpc",
     "node",
+    "rpccache",
 ]
@@ -0,0 +1,432 @@
+# This Python file uses the following encoding: utf-8
+"""asyncio based rpc client, requires python >= 3.6 and aiohttp"""
+import asyncio
+import json
+import re
+import time
+import weakref
+import logging
+from .hivenoderpc import HiveNodeRPC
+from .exceptions import (
+    UnauthorizedError, RPCConnection, RPCError, CallRetriesReached, WorkingNodeMissing
+)
+from . import exceptions
+from .node import get_retry_sleep_time
+from .rpcutils import is_network_appbase_ready
+from bhivegraphenebase.version import version as bhive_version
+AIOHTTP_MODULE = None
+if not AIOHTTP_MODULE:
+    try:
+        import aiohttp
+        AIOHTTP_MODULE = "aiohttp"
+    except ImportError:
+        AIOHTTP_MODULE = None
+
+log = logging.getLogger(__name__)
+
+
+def _current_task():
+    """Returns the running asyncio task or None"""
+    try:
+        if hasattr(asyncio, "current_task"):
+            return asyncio.current_task()
+        return asyncio.Task.current_task()
+    except RuntimeError:
+        return None
+
+
+class CallState(object):
+    """ Retry state of a single rpc call, which is not shared with the other
+        calls in flight on the same :class:`AsyncHiveNodeRPC` instance
+
+        :param int num_retries_call: Repeat num_retries_call times the call on node error
+        :param bool next_node_on_empty_reply: Switch to the next node on an empty reply
+    """
+    def __init__(self, num_retries_call, next_node_on_empty_reply=False):
+        self.num_retries_call = num_retries_call
+        self.next_node_on_empty_reply = next_node_on_empty_reply
+        self.error_cnt = 0
+        self.sleep_time = 0
+        self.connection_cnt = None
+
+    def increase_error_cnt(self, connection_cnt):
+        """Counts a try, the count starts again on a new connection"""
+        if connection_cnt != self.connection_cnt:
+            self.connection_cnt = connection_cnt
+            self.error_cnt = 0
+        self.error_cnt += 1
+
+    def check_retries(self, error_msg):
+        """Stores the waiting time before the next try, raises CallRetriesReached when num_retries_call is reached"""
+        log.warning("Error: {}".format(error_msg))
+        if self.num_retries_call >= 0 and self.error_cnt > self.num_retries_call:
+            raise CallRetriesReached()
+        log.warning("Retry RPC Call (%d/%d) \n" % (self.error_cnt, self.num_retries_call))
+        self.sleep_time = get_retry_sleep_time(self.error_cnt)
+
+    def retries_reached(self, connection_cnt):
+        """Returns True, when num_retries_call is reached on the connection ``connection_cnt``"""
+        if connection_cnt != self.connection_cnt:
+            return False
+        return self.num_retries_call >= 0 and self.error_cnt >= self.num_retries_call
+
+
+class AsyncHiveNodeRPC(HiveNodeRPC):
+    """ asyncio version of :class:`bhiveapi.hivenoderpc.HiveNodeRPC`
+
+        All api methods are mapped to coroutines in the same way as for
+        ``HiveNodeRPC``. Many calls can be in flight at the same time on a
+        single instance, they share the node list and its node error counters,
+        while each call counts its own retries (see :class:`CallState`).
+        ``num_retries_call`` and ``next_node_on_empty_reply`` can be passed to each call.
+        Calls with ``add_to_queue=True`` are queued per task and sent together with
+        the next call of the same task.
+
+        :param str urls: Either a single Websocket/Http URL, or a list of URLs
+        :param str user: Username for Authentication
+        :param str password: Password for Authentication
+        :param int num_retries: Try x times to num_retries to a node on disconnect, -1 for indefinitely
+        :param int num_retries_call: Repeat num_retries_call times a rpc call on node error (default is 5)
+        :param int timeout: Timeout setting for https nodes (default is 60)
+        :param int max_connections: Maximum number of simultaneous http connections (default is 100)
+        :param bool use_condenser: Use the old condenser_api rpc protocol on nodes with version
+            0.19.4 or higher. The settings has no effect on nodes with version of 0.19.3 or lower.
+
+        The connection is established on the first call or with ``await rpc.rpcconnect()``.
+
+        .. code-block:: python
+
+            import asyncio
+            from bhiveapi.asynchivenoderpc import AsyncHiveNodeRPC
+
+            async def main():
+                rpc = AsyncHiveNodeRPC("https://api.hive.blog")
+                props, block = await asyncio.gather(
+                    rpc.get_dynamic_global_properties(api="database"),
+                    rpc.get_block({"block_num": 1}, api="block"))
+                await rpc.close()
+
+            asyncio.get_event_loop().run_until_complete(main())
+
+        .. note:: Websocket nodes handle a single request at a time, use https nodes
+                  for concurrent calls.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        """ Init AsyncHiveNodeRPC
+
+            :param str urls: Either a single Websocket/Http URL, or a list of URLs
+            :param str user: Username for Authentication
+            :param str password: Password for Authentication
+            :param int num_retries: Try x times to num_retries to a node on disconnect, -1 for indefinitely
+            :param int num_retries_call: Repeat num_retries_call times a rpc call on node error (default is 5)
+            :param int timeout: Timeout setting for https nodes (default is 60)
+            :param int max_connections: Maximum number of simultaneous http connections (default is 100)
+
+        """
+        if AIOHTTP_MODULE is None:
+            raise Exception("aiohttp is needed for AsyncHiveNodeRPC")
+        kwargs["autoconnect"] = False
+        self.max_connections = kwargs.get("max_connections", 100)
+        self._task_queues = weakref.WeakKeyDictionary()
+        super(AsyncHiveNodeRPC, self).__init__(*args, **kwargs)
+        self.headers = {'User-Agent': 'bhive v%s' % (bhive_version),
+                        'content-type': 'application/json; charset=utf-8'}
+        self.connected = False
+        self.connection_cnt = 0
+        self._connect_lock = None
+        self._ws_lock = None
+        self._call = None
+
+    @property
+    def rpc_queue(self):
+        """Queued calls of the running task, all tasks of the event loop share the thread state"""
+        task = _current_task()
+        if task is None:
+            return HiveNodeRPC.rpc_queue.fget(self)
+        if task not in self._task_queues:
+            self._task_queues[task] = []
+        return self._task_queues[task]
+
+    @rpc_queue.setter
+    def rpc_queue(self, rpc_queue):
+        task = _current_task()
+        if task is None:
+            HiveNodeRPC.rpc_queue.fset(self, rpc_queue)
+        else:
+            self._task_queues[task] = rpc_queue
+
+    def next(self):
+        """Switches to the next node url, the connection is established with the next call"""
+        self.connected = False
+
+    def _get_session(self):
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.max_connections))
+        return self.session
+
+    async def _reconnect(self, connection_cnt):
+        """ Connects to the next node, when the connection
+            ``connection_cnt`` was not already replaced by another call
+        """
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if connection_cnt == self.connection_cnt or not self.connected:
+                await self.rpcconnect()
+
+    async def rpcconnect(self, next_url=True):
+        """Connect to next url in a loop."""
+        if self.nodes.working_nodes_count == 0:
+            return
+        while True:
+            if next_url:
+                if self.ws is not None:
+                    await self.rpcclose()
+                self.url = next(self.nodes)
+                self.nodes.reset_error_cnt_call()
+                log.debug("Trying to connect to node %s" % self.url)
+                if self.url[:2] == "ws":
+                    self.current_rpc = self.rpc_methods["ws"]
+                else:
+                    self.current_rpc = self.rpc_methods["jsonrpc"]
+            try:
+                if self.current_rpc == self.rpc_methods["ws"]:
+                    self.ws = await self._get_session().ws_connect(self.url, timeout=self.timeout)
+                if self.disable_chain_detection:
+                    # Set to appbase rpc format
+                    if self.current_rpc == self.rpc_methods['ws']:
+                        self.current_rpc = self.rpc_methods['wsappbase']
+                    else:
+                        self.current_rpc = self.rpc_methods['appbase']
+                    break
+                try:
+                    props = await self._send(self._get_query("get_config", api="database"), reconnect=False)
+                except Exception as e:
+                    if re.search("Bad Cast:Invalid cast from type", str(e)):
+                        # retry with appbase
+                        if self.current_rpc == self.rpc_methods['ws']:
+                            self.current_rpc = self.rpc_methods['wsappbase']
+                        else:
+                            self.current_rpc = self.rpc_methods['appbase']
+                        props = await self._send(self._get_query("get_config", api="database"), reconnect=False)
+                    else:
+                        props = None
+                if props is None:
+                    raise RPCError("Could not receive answer for get_config")
+                if is_network_appbase_ready(props):
+                    if self.ws:
+                        self.current_rpc = self.rpc_methods["wsappbase"]
+                    else:
+                        self.current_rpc = self.rpc_methods["appbase"]
+                break
+            except (KeyboardInterrupt, asyncio.CancelledError):
+                raise
+            except Exception as e:
+                self.nodes.increase_error_cnt()
+                do_sleep = not next_url or (next_url and self.nodes.working_nodes_count == 1)
+                self.nodes.sleep_and_check_retries(str(e), sleep=False)
+                if do_sleep:
+                    await asyncio.sleep(self.nodes.get_sleep_time())
+                next_url = True
+        self.connection_cnt += 1
+        self.connected = True
+
+    async def rpcclose(self):
+        """Close Websocket"""
+        if self.ws is None:
+            return
+        await self.ws.close()
+        self.ws = None
+
+    async def close(self):
+        """Closes all connections"""
+        if self.ws is not None:
+            await self.ws.close()
+            self.ws = None
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        self.connected = False
+
+    async def request_send(self, payload):
+        auth = None
+        if self.user is not None and self.password is not None:
+            auth = aiohttp.BasicAuth(self.user, self.password)
+        async with self._get_session().post(self.url,
+                                            data=payload,
+                                            headers=self.headers,
+                                            timeout=aiohttp.ClientTimeout(total=self.timeout),
+                                            auth=auth) as response:
+            if response.status == 401:
+                raise UnauthorizedError
+            return await response.text()
+
+    async def ws_send(self, payload):
+        if self.ws is None:
+            raise RPCConnection("No websocket available!")
+        if self._ws_lock is None:
+            self._ws_lock = asyncio.Lock()
+        async with self._ws_lock:
+            await self.ws.send_str(payload.decode('utf8'))
+            return await self.ws.receive_str(timeout=self.timeout)
+
+    async def _send(self, payload, reconnect=True, call=None):
+        """ Sends the payload to the current node, reconnects on connection errors
+            (the async counterpart of ``GrapheneRPC.rpcexec``)
+
+            :param json payload: Payload data
+            :param bool reconnect: When False, connection errors are raised instead
+            :param CallState call: retry state of the call
+        """
+        log.debug(json.dumps(payload))
+        if self.nodes.working_nodes_count == 0:
+            raise WorkingNodeMissing
+        if call is None:
+            call = CallState(self.nodes.num_retries_call)
+        reply = {}
+        while True:
+            if self.url is None:
+                raise RPCConnection("RPC is not connected!")
+            connection_cnt = self.connection_cnt
+            call.increase_error_cnt(connection_cnt)
+            try:
+                data = json.dumps(payload, ensure_ascii=False).encode('utf8')
+                start = time.time()
+                if self.current_rpc == self.rpc_methods['ws'] or \
+                   self.current_rpc == self.rpc_methods['wsappbase']:
+                    reply = await self.ws_send(data)
+                else:
+                    reply = await self.request_send(data)
+                if not bool(reply):
+                    try:
+                        call.check_retries("Empty Reply")
+                        await self._retry_sleep(call)
+                    except CallRetriesReached:
+                        if not reconnect:
+                            raise
+                        self.nodes.increase_error_cnt()
+                        self.nodes.sleep_and_check_retries("Empty Reply", sleep=False, call_retry=False)
+                        await self._reconnect(connection_cnt)
+                else:
+                    self.nodes.record_latency(time.time() - start)
+                    break
+            except (KeyboardInterrupt, asyncio.CancelledError):
+                raise
+            except Exception as e:
+                if not reconnect:
+                    raise
+                self.nodes.increase_error_cnt()
+                self.nodes.sleep_and_check_retries(str(e), sleep=False, call_retry=False)
+                await self._reconnect(connection_cnt)
+
+        ret = {}
+        try:
+            ret = json.loads(reply, strict=False)
+        except ValueError:
+            self._check_for_server_error(reply)
+
+        log.debug(json.dumps(reply))
+        result = self._get_result(ret)
+        self._record_head_block(result)
+        return result
+
+    def _check_error_message(self, e, call):
+        """ Check error message and decide what to do, the retries are counted on ``call``
+
+            :param CallState call: retry state of the call
+        """
+        # The check does not await, no other call can run until _call is reset
+        self._call = call
+        try:
+            return super(AsyncHiveNodeRPC, self)._check_error_message(e, call.error_cnt)
+        finally:
+            self._call = None
+
+    def _sleep_and_check_call_retries(self, error_msg):
+        """Stores the waiting time in the running call, it is awaited in rpcexec before the call is repeated"""
+        self._call.check_retries(error_msg)
+
+    async def _retry_sleep(self, call):
+        sleeptime = call.sleep_time
+        call.sleep_time = 0
+        if sleeptime:
+            log.warning("Retrying in %d seconds\n" % sleeptime)
+            await asyncio.sleep(sleeptime)
+
+    async def rpcexec(self, payload, num_retries_call=None, next_node_on_empty_reply=False):
+        """ Execute a call by sending the payload.
+            Node errors are handled in the same way as in ``HiveNodeRPC.rpcexec``
+
+            :param json payload: Payload data
+            :param int num_retries_call: Repeat num_retries_call times the call on node error
+                (default is num_retries_call of the instance)
+            :param bool next_node_on_empty_reply: Switch to the next node on an empty reply (default is False)
+            :raises ValueError: if the server does not respond in proper JSON format
+            :raises RPCError: if the server returns an error
+        """
+        if num_retries_call is None:
+            num_retries_call = self.nodes.num_retries_call
+        call = CallState(num_retries_call, next_node_on_empty_reply=next_node_on_empty_reply)
+        if not self.connected:
+            await self._reconnect(self.connection_cnt)
+        if self.url is None:
+            raise exceptions.RPCConnection("RPC is not connected!")
+        doRetry = True
+        maxRetryCountReached = False
+        while doRetry and not maxRetryCountReached:
+            doRetry = False
+            if not self.connected:
+                await self._reconnect(self.connection_cnt)
+            try:
+                reply = await self._send(payload, call=call)
+                if call.next_node_on_empty_reply and not bool(reply) and self.nodes.working_nodes_count > 1:
+                    self._retry_on_next_node("Empty Reply")
+                    doRetry = True
+                else:
+                    return reply
+            except exceptions.RPCErrorDoRetry as e:
+                msg = exceptions.decodeRPCErrorMsg(e).strip()
+                try:
+                    call.check_retries(msg)
+                    doRetry = True
+                except exceptions.CallRetriesReached:
+                    if self.nodes.working_nodes_count > 1:
+                        self._retry_on_next_node(msg)
+                        doRetry = True
+                    else:
+                        raise exceptions.CallRetriesReached
+            except exceptions.RPCError as e:
+                try:
+                    doRetry = self._check_error_message(e, call)
+                except exceptions.CallRetriesReached:
+                    msg = exceptions.decodeRPCErrorMsg(e).strip()
+                    if self.nodes.working_nodes_count > 1:
+                        self._retry_on_next_node(msg)
+                        doRetry = True
+                    else:
+                        raise exceptions.CallRetriesReached
+            await self._retry_sleep(call)
+            maxRetryCountReached = self.connected and call.retries_reached(self.connection_cnt)
+
+    def __getattr__(self, name):
+        """Map all methods to awaitable RPC calls and pass through the arguments."""
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        async def method(*args, **kwargs):
+            if not self.connected:
+                await self._reconnect(self.connection_cnt)
+            add_to_queue = kwargs.get("add_to_queue", False)
+            query = self._get_query(name, *args, **kwargs)
+            if add_to_queue:
+                self.rpc_queue.append(query)
+                return None
+            elif len(self.rpc_queue) > 0:
+                self.rpc_queue.append(query)
+                query = self.rpc_queue
+                self.rpc_queue = []
+            return await self.rpcexec(query, num_retries_call=kwargs.get("num_retries_call", None),
+                                      next_node_on_empty_reply=kwargs.get("next_node_on_empty_reply", False))
+        return method
@@ -25,8 +25,16 @@ from .rpcutils import (
     get_api_name, get_query
 )
 from .node import Nodes
+from .rpcutils import is_idempotent_query
 from bhivegraphenebase.version import version as bhive_version
 from bhivegraphenebase.chains import known_chains
+FUTURES_MODULE = None
+if not FUTURES_MODULE:
+    try:
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        FUTURES_MODULE = "futures"
+    except ImportError:
+        FUTURES_MODULE = None
 if sys.version_info[0] < 3:
     from thread import interrupt_main
 else:
@@ -56,20 +64,23 @@ log = logging.getLogger(__name__)
 class SessionInstance(object):
     """Singelton for the Session Instance"""
     instance = None
+    thread_instances = threading.local()
 
 
 def set_session_instance(instance):
-    """Set session instance"""
+    """Set session instance, which is then used by all threads"""
     SessionInstance.instance = instance
 
 
 def shared_session_instance():
-    """Get session instance"""
+    """Get session instance, each thread has its own session unless set_session_instance() was used"""
     if REQUEST_MODULE is None:
         raise Exception()
-    if not SessionInstance.instance:
-        SessionInstance.instance = requests.Session()
-    return SessionInstance.instance
+    if SessionInstance.instance:
+        return SessionInstance.instance
+    if getattr(SessionInstance.thread_instances, "session", None) is None:
+        SessionInstance.thread_instances.session = requests.Session()
+    return SessionInstance.thread_instances.session
 
 
 def create_ws_instance(use_ssl=True, enable_multithread=True):
@@ -84,6 +95,17 @@ def create_ws_instance(use_ssl=True, enable_multithread=True):
         return websocket.WebSocket(enable_multithread=enable_multithread)
 
 
+class RPCThreadState(threading.local):
+    """Stores the connection and the request queue of a single thread"""
+    def __init__(self):
+        self.url = None
+        self.ws = None
+        self.session = None
+        self.current_rpc = None
+        self.rpc_queue = []
+        self.next_node_on_empty_reply = False
+
+
 class GrapheneRPC(object):
     """
     This class allows to call API methods synchronously, without callbacks.
@@ -100,6 +122,18 @@ class GrapheneRPC(object):
     :param bool use_condenser: Use the old condenser_api rpc protocol on nodes with version
         0.19.4 or higher. The settings has no effect on nodes with version of 0.19.3 or lower.
     :param dict custom_chains: custom chain which should be added to the known chains
+    :param bool hedge_requests: When True, idempotent calls to https nodes are sent a second time
+        to another node, when the current node has not answered within the hedge_percentile of
+        its recent latencies. The first valid answer is used (default is False)
+    :param float hedge_percentile: percentile of the recent latencies of the current node, after
+        which the hedged request is sent (default is 95)
+    :param float hedge_delay: delay in seconds before the hedged request is sent, which is used
+        until latencies of the current node are known (default is 1)
+
+    An instance can be used by several threads at the same time. Each thread
+    uses its own connection and request queue, while the node list and the node
+    statistics are shared. A thread connects on its first call, when the
+    instance was already connected by another thread.
 
     Available APIs:
 
@@ -126,13 +160,24 @@ class GrapheneRPC(object):
 
     def __init__(self, urls, user=None, password=None, **kwargs):
         """Init."""
+        self._thread_state = RPCThreadState()
+        self._url = None
+        self._current_rpc = None
+        self._connected = False
+        self._node_rpc_methods = {}
         self.rpc_methods = {'offline': -1, 'ws': 0, 'jsonrpc': 1, 'wsappbase': 2, 'appbase': 3}
         self.current_rpc = self.rpc_methods["ws"]
         self._request_id = 0
+        self._request_id_lock = threading.Lock()
         self.timeout = kwargs.get('timeout', 60)
         num_retries = kwargs.get("num_retries", 100)
         num_retries_call = kwargs.get("num_retries_call", 5)
         self.use_condenser = kwargs.get("use_condenser", False)
+        self.hedge_requests = kwargs.get("hedge_requests", False)
+        self.hedge_percentile = kwargs.get("hedge_percentile", 95)
+        self.hedge_delay = kwargs.get("hedge_delay", 1)
+        self._hedge_pool = None
+        self._hedge_pool_lock = threading.Lock()
         self.disable_chain_detection = kwargs.get("disable_chain_detection", False)
         self.known_chains = known_chains
         custom_chain = kwargs.get("custom_chains", {})
@@ -144,6 +189,7 @@ class GrapheneRPC(object):
         self.nodes = Nodes(urls, num_retries, num_retries_call)
         if self.nodes.working_nodes_count == 0:
             self.current_rpc = self.rpc_methods["offline"]
+        self._current_rpc = self.current_rpc
 
         self.user = user
         self.password = password
@@ -151,9 +197,67 @@ class GrapheneRPC(object):
         self.url = None
         self.session = None
         self.rpc_queue = []
+        self.chain_id = None
+        self.last_irreversible_block_num = None
         if kwargs.get("autoconnect", True):
             self.rpcconnect()
 
+    @property
+    def url(self):
+        """Node url of the current thread, or of the last connection when the thread is not connected"""
+        if self._thread_state.url is None:
+            return self._url
+        return self._thread_state.url
+
+    @url.setter
+    def url(self, url):
+        self._thread_state.url = url
+        if url is not None:
+            self._url = url
+
+    @property
+    def current_rpc(self):
+        if self._thread_state.current_rpc is None:
+            return self._current_rpc
+        return self._thread_state.current_rpc
+
+    @current_rpc.setter
+    def current_rpc(self, current_rpc):
+        self._thread_state.current_rpc = current_rpc
+
+    @property
+    def ws(self):
+        return self._thread_state.ws
+
+    @ws.setter
+    def ws(self, ws):
+        self._thread_state.ws = ws
+
+    @property
+    def session(self):
+        return self._thread_state.session
+
+    @session.setter
+    def session(self, session):
+        self._thread_state.session = session
+
+    @property
+    def rpc_queue(self):
+        return self._thread_state.rpc_queue
+
+    @rpc_queue.setter
+    def rpc_queue(self, rpc_queue):
+        self._thread_state.rpc_queue = rpc_queue
+
+    def is_thread_connected(self):
+        """Returns True, when the current thread is connected to a node"""
+        return self._thread_state.url is not None
+
+    def _connect_thread(self):
+        """Connects the current thread, when the instance was already connected by another thread"""
+        if self._connected and not self.is_thread_connected():
+            self.rpcconnect()
+
     @property
     def num_retries(self):
         return self.nodes.num_retries
@@ -172,8 +276,9 @@ class GrapheneRPC(object):
 
     def get_request_id(self):
         """Get request id."""
-        self._request_id += 1
-        return self._request_id
+        with self._request_id_lock:
+            self._request_id += 1
+            return self._request_id
 
     def next(self):
         """Switches to the next node url"""
@@ -219,6 +324,10 @@ class GrapheneRPC(object):
                 if self.ws:
                     self.ws.connect(self.url)
                     self.rpclogin(self.user, self.password)
+                if self.url in self._node_rpc_methods:
+                    # The node was already checked by another thread
+                    self.current_rpc = self._node_rpc_methods[self.url]
+                    break
                 if self.disable_chain_detection:
                     # Set to appbase rpc format
                     if self.current_rpc == self.rpc_methods['ws']:
@@ -242,11 +351,15 @@ class GrapheneRPC(object):
                         props = self.get_config(api="database")
                 if props is None:
                     raise RPCError("Could not receive answer for get_config")
+                for key in props:
+                    if key[-8:] == "CHAIN_ID":
+                        self.chain_id = props[key]
                 if is_network_appbase_ready(props):
                     if self.ws:
                         self.current_rpc = self.rpc_methods["wsappbase"]
                     else:
                         self.current_rpc = self.rpc_methods["appbase"]
+                self._node_rpc_methods[self.url] = self.current_rpc
                 break
             except KeyboardInterrupt:
                 raise
@@ -255,6 +368,8 @@ class GrapheneRPC(object):
                 do_sleep = not next_url or (next_url and self.nodes.working_nodes_count == 1)
                 self.nodes.sleep_and_check_retries(str(e), sleep=do_sleep)
                 next_url = True
+        self._current_rpc = self.current_rpc
+        self._connected = True
 
     def rpclogin(self, user, password):
         """Login into Websocket"""
@@ -268,22 +383,89 @@ class GrapheneRPC(object):
         # if self.ws.connected:
         self.ws.close()
 
-    def request_send(self, payload):
+    def request_send(self, payload, url=None, session=None):
+        if url is None:
+            url = self.url
+        if session is None:
+            session = self.session
         if self.user is not None and self.password is not None:
-            response = self.session.post(self.url,
-                                         data=payload,
-                                         headers=self.headers,
-                                         timeout=self.timeout,
-                                         auth=(self.user, self.password))
+            response = session.post(url,
+                                    data=payload,
+                                    headers=self.headers,
+                                    timeout=self.timeout,
+                                    auth=(self.user, self.password))
         else:
-            response = self.session.post(self.url,
-                                         data=payload,
-                                         headers=self.headers,
-                                         timeout=self.timeout)
+            response = session.post(url,
+                                    data=payload,
+                                    headers=self.headers,
+                                    timeout=self.timeout)
         if response.status_code == 401:
             raise UnauthorizedError
         return response
 
+    def _hedge_request_send(self, payload, url):
+        """Sends the payload from a hedge pool thread with the session of this thread"""
+        return self.request_send(payload, url=url, session=shared_session_instance())
+
+    def _use_hedged_request(self, payload):
+        """Returns True, when the payload can be sent as hedged request"""
+        if not self.hedge_requests or FUTURES_MODULE is None:
+            return False
+        if self.current_rpc not in [self.rpc_methods['jsonrpc'], self.rpc_methods['appbase']]:
+            return False
+        return is_idempotent_query(payload)
+
+    def hedged_request_send(self, payload):
+        """ Sends the payload to the current node and, when the answer takes longer
+            than the hedge_percentile of the recent node latencies, a second time to
+            the best alternative node. The first valid response is returned.
+            The latency of a valid response is recorded for the node which answered.
+            Both requests are sent by the hedge pool threads, each with its own session.
+        """
+        node = self.nodes.node
+        alternative_node = self.nodes.get_alternative_node()
+        start = time.time()
+        if alternative_node is None or alternative_node.url[:4] != "http":
+            response = self.request_send(payload)
+            if response.text:
+                node.update_latency(time.time() - start, alpha=self.nodes.ewma_alpha)
+            return response
+        delay = node.get_latency_percentile(self.hedge_percentile)
+        if delay is None:
+            delay = self.hedge_delay
+        if self._hedge_pool is None:
+            with self._hedge_pool_lock:
+                if self._hedge_pool is None:
+                    self._hedge_pool = ThreadPoolExecutor(max_workers=4)
+        primary = self._hedge_pool.submit(self._hedge_request_send, payload, self.url)
+        done, not_done = wait([primary], timeout=delay)
+        if len(done) > 0:
+            if primary.exception() is None and primary.result().text:
+                node.update_latency(time.time() - start, alpha=self.nodes.ewma_alpha)
+            return primary.result()
+        log.debug("Sending hedged request to %s" % alternative_node.url)
+        secondary_start = time.time()
+        secondary = self._hedge_pool.submit(self._hedge_request_send, payload, alternative_node.url)
+        not_done = set([primary, secondary])
+        while len(not_done) > 0:
+            done, not_done = wait(not_done, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    if future == secondary:
+                        alternative_node.update_error(alpha=self.nodes.ewma_alpha)
+                    continue
+                try:
+                    future.result().json()
+                except ValueError:
+                    continue
+                if future == secondary:
+                    alternative_node.update_latency(time.time() - secondary_start, alpha=self.nodes.ewma_alpha)
+                else:
+                    node.update_latency(time.time() - start, alpha=self.nodes.ewma_alpha)
+                return future.result()
+        # No valid answer, the error or the empty reply of the current node is handled by rpcexec
+        return primary.result()
+
     def ws_send(self, payload):
         if self.ws is None:
             raise RPCConnection("No websocket available!")
@@ -369,18 +551,26 @@ class GrapheneRPC(object):
         log.debug(json.dumps(payload))
         if self.nodes.working_nodes_count == 0:
             raise WorkingNodeMissing
-        if self.url is None:
+        self._connect_thread()
+        if not self.is_thread_connected():
             raise RPCConnection("RPC is not connected!")
         reply = {}
         response = None
         while True:
             self.nodes.increase_error_cnt_call()
             try:
+                start = time.time()
+                hedged = False
                 if self.current_rpc == self.rpc_methods['ws'] or \
                    self.current_rpc == self.rpc_methods['wsappbase']:
                     reply = self.ws_send(json.dumps(payload, ensure_ascii=False).encode('utf8'))
                 else:
-                    response = self.request_send(json.dumps(payload, ensure_ascii=False).encode('utf8'))
+                    data = json.dumps(payload, ensure_ascii=False).encode('utf8')
+                    hedged = self._use_hedged_request(payload)
+                    if hedged:
+                        response = self.hedged_request_send(data)
+                    else:
+                        response = self.request_send(data)
                     reply = response.text
                 if not bool(reply):
                     try:
@@ -390,6 +580,9 @@ class GrapheneRPC(object):
                         self.nodes.sleep_and_check_retries("Empty Reply", sleep=False, call_retry=False)
                         self.rpcconnect()
                 else:
+                    if not hedged:
+                        # hedged_request_send records the latency of the node which answered
+                        self.nodes.record_latency(time.time() - start)
                     break
             except KeyboardInterrupt:
                 raise
@@ -424,7 +617,31 @@ class GrapheneRPC(object):
             self._check_for_server_error(reply)
 
         log.debug(json.dumps(reply))
-
+        result = self._get_result(ret)
+        self._record_head_block(result)
+        return result
+
+    def _record_head_block(self, result):
+        """Stores the head block number of the current node and the last irreversible
+           block number, when the result contains them"""
+        if isinstance(result, list):
+            for r in result:
+                self._record_head_block(r)
+        elif isinstance(result, dict) and "head_block_number" in result:
+            try:
+                self.nodes.set_head_block(result["head_block_number"])
+                if "last_irreversible_block_num" in result:
+                    self.last_irreversible_block_num = max(int(result["last_irreversible_block_num"]),
+                                                           self.last_irreversible_block_num or 0)
+            except (TypeError, ValueError):
+                pass
+
+    def _get_result(self, ret):
+        """ Returns the result of a decoded json reply
+
+            :param ret: decoded reply (dict for a single call, list for batched calls)
+            :raises RPCError: if the reply contains an error
+        """
         if isinstance(ret, dict) and 'error' in ret:
             if 'detail' in ret['error']:
                 raise RPCError(ret['error']['detail'])
@@ -455,23 +672,30 @@ class GrapheneRPC(object):
                 return ret
         return ret
 
+    def _get_query(self, name, *args, **kwargs):
+        """ Returns the rpc query for the api method ``name``
+
+            :param str name: name of the api method
+        """
+        api_name = get_api_name(self.is_appbase_ready(), *args, **kwargs)
+        if self.is_appbase_ready() and self.use_condenser:
+            api_name = "condenser_api"
+        if (api_name is None):
+            api_name = 'database_api'
+        return get_query(self.is_appbase_ready() and not self.use_condenser, self.get_request_id(), api_name, name, args)
+
     # End of Deprecated methods
     ####################################################################
     def __getattr__(self, name):
         """Map all methods to RPC calls and pass through the arguments."""
         def method(*args, **kwargs):
 
-            api_name = get_api_name(self.is_appbase_ready(), *args, **kwargs)
-            if self.is_appbase_ready() and self.use_condenser:
-                api_name = "condenser_api"
-            if (api_name is None):
-                api_name = 'database_api'
-
             # let's be able to define the num_retries per query
             stored_num_retries_call = self.nodes.num_retries_call
             self.nodes.num_retries_call = kwargs.get("num_retries_call", stored_num_retries_call)
             add_to_queue = kwargs.get("add_to_queue", False)
-            query = get_query(self.is_appbase_ready() and not self.use_condenser, self.get_request_id(), api_name, name, args)
+            self._connect_thread()
+            query = self._get_query(name, *args, **kwargs)
             if add_to_queue:
                 self.rpc_queue.append(query)
                 self.nodes.num_retries_call = stored_num_retries_call
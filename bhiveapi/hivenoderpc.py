@@ -5,7 +5,9 @@ from __future__ import unicode_literals
 from builtins import bytes, int, str
 import re
 import sys
+import time
 from .graphenerpc import GrapheneRPC
+from .rpccache import RPCCache, get_block_num_of_query, get_query_method_and_params
 from . import exceptions
 import logging
 log = logging.getLogger(__name__)
@@ -23,6 +25,8 @@ class HiveNodeRPC(GrapheneRPC):
         :param int timeout: Timeout setting for https nodes (default is 60)
         :param bool use_condenser: Use the old condenser_api rpc protocol on nodes with version
             0.19.4 or higher. The settings has no effect on nodes with version of 0.19.3 or lower.
+        :param RPCCache rpc_cache: On-disk cache for blocks and block operations at or below the
+            last irreversible block. When set to True, a cache in the default location is used (default is None)
 
     """
 
@@ -35,11 +39,25 @@ class HiveNodeRPC(GrapheneRPC):
             :param int num_retries: Try x times to num_retries to a node on disconnect, -1 for indefinitely
             :param int num_retries_call: Repeat num_retries_call times a rpc call on node error (default is 5)
             :param int timeout: Timeout setting for https nodes (default is 60)
+            :param RPCCache rpc_cache: On-disk cache for immutable results (default is None)
 
         """
+        rpc_cache = kwargs.get("rpc_cache", None)
+        if rpc_cache is True:
+            rpc_cache = RPCCache()
+        self.rpc_cache = rpc_cache
+        self._last_irreversible_block_update = 0
         super(HiveNodeRPC, self).__init__(*args, **kwargs)
         self.next_node_on_empty_reply = False
 
+    @property
+    def next_node_on_empty_reply(self):
+        return self._thread_state.next_node_on_empty_reply
+
+    @next_node_on_empty_reply.setter
+    def next_node_on_empty_reply(self, next_node_on_empty_reply):
+        self._thread_state.next_node_on_empty_reply = next_node_on_empty_reply
+
     def set_next_node_on_empty_reply(self, next_node_on_empty_reply=True):
         """Switch to next node on empty reply for the next rpc call"""
         self.next_node_on_empty_reply = next_node_on_empty_reply
@@ -53,7 +71,82 @@ class HiveNodeRPC(GrapheneRPC):
             :raises ValueError: if the server does not respond in proper JSON format
             :raises RPCError: if the server returns an error
         """
-        if self.url is None:
+        self._connect_thread()
+        if self.rpc_cache is not None and self.chain_id is not None:
+            return self._cached_rpcexec(payload)
+        return self._rpcexec(payload)
+
+    def _cached_rpcexec(self, payload):
+        """ Returns stored results from rpc_cache and sends only the remaining queries.
+            Immutable results at or below the last irreversible block are stored.
+        """
+        queries = payload if isinstance(payload, list) else [payload]
+        cache_keys = []
+        results = []
+        missing = []
+        for query in queries:
+            cache_key, block_num = self._get_cache_key(query)
+            cache_keys.append((cache_key, block_num))
+            result = None
+            if cache_key is not None:
+                result = self.rpc_cache.get(cache_key)
+            if result is None:
+                missing.append(len(results))
+            results.append(result)
+        if len(missing) == 0:
+            return results if isinstance(payload, list) else results[0]
+        if len(missing) == len(queries):
+            reply = self._rpcexec(payload)
+            if not isinstance(payload, list):
+                missing_results = [reply]
+            elif isinstance(reply, list) and len(reply) == len(missing):
+                missing_results = reply
+            else:
+                # Batched calls are not answered as expected, the caller handles the reply
+                return reply
+        else:
+            missing_results = self._rpcexec([queries[i] for i in missing])
+            if not isinstance(missing_results, list) or len(missing_results) != len(missing):
+                return self._rpcexec(payload)
+        for i, result in zip(missing, missing_results):
+            results[i] = result
+            cache_key, block_num = cache_keys[i]
+            if cache_key is None or not result:
+                continue
+            last_irreversible_block_num = self._get_last_irreversible_block_num(block_num)
+            if last_irreversible_block_num is not None and block_num <= last_irreversible_block_num:
+                self.rpc_cache.set(cache_key, result)
+        return results if isinstance(payload, list) else results[0]
+
+    def _get_cache_key(self, query):
+        """Returns the cache key and the block number of a query, or (None, None) when the result may change"""
+        try:
+            method, params = get_query_method_and_params(query)
+        except (KeyError, IndexError, TypeError):
+            return None, None
+        block_num = get_block_num_of_query(method.split(".")[-1], params)
+        if block_num is None:
+            return None, None
+        return self.rpc_cache.get_key(self.chain_id, method, params), block_num
+
+    def _get_last_irreversible_block_num(self, block_num):
+        """Returns the last irreversible block number, which is updated at most every 3 seconds"""
+        if self.last_irreversible_block_num is None or \
+           (block_num > self.last_irreversible_block_num and time.time() - self._last_irreversible_block_update > 3):
+            self._last_irreversible_block_update = time.time()
+            try:
+                if self.get_use_appbase():
+                    self.get_dynamic_global_properties(api="database")
+                else:
+                    self.get_dynamic_global_properties()
+            except exceptions.RPCError as e:
+                log.warning(str(e))
+        return self.last_irreversible_block_num
+
+    def _rpcexec(self, payload):
+        """ Sends the payload and handles Hive specific errors, see :func:`rpcexec`
+        """
+        if not self.is_thread_connected():
             raise exceptions.RPCConnection("RPC is not connected!")
         doRetry = True
         maxRetryCountReached = False
@@ -72,7 +165,7 @@ class HiveNodeRPC(GrapheneRPC):
             except exceptions.RPCErrorDoRetry as e:
                 msg = exceptions.decodeRPCErrorMsg(e).strip()
                 try:
-                    self.nodes.sleep_and_check_retries(str(msg), call_retry=True)
+                    self._sleep_and_check_call_retries(msg)
                     doRetry = True
                 except exceptions.CallRetriesReached:
                     if self.nodes.working_nodes_count > 1:
@@ -98,6 +191,10 @@ class HiveNodeRPC(GrapheneRPC):
             maxRetryCountReached = self.nodes.num_retries_call_reached
         self.next_node_on_empty_reply = False
 
+    def _sleep_and_check_call_retries(self, error_msg):
+        """Sleeps before the call is repeated, raises CallRetriesReached when num_retries_call is reached"""
+        self.nodes.sleep_and_check_retries(str(error_msg), call_retry=True)
+
     def _retry_on_next_node(self, error_msg):
         self.nodes.increase_error_cnt()
         self.nodes.sleep_and_check_retries(error_msg, sleep=False, call_retry=False)
@@ -136,16 +233,16 @@ class HiveNodeRPC(GrapheneRPC):
         elif re.search("WinError", msg):
             raise exceptions.RPCError(msg)
         elif re.search("Unable to acquire database lock", msg):
-            self.nodes.sleep_and_check_retries(str(msg), call_retry=True)
+            self._sleep_and_check_call_retries(msg)
             doRetry = True
         elif re.search("Request Timeout", msg):
-            self.nodes.sleep_and_check_retries(str(msg), call_retry=True)
+            self._sleep_and_check_call_retries(msg)
             doRetry = True
         elif re.search("Bad or missing upstream response", msg):
-            self.nodes.sleep_and_check_retries(str(msg), call_retry=True)
+            self._sleep_and_check_call_retries(msg)
             doRetry = True
         elif re.search("Internal Error", msg) or re.search("Unknown exception", msg):
-            self.nodes.sleep_and_check_retries(str(msg), call_retry=True)
+            self._sleep_and_check_call_retries(msg)
             doRetry = True
         elif re.search("!check_max_block_age", str(e)):
             self._switch_to_next_node(str(e))
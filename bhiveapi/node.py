@@ -8,28 +8,120 @@ import json
 import re
 import time
 import logging
+import threading
+from collections import deque
 from .exceptions import (
     UnauthorizedError, RPCConnection, RPCError, NumRetriesReached, CallRetriesReached
 )
 log = logging.getLogger(__name__)
 
 
+def get_retry_sleep_time(cnt):
+    """Returns the waiting time in seconds before the retry after cnt errors"""
+    if cnt < 1:
+        sleeptime = 0
+    elif cnt < 10:
+        sleeptime = (cnt - 1) * 1.5 + 0.5
+    else:
+        sleeptime = 10
+    return sleeptime
+
+
 class Node(object):
+    """Stores the url, the error counts and the statistics of a single node
+
+        :param str url: node url
+        :param int max_latencies: number of recent latencies which are kept
+    """
     def __init__(
         self,
-        url
+        url,
+        max_latencies=100
     ):
         self.url = url
         self.error_cnt = 0
-        self.error_cnt_call = 0
+        self.latency = None
+        self.error_rate = 0.
+        self.request_cnt = 0
+        self.probing = False
+        self.head_block = None
+        self.head_block_time = None
+        self.latencies = deque(maxlen=max_latencies)
 
     def __repr__(self):
         return self.url
 
+    def update_latency(self, latency, alpha=0.3):
+        """Adds a successful request with the given latency in seconds to the moving averages"""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = alpha * latency + (1 - alpha) * self.latency
+        self.error_rate = (1 - alpha) * self.error_rate
+        self.request_cnt += 1
+        self.probing = False
+        self.latencies.append(latency)
+
+    def update_error(self, alpha=0.3):
+        """Adds a failed request to the error rate"""
+        self.error_rate = alpha + (1 - alpha) * self.error_rate
+        self.request_cnt += 1
+        self.probing = False
+
+    def update_head_block(self, head_block):
+        """Stores the last observed head block number"""
+        self.head_block = int(head_block)
+        self.head_block_time = time.time()
+
+    def get_head_block_estimate(self, block_interval=3):
+        """Returns the expected head block of the node at the current time"""
+        if self.head_block is None:
+            return None
+        return self.head_block + int((time.time() - self.head_block_time) / block_interval)
+
+    def get_latency_percentile(self, percentile=95):
+        """Returns the given percentile of the recent latencies or None"""
+        if len(self.latencies) == 0:
+            return None
+        latencies = sorted(self.latencies)
+        index = int(round(percentile / 100. * (len(latencies) - 1)))
+        return latencies[min(max(index, 0), len(latencies) - 1)]
+
+    def get_stats(self):
+        """Returns the node statistics as dict"""
+        return {"url": self.url, "latency": self.latency, "error_rate": self.error_rate,
+                "requests": self.request_cnt, "head_block": self.head_block,
+                "error_cnt": self.error_cnt}
+
+
+class NodesThreadState(threading.local):
+    """Stores the current node and the call error counts of a single thread"""
+    def __init__(self, num_retries_call):
+        self.current_node_index = -1
+        self.num_retries_call = num_retries_call
+        self.error_cnt_call = {}
+
 
 class Nodes(list):
-    """Stores Node URLs and error counts"""
-    def __init__(self, urls, num_retries, num_retries_call):
+    """Stores Node URLs, error counts and node statistics
+
+        :param urls: node urls
+        :param int num_retries: number of retries for a node before it is skipped (-1 for infinite)
+        :param int num_retries_call: number of retries for a single call (-1 for infinite)
+        :param float ewma_alpha: smoothing factor of the latency and error rate averages (default is 0.3)
+        :param float max_error_rate: nodes with a higher error rate are only used, when no other
+            node is left (default is 0.5)
+        :param int max_block_lag: nodes which are more than max_block_lag blocks behind the
+            highest observed head block are only used, when no other node is left (default is 20)
+
+        When switching to the next node and statistics are available, the fastest healthy
+        and non-lagging node is selected. Nodes without statistics are tried first, so that
+        every node gets measured, but only by one thread at a time.
+
+        The node error counts and statistics are shared by all threads, while the current node,
+        num_retries_call and the call error counts are stored for each thread.
+    """
+    def __init__(self, urls, num_retries, num_retries_call, ewma_alpha=0.3, max_error_rate=0.5, max_block_lag=20):
         if isinstance(urls, str):
             url_list = re.split(r",|;", urls)
             if url_list is None:
@@ -43,10 +135,14 @@ class Nodes(list):
         else:
             url_list = []
         super(Nodes, self).__init__([Node(x) for x in url_list])
+        self._thread_state = NodesThreadState(num_retries_call)
         self.num_retries = num_retries
         self.num_retries_call = num_retries_call
         self.current_node_index = -1
         self.freeze_current_node = False
+        self.ewma_alpha = ewma_alpha
+        self.max_error_rate = max_error_rate
+        self.max_block_lag = max_block_lag
 
     def __iter__(self):
         return self
@@ -55,6 +151,15 @@ class Nodes(list):
         next_node_count = 0
         if self.freeze_current_node:
             return self.url
+        if self.num_retries >= 0 and self.node.error_cnt >= self.num_retries:
+            return self.url
+        best_index = self._get_best_node_index()
+        if best_index is not None:
+            self.current_node_index = best_index
+            if self.node.request_cnt == 0:
+                # Other threads should not wait for the same unmeasured node
+                self.node.probing = True
+            return self.url
         while next_node_count == 0 and (self.num_retries < 0 or self.node.error_cnt < self.num_retries):
             self.current_node_index += 1
             if self.current_node_index >= self.working_nodes_count:
@@ -66,6 +171,111 @@ class Nodes(list):
 
     next = __next__  # Python 2
 
+    def _get_best_node_index(self, round_robin=False, exclude_index=None):
+        """Returns the index of the best node other than the current one, or None
+           when no statistics are available and round_robin is False"""
+        if exclude_index is None:
+            exclude_index = self.current_node_index
+        if not round_robin and not any(self[i].request_cnt > 0 for i in range(len(self))):
+            return None
+        candidates = []
+        for i in range(len(self)):
+            if self.num_retries >= 0 and self[i].error_cnt > self.num_retries:
+                continue
+            if i == exclude_index:
+                continue
+            candidates.append(i)
+        if len(candidates) == 0:
+            return None
+        head_block = self.head_block
+
+        def sort_key(i):
+            node = self[i]
+            healthy = node.error_rate <= self.max_error_rate
+            lagging = self.is_lagging(node, head_block=head_block)
+            if node.request_cnt == 0 and not node.probing:
+                latency = 0
+            elif node.latency is None:
+                latency = float("inf")
+            else:
+                latency = node.latency
+            distance = (i - self.current_node_index) % len(self)
+            return (not healthy, lagging, latency, distance)
+        return min(candidates, key=sort_key)
+
+    def get_alternative_node(self):
+        """Returns the best working node other than the current one or None"""
+        if self.freeze_current_node:
+            return None
+        index = self._get_best_node_index(round_robin=True, exclude_index=max(self.current_node_index, 0))
+        if index is None:
+            return None
+        return self[index]
+
+    @property
+    def head_block(self):
+        """Returns the highest estimated head block of all nodes or None"""
+        head_blocks = [self[i].get_head_block_estimate() for i in range(len(self)) if self[i].head_block is not None]
+        if len(head_blocks) == 0:
+            return None
+        return max(head_blocks)
+
+    def is_lagging(self, node, head_block=None):
+        """Returns True, when the node is more than max_block_lag blocks behind"""
+        if head_block is None:
+            head_block = self.head_block
+        node_head_block = node.get_head_block_estimate()
+        if head_block is None or node_head_block is None:
+            return False
+        return head_block - node_head_block > self.max_block_lag
+
+    def is_node_switch_needed(self, latency_factor=4.):
+        """ Returns True, when the current node is unhealthy or lagging, or when another
+            healthy node answers more than latency_factor times faster
+        """
+        if self.freeze_current_node or self.current_node_index < 0 or self.working_nodes_count < 2:
+            return False
+        best_index = self._get_best_node_index()
+        if best_index is None:
+            return False
+        node = self.node
+        best_node = self[best_index]
+        head_block = self.head_block
+        if best_node.error_rate > self.max_error_rate or self.is_lagging(best_node, head_block=head_block):
+            return False
+        if node.error_rate > self.max_error_rate or self.is_lagging(node, head_block=head_block):
+            return True
+        if node.latency is None or best_node.latency is None:
+            return False
+        return best_node.latency * latency_factor < node.latency
+
+    def get_node(self, url):
+        """Returns the node with the given url or None"""
+        for i in range(len(self)):
+            if self[i].url == url:
+                return self[i]
+        return None
+
+    def get_node_stats(self):
+        """Returns a list with the statistics of all nodes"""
+        head_block = self.head_block
+        stats = []
+        for i in range(len(self)):
+            node_stats = self[i].get_stats()
+            node_stats["lagging"] = self.is_lagging(self[i], head_block=head_block)
+            stats.append(node_stats)
+        return stats
+
+    def record_latency(self, latency):
+        """Adds a successful request with the given latency in seconds to the current node"""
+        if self.node is not None:
+            self.node.update_latency(latency, alpha=self.ewma_alpha)
+
+    def set_head_block(self, head_block):
+        """Stores the last head block number observed on the current node"""
+        if self.node is not None:
+            self.node.update_head_block(head_block)
+
     def export_working_nodes(self):
         nodes_list = []
         for i in range(len(self)):
@@ -92,6 +302,22 @@ class Nodes(list):
                 n += 1
         return n
 
+    @property
+    def current_node_index(self):
+        return self._thread_state.current_node_index
+
+    @current_node_index.setter
+    def current_node_index(self, current_node_index):
+        self._thread_state.current_node_index = current_node_index
+
+    @property
+    def num_retries_call(self):
+        return self._thread_state.num_retries_call
+
+    @num_retries_call.setter
+    def num_retries_call(self, num_retries_call):
+        self._thread_state.num_retries_call = num_retries_call
+
     @property
     def url(self):
         if self.node is None:
@@ -114,7 +340,7 @@ class Nodes(list):
     def error_cnt_call(self):
         if self.node is None:
             return 0
-        return self.node.error_cnt_call
+        return self._thread_state.error_cnt_call.get(self.node.url, 0)
 
     @property
     def num_retries_call_reached(self):
@@ -123,22 +349,23 @@ class Nodes(list):
     def disable_node(self):
         """Disable current node"""
         if self.node is not None and self.num_retries_call >= 0:
-            self.node.error_cnt_call = self.num_retries_call
+            self._thread_state.error_cnt_call[self.node.url] = self.num_retries_call
 
     def increase_error_cnt(self):
         """Increase node error count for current node"""
         if self.node is not None:
             self.node.error_cnt += 1
+            self.node.update_error(alpha=self.ewma_alpha)
 
     def increase_error_cnt_call(self):
         """Increase call error count for current node"""
         if self.node is not None:
-            self.node.error_cnt_call += 1
+            self._thread_state.error_cnt_call[self.node.url] = self.error_cnt_call + 1
 
     def reset_error_cnt_call(self):
         """Set call error count for current node to zero"""
         if self.node is not None:
-            self.node.error_cnt_call = 0
+            self._thread_state.error_cnt_call[self.node.url] = 0
 
     def reset_error_cnt(self):
         """Set node error count for current node to zero"""
@@ -165,12 +392,15 @@ class Nodes(list):
                 log.warning("Lost connection or internal error on node: %s (%d/%d) \n" % (self.url, cnt, self.num_retries))
         if not sleep:
             return
-        if cnt < 1:
-            sleeptime = 0
-        elif cnt < 10:
-            sleeptime = (cnt - 1) * 1.5 + 0.5
-        else:
-            sleeptime = 10
+        sleeptime = self.get_sleep_time(call_retry=call_retry)
         if sleeptime:
             log.warning("Retrying in %d seconds\n" % sleeptime)
             time.sleep(sleeptime)
+
+    def get_sleep_time(self, call_retry=False):
+        """Returns the waiting time in seconds before the next retry"""
+        if call_retry:
+            cnt = self.error_cnt_call
+        else:
+            cnt = self.error_cnt
+        return get_retry_sleep_time(cnt)
@@ -0,0 +1,196 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import str
+import os
+import json
+import zlib
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from appdirs import user_cache_dir
+log = logging.getLogger(__name__)
+
+
+def get_block_num_of_query(method, params):
+    """ Returns the highest block number, which is read by a query of
+        a method with immutable results, or None when the result may change
+
+        :param str method: method name without api name
+        :param params: query parameter (list for condenser calls, dict for appbase calls)
+    """
+    try:
+        if method in ["get_block", "get_block_header", "get_ops_in_block"]:
+            if isinstance(params, dict):
+                return int(params["block_num"])
+            return int(params[0])
+        elif method == "get_block_range" and isinstance(params, dict):
+            return int(params["starting_block_num"]) + int(params["count"]) - 1
+        elif method == "enum_virtual_ops" and isinstance(params, dict):
+            return int(params["block_range_end"]) - 1
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+    return None
+
+
+def get_query_method_and_params(query):
+    """Returns the method name including the api name and the parameter of a single query"""
+    if query["method"] == "call":
+        return query["params"][0] + "." + query["params"][1], query["params"][2]
+    return query["method"], query.get("params")
+
+
+class RPCCache(object):
+    """ Persistent on-disk cache for immutable rpc results, e.g. irreversible blocks
+        and their operations. The results are stored in files named by the sha256 hash
+        of (chain_id, method, params).
+
+        :param str path: cache directory (default is the bhive user cache directory)
+        :param int max_size: maximum size of all cached files in bytes. The least recently used
+            results are removed, when the cache grows above it (default is 1 GB)
+        :param bool compress: When True, results are zlib compressed (default is True)
+
+        .. code-block:: python
+
+            from bhive import Hive
+            from bhiveapi.rpccache import RPCCache
+            hv = Hive(rpc_cache=RPCCache(max_size=10 * 1024 ** 3))
+
+    """
+    def __init__(self, path=None, max_size=1024 ** 3, compress=True):
+        if path is None:
+            path = os.path.join(user_cache_dir("bhive", "bhive"), "rpc")
+        self.path = path
+        self.max_size = max_size
+        self.compress = compress
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index = None
+        self._lock = threading.Lock()
+
+    def get_key(self, chain_id, method, params):
+        """Returns the content address of a query"""
+        data = json.dumps([chain_id, method, params], sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _get_filename(self, key):
+        return os.path.join(self.path, key[:2], key)
+
+    def _load_index(self):
+        """Reads the size and last usage of all stored results"""
+        index = []
+        self.size = 0
+        if os.path.isdir(self.path):
+            for sub_dir in os.listdir(self.path):
+                sub_path = os.path.join(self.path, sub_dir)
+                if not os.path.isdir(sub_path):
+                    continue
+                for key in os.listdir(sub_path):
+                    if key[-4:] == ".tmp":
+                        continue
+                    try:
+                        stat = os.stat(os.path.join(sub_path, key))
+                    except OSError:
+                        continue
+                    index.append((stat.st_mtime, key, stat.st_size))
+        self._index = OrderedDict()
+        for mtime, key, size in sorted(index):
+            self._index[key] = size
+            self.size += size
+
+    def get(self, key):
+        """Returns the stored result or None"""
+        filename = self._get_filename(key)
+        try:
+            with open(filename, "rb") as f:
+                data = f.read()
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+        try:
+            if data[:1] not in [b"{", b"[", b"\""]:
+                data = zlib.decompress(data)
+            result = json.loads(data.decode("utf-8"))
+        except (ValueError, zlib.error):
+            log.warning("Removing corrupt cache entry %s" % filename)
+            self.remove(key)
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self._lock:
+            if self._index is not None and key in self._index:
+                self._index[key] = self._index.pop(key)
+        try:
+            os.utime(filename, None)
+        except OSError:
+            pass
+        return result
+
+    def set(self, key, result):
+        """Stores a result"""
+        data = json.dumps(result, separators=(',', ':')).encode("utf-8")
+        if self.compress:
+            data = zlib.compress(data)
+        filename = self._get_filename(key)
+        tmp_filename = "%s.%d.%d.tmp" % (filename, os.getpid(), threading.current_thread().ident)
+        try:
+            if not os.path.isdir(os.path.dirname(filename)):
+                os.makedirs(os.path.dirname(filename))
+        except OSError:
+            pass
+        try:
+            with open(tmp_filename, "wb") as f:
+                f.write(data)
+            getattr(os, "replace", os.rename)(tmp_filename, filename)
+        except (IOError, OSError) as e:
+            log.warning("Could not write cache entry %s: %s" % (filename, str(e)))
+            return
+        with self._lock:
+            if self._index is None:
+                self._load_index()
+            else:
+                self.size -= self._index.pop(key, 0)
+                self._index[key] = len(data)
+                self.size += len(data)
+            self._evict()
+
+    def remove(self, key):
+        """Removes a stored result"""
+        try:
+            os.remove(self._get_filename(key))
+        except OSError:
+            pass
+        with self._lock:
+            if self._index is not None and key in self._index:
+                self.size -= self._index.pop(key)
+
+    def _evict(self):
+        """Removes least recently used results until the size is below max_size"""
+        if self.max_size is None:
+            return
+        while self.size > self.max_size and len(self._index) > 0:
+            key, size = self._index.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+            try:
+                os.remove(self._get_filename(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        """Removes all stored results"""
+        with self._lock:
+            if self._index is None:
+                self._load_index()
+            for key in list(self._index.keys()):
+                try:
+                    os.remove(self._get_filename(key))
+                except OSError:
+                    pass
+            self._index = OrderedDict()
+            self.size = 0
@@ -80,3 +80,45 @@ def get_api_name(appbase, *args, **kwargs):
         else:
             api_name = "condenser_api"
     return api_name
+
+
+# Calls which change the state of the node or of the chain, they must be sent only once
+NON_IDEMPOTENT_METHODS = [
+    "broadcast_transaction",
+    "broadcast_transaction_synchronous",
+    "broadcast_transaction_with_callback",
+    "broadcast_block",
+    "login",
+    "set_subscribe_callback",
+    "set_pending_transaction_callback",
+    "set_block_applied_callback",
+    "cancel_all_subscriptions",
+]
+
+
+def get_method_names(payload):
+    """Returns the list of called method names (without api name) of a query"""
+    if isinstance(payload, list):
+        names = []
+        for p in payload:
+            names.extend(get_method_names(p))
+        return names
+    if not isinstance(payload, dict) or "method" not in payload:
+        return []
+    if payload["method"] == "call":
+        params = payload.get("params", [])
+        if isinstance(params, list) and len(params) > 1:
+            return [params[1]]
+        return []
+    return [payload["method"].split(".")[-1]]
+
+
+def is_idempotent_query(payload, non_idempotent_methods=NON_IDEMPOTENT_METHODS):
+    """Returns True, when the query can be sent several times without side effects"""
+    names = get_method_names(payload)
+    if len(names) == 0:
+        return False
+    for name in names:
+        if name in non_idempotent_methods:
+            return False
+    return True
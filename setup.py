@@ -35,6 +35,10 @@ requires = [
     "pyyaml"
 ]
 
+extras_require = {
+    "async": ["aiohttp"],
+}
+
 
 def write_version_py(filename):
     """Write version."""
@@ -97,6 +101,7 @@ if __name__ == '__main__':
             'Topic :: Office/Business :: Financial',
         ],
         install_requires=requires,
+        extras_require=extras_require,
         entry_points={
             'console_scripts': [
                 'bhivepy=bhive.cli:cli',
@@ -0,0 +1,27 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+
+def get_block(block_num, operations=None, transactions=None, timestamp="2020-01-01T00:00:00", fork="0", previous_fork="0"):
+    """ Returns a raw block, whose block_id starts with block_num
+
+        :param list operations: operations of the single transaction
+            (default is a vote and a transfer)
+        :param list transactions: transactions of the block, replaces operations
+        :param str fork: fills the block_id after the block number
+        :param str previous_fork: fills the previous block_id after the block number
+    """
+    if transactions is None:
+        if operations is None:
+            operations = [{"type": "vote_operation", "value": {"voter": "a%d" % block_num}},
+                          {"type": "transfer_operation", "value": {"from": "a", "to": "b"}}]
+        transactions = [{"operations": operations,
+                         "expiration": "2020-01-01T00:01:00",
+                         "signatures": ["%064x" % block_num]}]
+    return {"block_id": "%08x" % block_num + fork * 32,
+            "previous": "%08x" % (block_num - 1) + previous_fork * 32,
+            "timestamp": timestamp,
+            "transactions": transactions,
+            "transaction_ids": ["%040x" % (block_num + 100 * i) for i in range(len(transactions))]}
@@ -11,7 +11,7 @@ from datetime import datetime, timedelta
 from parameterized import parameterized
 from pprint import pprint
 from bhive import Hive, exceptions
-from bhive.account import Account
+from bhive.account import Account, Accounts
 from bhive.block import Block
 from bhive.amount import Amount
 from bhive.asset import Asset
@@ -172,6 +172,20 @@ class Testcases(unittest.TestCase):
         self.assertEqual(h_list[0][1]['block'], h_all_raw[-10 + zero_element][1]['block'])
         self.assertEqual(h_list[-1][1]['block'], h_all_raw[-2 + zero_element][1]['block'])
 
+    def test_history_threading(self):
+        account = self.account
+        max_index = account.virtual_op_count()
+        h_list = list(account.history(start=max_index - 49, stop=max_index, use_block_num=False, batch_size=10))
+        h_list_threading = list(account.history(start=max_index - 49, stop=max_index, use_block_num=False, batch_size=10,
+                                                threading=True, thread_num=4))
+        self.assertEqual(len(h_list), 50)
+        self.assertEqual(h_list, h_list_threading)
+        h_list = list(account.history_reverse(start=max_index, stop=max_index - 49, use_block_num=False, batch_size=10,
+                                              only_ops=["vote"]))
+        h_list_threading = list(account.history_reverse(start=max_index, stop=max_index - 49, use_block_num=False, batch_size=10,
+                                                        only_ops=["vote"], threading=True, thread_num=4))
+        self.assertEqual(h_list, h_list_threading)
+
     def test_history2(self):
         hv = self.bts
         account = Account("bhive.app", hive_instance=hv)
@@ -444,6 +458,26 @@ class Testcases(unittest.TestCase):
         self.assertTrue(block_diff1 > 0)
         self.assertTrue(block_diff2 <= 0)
 
+    def test_estimate_virtual_op_nums(self):
+        hv = self.bts
+        account = Account("gtg", hive_instance=hv)
+        block_nums = [21248120, 21248120 + 100000, 21248120 - 100000]
+        op_nums = account.estimate_virtual_op_nums(block_nums, stop_diff=1)
+        self.assertEqual(len(op_nums), 3)
+        for block_num, op_num in zip(block_nums, op_nums):
+            self.assertTrue(abs(op_num - account.estimate_virtual_op_num(block_num, stop_diff=1)) < 2)
+        self.assertTrue(op_nums[2] <= op_nums[0] <= op_nums[1])
+
+    def test_accounts(self):
+        hv = self.bts
+        names = ["gtg", "bhive.app", "test", "DoesNotExistsXXX", "ausbitbank"]
+        accounts = Accounts(names, batch_limit=2, threading=True, hive_instance=hv)
+        self.assertEqual([a["name"] for a in accounts], ["gtg", "bhive.app", "test", "ausbitbank"])
+        self.assertTrue(isinstance(accounts[0], Account))
+        accounts = Accounts(names, batch_limit=2, raw_data=True, hive_instance=hv)
+        self.assertEqual([a["name"] for a in accounts], ["gtg", "bhive.app", "test", "ausbitbank"])
+        self.assertFalse(isinstance(accounts[0], Account))
+
     def test_estimate_virtual_op_num2(self):
         account = self.account
         h_all_raw = []
@@ -0,0 +1,43 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import unittest
+from bhive import Hive, exceptions
+from bhive.account import Account
+from bhive.accountloader import AccountLoader
+from bhive.blockchainobject import BlockchainObject
+from bhive.nodelist import NodeList
+
+
+class Testcases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        nodelist = NodeList()
+        nodelist.update_nodes(hive_instance=Hive(node=nodelist.get_nodes(exclude_limited=False), num_retries=10))
+        cls.bts = Hive(node=nodelist.get_nodes(exclude_limited=True), num_retries=10)
+
+    def test_load_many(self):
+        hv = self.bts
+        names = ["bhive.app", "gtg", "test"]
+        with AccountLoader(hive_instance=hv) as loader:
+            self.assertEqual(hv.account_loader, loader)
+            accounts = loader.load_many(names)
+            self.assertEqual(loader.calls, 0)
+            self.assertEqual([a["name"] for a in accounts], names)
+            self.assertEqual(loader.calls, 1)
+            self.assertEqual(Account("gtg", hive_instance=hv)["name"], "gtg")
+            self.assertEqual(loader.calls, 1)
+            self.assertTrue(BlockchainObject._cache.get("test", None) is not None)
+        self.assertIsNone(hv.account_loader)
+
+    def test_lazy_accounts(self):
+        hv = self.bts
+        with AccountLoader(hive_instance=hv, batch_limit=2) as loader:
+            accounts = [Account(name, lazy=True, hive_instance=hv) for name in ["bhive.app", "gtg", "test"]]
+            self.assertEqual(accounts[2]["name"], "test")
+            self.assertEqual(loader.calls, 2)
+            self.assertEqual(len(loader), 3)
+            with self.assertRaises(exceptions.AccountDoesNotExistsException):
+                Account("DoesNotExistsXXX", hive_instance=hv)
@@ -0,0 +1,39 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import unittest
+import mock
+from bhive import Hive
+from bhive.account import Account, Accounts, AccountsObject
+
+
+class Testcases(unittest.TestCase):
+
+    def get_hive(self, names):
+        """Returns a Hive instance, whose node knows the accounts names in reversed order"""
+        hv = Hive(offline=True)
+        hv.rpc = mock.Mock()
+        hv.rpc.get_use_appbase.return_value = True
+
+        def find_accounts(params, api=None):
+            return {"accounts": [{"name": name} for name in reversed(params["accounts"]) if name in names]}
+        hv.rpc.find_accounts.side_effect = find_accounts
+        return hv
+
+    def test_accounts_order_and_missing(self):
+        hv = self.get_hive(["a", "b", "c", "d"])
+        with mock.patch.object(Hive, "is_connected", return_value=True):
+            with mock.patch("bhive.account.log") as log:
+                accounts = Accounts(["c", "x", "a", "d", "b"], batch_limit=2, hive_instance=hv)
+            self.assertIsInstance(accounts, Accounts)
+            self.assertIsInstance(accounts[0], Account)
+            self.assertEqual([a["name"] for a in accounts], ["c", "a", "d", "b"])
+            self.assertEqual(log.warning.call_count, 1)
+            self.assertIn("x", log.warning.call_args[0][0])
+
+            accounts = Accounts(["c", "a", "d", "b"], batch_limit=2, hive_instance=hv, raw_data=True)
+            # the account dicts are returned as plain list
+            self.assertEqual(type(accounts), list)
+            self.assertNotIsInstance(accounts, AccountsObject)
+            self.assertEqual(accounts, [{"name": "c"}, {"name": "a"}, {"name": "d"}, {"name": "b"}])
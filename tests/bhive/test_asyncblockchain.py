@@ -0,0 +1,63 @@
+# This Python file uses the following encoding: utf-8
+import asyncio
+import unittest
+from bhive import Hive
+from bhive.asyncblockchain import AsyncBlockchain
+from bhiveapi.asynchivenoderpc import AsyncHiveNodeRPC
+from tests.bhiveapi.aiohttpfixtures import FakeSession, run
+from .blockfixtures import get_block
+
+
+class Testcases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.hv = Hive(offline=True)
+
+    def get_chain(self, handlers, **kwargs):
+        rpc = AsyncHiveNodeRPC(list(handlers.keys()), disable_chain_detection=True, num_retries=5)
+        rpc.session = FakeSession(handlers)
+        return AsyncBlockchain(rpc, hive_instance=self.hv, **kwargs)
+
+    async def node(self, method, params):
+        if method == "database_api.get_config":
+            return {"HIVE_BLOCK_INTERVAL": 3}
+        elif method == "database_api.get_dynamic_global_properties":
+            return {"head_block_number": 20, "last_irreversible_block_num": 5}
+        elif method == "block_api.get_block":
+            # later blocks answer faster, so that the responses arrive out of order
+            await asyncio.sleep(0.002 * (10 - params["block_num"] % 10))
+            return {"block": get_block(params["block_num"])}
+        raise ValueError(method)
+
+    def test_blocks_in_order(self):
+        chain = self.get_chain({"https://a": self.node})
+
+        async def main():
+            return [block async for block in chain.blocks(start=1, stop=25, concurrency=4)]
+
+        blocks = run(main())
+        self.assertEqual([b.block_num for b in blocks], list(range(1, 26)))
+        self.assertLessEqual(chain.rpc.session.max_running, 4)
+        self.assertGreater(chain.rpc.session.max_running, 1)
+
+    def test_stream(self):
+        chain = self.get_chain({"https://a": self.node})
+
+        async def main():
+            return [op async for op in chain.stream(opNames=["transfer"], start=1, stop=5, concurrency=2)]
+
+        ops = run(main())
+        self.assertEqual([op["block_num"] for op in ops], list(range(1, 6)))
+        self.assertEqual(ops[0]["type"], "transfer")
+
+    def test_current_block_num(self):
+        def empty(method, params):
+            return {}
+
+        chain = self.get_chain({"https://a": empty, "https://b": self.node})
+        # an empty reply moves the call to the next node
+        self.assertEqual(run(chain.get_current_block_num()), 5)
+        self.assertEqual(chain.rpc.url, "https://b")
+        chain = self.get_chain({"https://a": self.node}, mode="head")
+        self.assertEqual(run(chain.get_current_block_num()), 20)
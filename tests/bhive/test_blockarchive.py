@@ -0,0 +1,89 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import shutil
+import tempfile
+import threading
+import unittest
+from bhive import Hive
+from bhive.block import Block
+from bhive.blockarchive import BlockArchive
+from .blockfixtures import get_block
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_append_and_get(self):
+        archive = BlockArchive(self.path)
+        self.assertIsNone(archive.last_block)
+        self.assertIsNone(archive.get(10))
+        for block_num in [10, 11, 14, 12]:
+            archive.append(get_block(block_num))
+        self.assertEqual(archive.first_block, 10)
+        self.assertEqual(archive.last_block, 14)
+        self.assertEqual(archive.get(14), get_block(14))
+        self.assertIn(12, archive)
+        self.assertNotIn(13, archive)
+        self.assertNotIn(9, archive)
+        self.assertEqual(archive.missing_blocks(9, 15), [9, 13, 15])
+        self.assertEqual([b["block_id"][:8] for b in archive.blocks(10, 14)], ["0000000a", "0000000b", "0000000c", "0000000e"])
+        with self.assertRaises(ValueError):
+            archive.append(get_block(5))
+        archive.close()
+
+    def test_readers(self):
+        hv = Hive(offline=True)
+        archive = BlockArchive(self.path, compress=False, first_block=1)
+        reader = BlockArchive(self.path, read_only=True)
+        self.assertIsNone(reader.get(3))
+        archive.append(Block(get_block(3), hive_instance=hv))
+        archive.append(get_block(3000))
+        self.assertEqual(reader.first_block, 1)
+        self.assertEqual(reader.last_block, 3000)
+        block = reader.get_block(3, hive_instance=hv)
+        self.assertEqual(block.block_num, 3)
+        self.assertEqual(block.json()["transactions"][0]["expiration"], "2020-01-01T00:01:00")
+        with self.assertRaises(IOError):
+            reader.append(get_block(4))
+        reader.close()
+        archive.close()
+
+    def test_threaded_readers(self):
+        archive = BlockArchive(self.path, first_block=1)
+        reader = BlockArchive(self.path, read_only=True)
+        errors = []
+
+        def read():
+            try:
+                for i in range(300):
+                    last_block = reader.last_block
+                    if last_block is not None:
+                        self.assertEqual(reader.get(last_block)["block_id"][:8], "%08x" % last_block)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=read) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        # each append grows the index, so that the readers remap it
+        for block_num in range(1, 301):
+            archive.append(get_block(block_num))
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(reader.last_block, 300)
+        # a map, which is still used by another thread, stays open after a remap
+        index_map, index_size = reader._index
+        archive.append(get_block(301))
+        self.assertEqual(reader.last_block, 301)
+        self.assertIsNot(reader._index[0], index_map)
+        self.assertEqual(len(index_map[:index_size]), index_size)
+        reader.close()
+        archive.close()
@@ -197,6 +197,34 @@ class Testcases(unittest.TestCase):
             ops_stream.append(op)
         self.assertTrue(len(ops_stream) > 0)
 
+    def test_virtual_op_blocks(self):
+        bts = self.bts
+        b = Blockchain(hive_instance=bts)
+        stop_block = b.get_current_block_num()
+        start_block = stop_block - 10
+        ranged = []
+        for block in b.blocks(start=start_block, stop=stop_block, only_virtual_ops=True, virtual_op_range=4):
+            ranged.append((block.block_num, [op["op"] for op in block.operations]))
+        single = []
+        for block in b.blocks(start=start_block, stop=stop_block, only_virtual_ops=True, virtual_op_range=None):
+            single.append((block.block_num, [op["op"] for op in block.operations]))
+        self.assertEqual(len(ranged), 11)
+        self.assertEqual(ranged, single)
+
+    def test_block_range(self):
+        bts = self.bts
+        b = Blockchain(hive_instance=bts)
+        stop_block = b.get_current_block_num()
+        start_block = stop_block - 10
+        block_nums = []
+        for block in b.blocks(start=start_block, stop=stop_block, use_block_range=True):
+            block_nums.append(block.block_num)
+        self.assertEqual(block_nums, list(range(start_block, stop_block + 1)))
+        headers = list(b.block_headers(start_block, stop_block))
+        self.assertEqual(len(headers), 11)
+        self.assertEqual(headers[0].block_num, start_block)
+        self.assertEqual(headers[-1].time(), b.block_time(stop_block))
+
     def test_wait_for_and_get_block(self):
         bts = self.bts
         b = Blockchain(hive_instance=bts, max_block_wait_repetition=18)
@@ -0,0 +1,88 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import os
+import shutil
+import tempfile
+import unittest
+from bhive import Hive
+from bhive.blockchain import Blockchain
+from bhive.blocksource import MemoryBlockSource, FileBlockSource
+from bhive.blockdecoder import BlockDecoderPool, decode_block
+from bhive.utils import formatTimeString
+from .blockfixtures import get_block as get_raw_block
+
+
+def get_block(block_num):
+    return get_raw_block(block_num, timestamp="2020-01-01T00:00:%02d" % block_num,
+                         transactions=[{"operations": [{"type": "vote_operation", "value": {"voter": "a%d" % block_num}},
+                                                       {"type": "transfer_operation", "value": {"from": "a", "to": "b"}}],
+                                        "expiration": "2020-01-01T00:01:00"},
+                                       {"operations": [["comment", {"author": "c%d" % block_num}]],
+                                        "expiration": "2020-01-01T00:01:00"}])
+
+
+class Testcases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.hv = Hive(offline=True)
+
+    def test_decode_block(self):
+        records = decode_block(get_block(5))
+        self.assertEqual(len(records), 3)
+        record = records[2]
+        self.assertEqual(record.block_num, 5)
+        self.assertEqual(record.trx_num, 1)
+        self.assertEqual(record.op_num, 0)
+        self.assertEqual(record.trx_id, "%040x" % 105)
+        self.assertEqual(record.timestamp, formatTimeString("2020-01-01T00:00:05"))
+        self.assertEqual(record.type, "comment")
+        self.assertEqual(record.op, {"author": "c5"})
+        records = decode_block(get_block(5), opNames=["transfer"])
+        self.assertEqual([(r.type, r.op_num) for r in records], [("transfer", 1)])
+
+    def test_pool(self):
+        with BlockDecoderPool(processes=2, chunksize=3) as pool:
+            records = list(pool.records((get_block(n) for n in range(1, 21)), opNames=["vote", "comment"]))
+        self.assertEqual(len(records), 40)
+        self.assertEqual([r.block_num for r in records[::2]], list(range(1, 21)))
+        self.assertEqual(records[-1].op, {"author": "c20"})
+
+    def test_pool_backpressure(self):
+        read = []
+
+        def blocks():
+            for n in range(1, 51):
+                read.append(n)
+                yield get_block(n)
+            raise ValueError("node failed")
+
+        with BlockDecoderPool(processes=2, chunksize=5, max_chunks=3) as pool:
+            decoded = pool.decode(blocks())
+            self.assertEqual(next(decoded)[0].block_num, 1)
+            # the window of three chunks and the refilled chunk
+            self.assertEqual(len(read), 20)
+            with self.assertRaises(ValueError):
+                for records in decoded:
+                    pass
+        self.assertEqual(len(read), 50)
+
+    def test_op_records(self):
+        source = MemoryBlockSource([get_block(n) for n in range(1, 11)], hive_instance=self.hv)
+        blockchain = Blockchain(hive_instance=self.hv, block_source=source)
+        ops = list(blockchain.stream(opNames=["vote"], start=3))
+        records = list(blockchain.op_records(start=3, opNames=["vote"], processes=2))
+        self.assertEqual([(r.block_num, r.trx_id, r.timestamp, r.op) for r in records],
+                         [(op["block_num"], op["trx_id"], op["timestamp"], {"voter": op["voter"]}) for op in ops])
+
+        path = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(path, "blocks.jsonl")
+            FileBlockSource.write(filename, [get_block(n) for n in range(1, 11)])
+            source = FileBlockSource(filename, hive_instance=self.hv)
+            records = list(blockchain.op_records(opNames=["transfer"], processes=2, block_source=source))
+            self.assertEqual([r.block_num for r in records], list(range(1, 11)))
+        finally:
+            shutil.rmtree(path)
@@ -0,0 +1,180 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import threading
+import time
+import unittest
+import mock
+from bhive import Hive
+from bhiveapi.exceptions import RPCError
+from bhive.block import Block
+from bhive.blockchain import Blockchain
+from bhive.exceptions import BatchedCallsNotSupported, BlockDoesNotExistsException
+from .blockfixtures import get_block
+
+
+class FakeBatchRPC(object):
+    """ Answers batched get_block and get_ops_in_block calls, the calls with
+        add_to_queue are answered together with the next call
+
+        :param str mode: ``ok``, ``error`` (raises), ``short`` (misses the last
+            block) or ``empty`` (returns an empty block)
+    """
+    def __init__(self, mode="ok"):
+        self.mode = mode
+        self.rpc_queue = []
+        self.batches = []
+
+    def set_next_node_on_empty_reply(self, next_node_on_empty_reply=True):
+        pass
+
+    def get_use_appbase(self):
+        return True
+
+    def get_block(self, params, api=None, add_to_queue=False):
+        return self.call({"block": get_block(params["block_num"])}, add_to_queue)
+
+    def get_ops_in_block(self, params, api=None, add_to_queue=False):
+        block = get_block(params["block_num"])
+        ops = [{"block": params["block_num"], "timestamp": block["timestamp"], "op": ["producer_reward", {}]}]
+        return self.call({"ops": ops}, add_to_queue)
+
+    def call(self, reply, add_to_queue):
+        self.rpc_queue.append(reply)
+        if add_to_queue:
+            return None
+        replies = self.rpc_queue
+        self.rpc_queue = []
+        self.batches.append(len(replies))
+        if self.mode == "error":
+            raise RPCError("batch failed")
+        elif self.mode == "short":
+            return replies[:-1]
+        elif self.mode == "empty":
+            replies[-1] = {"block": None}
+        return replies
+
+
+class Testcases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.hv = Hive(offline=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.hv.close_worker_pool()
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.running = 0
+        self.max_running = 0
+        self.batches = []
+
+    def fetch_block(self, block_num, only_ops=False, only_virtual_ops=False, hive_instance=None):
+        with self.lock:
+            self.submitted += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        # later blocks answer faster, so that the responses arrive out of order
+        time.sleep(0.002 * (block_num % 5))
+        with self.lock:
+            self.running -= 1
+        return Block(get_block(block_num), hive_instance=self.hv)
+
+    def fetch_batch(self, block_nums, hive_instance, only_ops=False, only_virtual_ops=False):
+        with self.lock:
+            self.batches.append(list(block_nums))
+        return [self.fetch_block(block_num) for block_num in block_nums]
+
+    def test_prefetch_window(self):
+        blockchain = Blockchain(hive_instance=self.hv)
+        pool = self.hv.get_worker_pool(4)
+        window = 3
+        block_nums = []
+        with mock.patch("bhive.blockchain.Block", side_effect=self.fetch_block):
+            for i, block in enumerate(blockchain._prefetch_blocks(range(1, 31), pool, [self.hv] * window)):
+                # the yielded block, the window and the refilled request
+                self.assertLessEqual(self.submitted, i + window + 1)
+                block_nums.append(block.block_num)
+        self.assertEqual(block_nums, list(range(1, 31)))
+        self.assertEqual(self.submitted, 30)
+        self.assertLessEqual(self.max_running, window)
+
+    def test_prefetch_retries_are_bounded(self):
+        blockchain = Blockchain(hive_instance=self.hv)
+        pool = self.hv.get_worker_pool(4)
+        with mock.patch("bhive.blockchain.Block", side_effect=BlockDoesNotExistsException("1")) as block:
+            with self.assertRaises(BlockDoesNotExistsException):
+                list(blockchain._prefetch_blocks([1], pool, [self.hv] * 2, max_block_retries=3))
+        # two instances for the request, then three tries for the first block
+        self.assertEqual(block.call_count, 5)
+
+    def test_threaded_batches(self):
+        blockchain = Blockchain(hive_instance=self.hv)
+        current_block = Block(get_block(100), hive_instance=self.hv)
+        with mock.patch.object(Blockchain, "get_current_block", return_value=current_block), \
+                mock.patch.object(Blockchain, "_get_block_batch", side_effect=self.fetch_batch):
+            blocks = list(blockchain.blocks(start=1, stop=23, threading=True, thread_num=2, max_batch_size=5))
+        self.assertEqual([b.block_num for b in blocks], list(range(1, 24)))
+        self.assertEqual(sorted(self.batches), [list(range(n, min(n + 5, 24))) for n in range(1, 24, 5)])
+        self.assertLessEqual(self.max_running, 2)
+
+    def get_hive(self, mode="ok"):
+        hv = Hive(offline=True)
+        hv.rpc = FakeBatchRPC(mode)
+        return hv
+
+    def test_get_block_batch(self):
+        blockchain = Blockchain(hive_instance=self.hv)
+        hv = self.get_hive()
+        blocks = blockchain._get_block_batch([3, 4, 5], hv)
+        self.assertEqual([b.block_num for b in blocks], [3, 4, 5])
+        # the blocks are received by a single batched call
+        self.assertEqual(hv.rpc.batches, [3])
+        blocks = blockchain._get_block_batch([3, 4], hv, only_virtual_ops=True)
+        self.assertEqual([b.block_num for b in blocks], [3, 4])
+        self.assertEqual(len(blocks[0].operations), 1)
+        with self.assertRaises(BatchedCallsNotSupported):
+            blockchain._get_block_batch([3, 4, 5], self.get_hive("short"))
+        with self.assertRaises(BlockDoesNotExistsException):
+            blockchain._get_block_batch([3, 4, 5], self.get_hive("empty"))
+
+    def test_failed_batch_is_retried_on_next_instance(self):
+        blockchain = Blockchain(hive_instance=self.hv)
+        pool = self.hv.get_worker_pool(4)
+        broken, working = self.get_hive("error"), self.get_hive()
+        with mock.patch("bhive.blockchain.Block", wraps=Block) as block:
+            blocks = list(blockchain._prefetch_blocks(range(1, 6), pool, [broken, working], batch_size=5))
+        self.assertEqual([b.block_num for b in blocks], list(range(1, 6)))
+        self.assertEqual(broken.rpc.batches, [5])
+        self.assertEqual(working.rpc.batches, [5])
+        # the blocks were parsed from the batch of the second instance, no block was received on its own
+        self.assertTrue(all(not isinstance(c[0][0], int) for c in block.call_args_list))
+
+    def test_batch_fallback_to_single_blocks(self):
+        blockchain = Blockchain(hive_instance=self.hv)
+        pool = self.hv.get_worker_pool(4)
+        instances = [self.get_hive("error"), self.get_hive("short")]
+        failed = []
+
+        def fetch_block(block, only_ops=False, only_virtual_ops=False, hive_instance=None):
+            # the first try of block 3 fails
+            if block == 3 and len(failed) == 0:
+                failed.append(block)
+                raise RPCError("block 3")
+            return Block(get_block(block), hive_instance=self.hv)
+
+        with mock.patch("bhive.blockchain.Block", side_effect=fetch_block) as block:
+            blocks = list(blockchain._prefetch_blocks(range(1, 6), pool, instances, batch_size=5, max_block_retries=2))
+        self.assertEqual([b.block_num for b in blocks], list(range(1, 6)))
+        self.assertEqual([hv.rpc.batches for hv in instances], [[5], [5]])
+        # each block once, block 3 twice
+        self.assertEqual([c[0][0] for c in block.call_args_list], [1, 2, 3, 3, 4, 5])
+
+        with mock.patch("bhive.blockchain.Block", side_effect=RPCError("block failed")) as block:
+            with self.assertRaises(RPCError):
+                list(blockchain._prefetch_blocks(range(1, 6), pool, instances, batch_size=5, max_block_retries=2))
+        self.assertEqual(block.call_count, 2)
@@ -0,0 +1,86 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import os
+import shutil
+import tempfile
+import unittest
+from bhive import Hive
+from bhive.blockchain import Blockchain
+from bhive.blockarchive import BlockArchive
+from bhive.blocksource import MemoryBlockSource, FileBlockSource, ArchiveBlockSource
+from .blockfixtures import get_block
+
+
+class Testcases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.hv = Hive(offline=True)
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_memory_source(self):
+        source = MemoryBlockSource([get_block(n) for n in [12, 10, 11]], hive_instance=self.hv)
+        self.assertEqual(len(source), 3)
+        self.assertEqual(source.get_first_block_num(), 10)
+        self.assertEqual(source.get_current_block_num(), 12)
+        self.assertEqual(source.get_block(11).block_num, 11)
+        self.assertIsNone(source.get_block(13))
+        self.assertIsNone(source.get_block(11, only_virtual_ops=True))
+        self.assertEqual([b.block_num for b in source.blocks(11, 20)], [11, 12])
+
+        blockchain = Blockchain(hive_instance=self.hv, block_source=source)
+        self.assertEqual(blockchain.get_current_block_num(), 12)
+        self.assertEqual([b.block_num for b in blockchain.blocks()], [10, 11, 12])
+        ops = list(blockchain.stream(opNames=["transfer"], start=11))
+        self.assertEqual([op["block_num"] for op in ops], [11, 12])
+        ops_stat = blockchain.ops_statistics(10)
+        self.assertEqual(ops_stat["vote"], 3)
+        self.assertEqual(ops_stat["transfer"], 3)
+        tx = blockchain.awaitTxConfirmation({"signatures": ["%064x" % 11]})
+        self.assertEqual(tx["signatures"], ["%064x" % 11])
+
+    def test_block_source_parameter(self):
+        source = MemoryBlockSource([get_block(n) for n in range(1, 6)], hive_instance=self.hv)
+        blockchain = Blockchain(hive_instance=self.hv)
+        self.assertEqual([b.block_num for b in blockchain.blocks(start=2, stop=4, block_source=source)], [2, 3, 4])
+        ops = list(blockchain.stream(opNames=["vote"], block_source=source))
+        self.assertEqual(len(ops), 5)
+        ops_stat = blockchain.ops_statistics(3, block_source=source)
+        self.assertEqual(ops_stat["vote"], 3)
+
+    def test_file_source(self):
+        for filename in ["blocks.jsonl", "blocks.jsonl.gz", "blocks.pkl", "blocks.pkl.gz"]:
+            filename = os.path.join(self.path, filename)
+            blocks = MemoryBlockSource([get_block(n) for n in [5, 6, 7, 8, 9, 12]], hive_instance=self.hv).blocks(5, 12)
+            self.assertEqual(FileBlockSource.write(filename, blocks), 6)
+            source = FileBlockSource(filename, hive_instance=self.hv)
+            block = source.get_block(7)
+            self.assertEqual(block.block_num, 7)
+            self.assertEqual(block.json()["transactions"], get_block(7)["transactions"])
+            self.assertEqual(source.get_first_block_num(), 5)
+            self.assertEqual(source.get_current_block_num(), 12)
+            self.assertIsNone(source.get_block(10))
+            self.assertIsNone(source.get_block(13))
+            self.assertEqual(source.get_block(12).block_num, 12)
+            blockchain = Blockchain(hive_instance=self.hv, block_source=source)
+            self.assertEqual([b.block_num for b in blockchain.blocks(start=6, stop=8)], [6, 7, 8])
+            self.assertEqual([b.block_num for b in source.blocks(10, 20)], [12])
+            self.assertEqual(list(source.blocks(13, 20)), [])
+
+    def test_archive_source(self):
+        archive = BlockArchive(self.path)
+        for block_num in [3, 4, 6]:
+            archive.append(get_block(block_num))
+        source = ArchiveBlockSource(archive, hive_instance=self.hv)
+        self.assertEqual(source.get_first_block_num(), 3)
+        self.assertEqual(source.get_current_block_num(), 6)
+        blockchain = Blockchain(hive_instance=self.hv, block_source=source)
+        self.assertEqual([b.block_num for b in blockchain.blocks()], [3, 4, 6])
+        source.close()
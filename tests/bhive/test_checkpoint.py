@@ -0,0 +1,105 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import os
+import shutil
+import tempfile
+import unittest
+from bhive import Hive
+from bhive.blockchain import Blockchain
+from bhive.blocksource import MemoryBlockSource
+from bhive.checkpoint import Checkpoint, FileCheckpoint, SqliteCheckpoint
+from .blockfixtures import get_block
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_checkpoint(self):
+        checkpoint = Checkpoint()
+        self.assertIsNone(checkpoint.get_start_block())
+        self.assertFalse(checkpoint.is_processed(10, 0, 0))
+        checkpoint.set(10, 1, 2)
+        self.assertFalse(checkpoint.block_completed)
+        self.assertEqual(checkpoint.get_start_block(), 10)
+        self.assertTrue(checkpoint.is_processed(9, 5, 0))
+        self.assertTrue(checkpoint.is_processed(10, 1, 2))
+        self.assertTrue(checkpoint.is_processed(10, 0, 7))
+        self.assertFalse(checkpoint.is_processed(10, 1, 3))
+        self.assertFalse(checkpoint.is_processed(10, 2, 0))
+        self.assertFalse(checkpoint.is_processed(11, 0, 0))
+        checkpoint.set(10)
+        self.assertTrue(checkpoint.block_completed)
+        self.assertEqual(checkpoint.get_start_block(), 11)
+        self.assertTrue(checkpoint.is_processed(10, 5, 5))
+        checkpoint.reset()
+        self.assertIsNone(checkpoint.get_start_block())
+
+    def test_file_checkpoint(self):
+        filename = os.path.join(self.path, "checkpoint.json")
+        checkpoint = FileCheckpoint(filename, flush_interval=100, flush_count=2)
+        checkpoint.set(5, 0, 1)
+        self.assertFalse(os.path.isfile(filename))
+        checkpoint.set(5, 0, 2)
+        self.assertEqual(FileCheckpoint(filename).get_start_block(), 5)
+        checkpoint.set(6)
+        checkpoint.flush()
+        checkpoint = FileCheckpoint(filename)
+        self.assertEqual((checkpoint.block_num, checkpoint.trx_num, checkpoint.op_num), (6, None, None))
+        checkpoint.reset()
+        self.assertFalse(os.path.isfile(filename))
+
+    def test_sqlite_checkpoint(self):
+        filename = os.path.join(self.path, "checkpoint.db")
+        checkpoint = SqliteCheckpoint(filename, name="a", flush_count=1)
+        other = SqliteCheckpoint(filename, name="b", flush_count=1)
+        checkpoint.set(7, 3, 4)
+        other.set(100)
+        checkpoint = SqliteCheckpoint(filename, name="a")
+        self.assertEqual((checkpoint.block_num, checkpoint.trx_num, checkpoint.op_num), (7, 3, 4))
+        self.assertEqual(SqliteCheckpoint(filename, name="b").get_start_block(), 101)
+        checkpoint.reset()
+        self.assertIsNone(SqliteCheckpoint(filename, name="a").block_num)
+
+    def get_blockchain(self):
+        hv = Hive(offline=True)
+        source = MemoryBlockSource([get_block(n) for n in range(1, 6)], hive_instance=hv)
+        return Blockchain(hive_instance=hv, block_source=source)
+
+    def test_blocks_failed_block_is_repeated(self):
+        filename = os.path.join(self.path, "checkpoint.json")
+        blockchain = self.get_blockchain()
+        block_nums = []
+        with self.assertRaises(ValueError):
+            for block in blockchain.blocks(stop=5, checkpoint=FileCheckpoint(filename)):
+                if block.block_num == 3:
+                    raise ValueError("processing failed")
+                block_nums.append(block.block_num)
+        # the failed block is not stored as processed
+        self.assertEqual(FileCheckpoint(filename).get_start_block(), 3)
+        for block in blockchain.blocks(stop=5, checkpoint=FileCheckpoint(filename)):
+            block_nums.append(block.block_num)
+        self.assertEqual(block_nums, [1, 2, 3, 4, 5])
+
+    def test_stream_failed_op_is_repeated(self):
+        filename = os.path.join(self.path, "checkpoint.json")
+        blockchain = self.get_blockchain()
+        ops = []
+        stream = blockchain.stream(stop=5, checkpoint=FileCheckpoint(filename))
+        with self.assertRaises(ValueError):
+            for op in stream:
+                if op["block_num"] == 3 and op["type"] == "transfer":
+                    raise ValueError("processing failed")
+                ops.append((op["block_num"], op["type"]))
+        stream.close()
+        checkpoint = FileCheckpoint(filename)
+        self.assertEqual((checkpoint.block_num, checkpoint.trx_num, checkpoint.op_num), (3, 0, 0))
+        for op in blockchain.stream(stop=5, checkpoint=checkpoint):
+            ops.append((op["block_num"], op["type"]))
+        self.assertEqual(ops, [(n, t) for n in range(1, 6) for t in ["vote", "transfer"]])
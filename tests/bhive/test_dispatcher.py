@@ -0,0 +1,98 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import threading
+import unittest
+import mock
+from concurrent.futures import ThreadPoolExecutor
+from bhive import Hive
+from bhive.blockchain import Blockchain
+from bhive.blocksource import MemoryBlockSource
+from bhive.dispatcher import OperationDispatcher, involves_accounts, custom_json_ids
+from .blockfixtures import get_block
+
+
+def get_operations(block_num):
+    return [{"type": "vote_operation", "value": {"voter": "a%d" % block_num, "author": "b"}},
+            {"type": "transfer_operation", "value": {"from": "a%d" % block_num, "to": "c"}},
+            {"type": "custom_json_operation",
+             "value": {"id": "follow" if block_num % 2 else "other", "json": "[]",
+                       "required_auths": [], "required_posting_auths": ["d"]}}]
+
+
+def check_transfer(op):
+    if op["to"] != "c":
+        raise ValueError(op["to"])
+
+
+def fail_on_block_3(op):
+    if op["block_num"] == 3:
+        raise ValueError("block 3")
+
+
+class Testcases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.hv = Hive(offline=True)
+        cls.source = MemoryBlockSource([get_block(n, operations=get_operations(n)) for n in range(1, 11)], hive_instance=cls.hv)
+        cls.blockchain = Blockchain(hive_instance=cls.hv, block_source=cls.source)
+
+    def test_routing(self):
+        dispatcher = OperationDispatcher(self.blockchain)
+        votes = []
+        transfers = []
+        follows = []
+        dispatcher.register(votes.append, op_types=["vote_operation"])
+        dispatcher.register(transfers.append, op_types=["transfer"], predicate=involves_accounts(["a2", "a5"]))
+
+        @dispatcher.on("custom_json", predicate=custom_json_ids(["follow"]))
+        def on_follow(op):
+            follows.append(op["block_num"])
+
+        self.assertEqual(dispatcher.get_op_names(), ["custom_json", "transfer", "vote"])
+        self.assertEqual(dispatcher.run(), 30)
+        self.assertEqual(len(votes), 10)
+        self.assertEqual([op["block_num"] for op in transfers], [2, 5])
+        self.assertEqual(follows, [1, 3, 5, 7, 9])
+        self.assertEqual(dispatcher.handlers[1].count, 2)
+
+    def test_all_ops_and_views(self):
+        dispatcher = OperationDispatcher(self.blockchain)
+        ops = []
+        dispatcher.register(ops.append, predicate=involves_accounts(["d"]))
+        self.assertEqual(dispatcher.get_op_names(), [])
+        self.assertEqual(dispatcher.run(start=3, stop=4, op_views=True), 6)
+        self.assertEqual([op.type for op in ops], ["custom_json", "custom_json"])
+
+    def test_thread_handlers(self):
+        dispatcher = OperationDispatcher(self.blockchain, max_queue_size=2)
+        votes = []
+        dispatcher.register(lambda op: votes.append(op["block_num"]), op_types=["vote"], mode="thread")
+        self.assertEqual(dispatcher.run(), 10)
+        self.assertEqual(votes, list(range(1, 11)))
+        dispatcher.register(fail_on_block_3, op_types=["transfer"], mode="thread")
+        with self.assertRaises(ValueError):
+            dispatcher.run()
+
+    def test_process_handler(self):
+        dispatcher = OperationDispatcher(self.blockchain, process_workers=2)
+        dispatcher.register(check_transfer, op_types=["transfer"], mode="process")
+        self.assertEqual(dispatcher.run(), 10)
+        dispatcher = OperationDispatcher(self.blockchain, process_workers=2)
+        dispatcher.register(fail_on_block_3, op_types=["vote"], mode="process")
+        with self.assertRaises(ValueError):
+            dispatcher.run()
+
+    def test_process_handler_runs_in_parallel(self):
+        # a thread pool replaces the process pool, so that the handler can wait for its other calls
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_for_other_call(op):
+            barrier.wait()
+
+        dispatcher = OperationDispatcher(self.blockchain, process_workers=2)
+        dispatcher.register(wait_for_other_call, op_types=["transfer"], mode="process")
+        with mock.patch("bhive.dispatcher.ProcessPoolExecutor", ThreadPoolExecutor):
+            self.assertEqual(dispatcher.run(), 10)
@@ -0,0 +1,39 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import unittest
+from bhive import Hive
+from bhive.block import Block
+from bhive.blockchain import ForkTracker
+from .blockfixtures import get_block
+
+
+class Testcases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.hv = Hive(offline=True)
+
+    def block(self, block_num, fork="0", previous_fork="0"):
+        return Block(get_block(block_num, transactions=[], fork=fork, previous_fork=previous_fork), hive_instance=self.hv)
+
+    def test_fork_tracker(self):
+        tracker = ForkTracker(max_blocks=3)
+        self.assertIsNone(tracker.last_block_num)
+        for block_num in range(10, 15):
+            block = self.block(block_num)
+            self.assertTrue(tracker.is_continuous(block))
+            tracker.add(block)
+        self.assertEqual(tracker.last_block_num, 14)
+        self.assertEqual(len(tracker.blocks), 3)
+        self.assertIsNone(tracker.get_block_id(11))
+        self.assertEqual(tracker.get_block_id(13), "%08x" % 13 + "0" * 32)
+        self.assertFalse(tracker.is_continuous(self.block(15, "f", "f")))
+        self.assertTrue(tracker.is_continuous(self.block(15)))
+        removed = tracker.rollback(12)
+        self.assertEqual([b.block_num for b in removed], [14, 13])
+        self.assertEqual(tracker.last_block_num, 12)
+        # a gap resets the tracker
+        self.assertTrue(tracker.is_continuous(self.block(20, "f", "f")))
+        self.assertIsNone(tracker.last_block_num)
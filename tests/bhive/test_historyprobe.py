@@ -0,0 +1,50 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import unittest
+import mock
+from bhive import Hive
+from bhive.account import Account
+
+
+def get_history_batch(first, last):
+    """ Returns a replacement of Account._get_history_batch for an account with the
+        operations first..last, the operation n is stored in block 10 * n
+    """
+    def history_batch(indices):
+        results = []
+        for index in indices:
+            if index == -1:
+                index = last
+            if first <= index <= last:
+                results.append([[index, {"block": 10 * index, "timestamp": "2020-01-01T00:00:00"}]])
+            else:
+                results.append([])
+        return results
+    return history_batch
+
+
+class Testcases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.hv = Hive(offline=True)
+
+    def setUp(self):
+        Account._history_probe_cache.clear()
+
+    def test_empty_history(self):
+        account = Account({"name": "empty"}, hive_instance=self.hv)
+        with mock.patch.object(Account, "_get_history_batch", side_effect=get_history_batch(0, -1)):
+            self.assertEqual(account.estimate_virtual_op_nums([5, 50]), [0, 0])
+            self.assertEqual(account.estimate_virtual_op_num(5), 0)
+            self.assertIsNone(account._get_history_probe(3))
+
+    def test_pruned_history(self):
+        account = Account({"name": "pruned"}, hive_instance=self.hv)
+        with mock.patch.object(Account, "_get_history_batch", side_effect=get_history_batch(5, 100)):
+            self.assertIsNone(account._get_history_probe(0))
+            self.assertEqual(account._get_history_probe(7)[0], 70)
+            # the first received operation is the lower bound of the search
+            self.assertEqual(account.estimate_virtual_op_nums([10, 500, 2000], stop_diff=1), [0, 50, 100])
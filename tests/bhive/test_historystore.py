@@ -0,0 +1,104 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+from datetime import datetime
+from bhive import Hive
+from bhive.account import Account
+from bhive.historystore import AccountHistoryStore
+from bhive.vote import AccountVotes
+
+
+def get_op(index):
+    op = {"trx_id": "%040x" % index, "block": 10 * index + 1, "trx_in_block": 0, "op_in_trx": 0, "virtual_op": 0,
+          "timestamp": "2020-01-01T00:%02d:00" % index, "account": "bhive.app", "index": index, "_id": "%040x" % index}
+    if index % 2:
+        op.update({"type": "transfer", "from": "bhive.app", "to": "a%d" % index, "amount": "1.000 HIVE", "memo": ""})
+    else:
+        op.update({"type": "vote", "voter": "bhive.app", "author": "a%d" % index, "permlink": "p", "weight": 100})
+    return op
+
+
+class FakeAccount(dict):
+    """Returns the operations of get_op as account history"""
+    def __init__(self, name, hive_instance=None):
+        super(FakeAccount, self).__init__(name=name)
+
+    def virtual_op_count(self):
+        return 29
+
+    def history(self, start=None, **kwargs):
+        return iter([get_op(i) for i in range(start, 30)])
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.store = AccountHistoryStore(os.path.join(self.path, "history.sqlite"), hive_instance=Hive(offline=True))
+        self.store.add("bhive.app", [get_op(i) for i in range(20)])
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_add(self):
+        store = self.store
+        self.assertEqual(store.get_max_index("bhive.app"), 19)
+        self.assertIsNone(store.get_max_index("test"))
+        self.assertEqual(store.get_count("bhive.app"), 20)
+        store.add("test", [get_op(3)])
+        store.add("bhive.app", [get_op(3)])
+        self.assertEqual(store.get_count("bhive.app"), 20)
+        self.assertEqual(store.get_accounts(), ["bhive.app", "test"])
+        store.delete("test")
+        self.assertEqual(store.get_accounts(), ["bhive.app"])
+
+    def test_history(self):
+        store = self.store
+        ops = list(store.history("bhive.app"))
+        self.assertEqual(ops, [get_op(i) for i in range(20)])
+        ops = list(store.history("bhive.app", start=5, stop=8, use_block_num=False))
+        self.assertEqual([op["index"] for op in ops], [5, 6, 7, 8])
+        ops = list(store.history("bhive.app", start=51, stop=81, only_ops=["vote"]))
+        self.assertEqual([op["index"] for op in ops], [6, 8])
+        ops = list(store.history("bhive.app", start=datetime(2020, 1, 1, 0, 17, 0), exclude_ops=["vote"]))
+        self.assertEqual([op["index"] for op in ops], [17, 19])
+
+    def test_history_reverse(self):
+        store = self.store
+        ops = list(store.history_reverse("bhive.app", start=8, stop=5, use_block_num=False))
+        self.assertEqual([op["index"] for op in ops], [8, 7, 6, 5])
+        ops = list(store.history_reverse("bhive.app", stop=datetime(2020, 1, 1, 0, 16, 0), only_ops=["transfer"]))
+        self.assertEqual([op["index"] for op in ops], [19, 17])
+
+    def test_sync_stops_at_last_irreversible_block(self):
+        store = self.store
+        props = {"last_irreversible_block_num": 251}
+        with mock.patch("bhive.historystore.Account", FakeAccount), \
+                mock.patch.object(store.hive, "get_dynamic_global_properties", return_value=props):
+            # operations 26..29 are in reversible blocks
+            self.assertEqual(store.sync("bhive.app"), 6)
+            self.assertEqual(store.get_max_index("bhive.app"), 25)
+            props["last_irreversible_block_num"] = 300
+            self.assertEqual(store.sync("bhive.app"), 4)
+            self.assertEqual(store.get_max_index("bhive.app"), 29)
+            self.assertEqual(store.sync("bhive.app"), 0)
+
+    def test_account_votes(self):
+        store = self.store
+        revote = get_op(20)
+        revote.update({"author": "a2", "weight": 0})
+        other_voter = get_op(21)
+        other_voter.update({"type": "vote", "voter": "a0", "author": "bhive.app", "permlink": "p", "weight": 100})
+        store.add("bhive.app", [revote, other_voter])
+        account = Account({"name": "bhive.app"}, hive_instance=store.hive)
+        with mock.patch.object(store, "sync"):
+            votes = AccountVotes(account, hive_instance=store.hive, history_store=store)
+        # the vote on a2 was replaced by the removal of the vote
+        self.assertEqual([vote["author"] for vote in votes], ["a0", "a4", "a6", "a8", "a10", "a12", "a14", "a16", "a18", "a2"])
+        self.assertEqual(votes[-1]["percent"], 0)
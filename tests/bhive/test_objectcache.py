@@ -75,3 +75,40 @@ class Testcases(unittest.TestCase):
         self.assertEqual(len(list(cache)), 1)
         # Get
         self.assertEqual(cache.get("foo", "New"), "New")
+
+    def test_cache_max_entries(self):
+        cache = ObjectCache(default_expiration=10, max_entries=3)
+        for i in range(3):
+            cache[i] = i
+        self.assertEqual(cache[0], 0)
+        cache[3] = 3
+        self.assertNotIn(1, cache)
+        self.assertIn(0, cache)
+        self.assertEqual(len(cache), 3)
+        stats = cache.get_stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(cache.get(1, "New"), "New")
+        self.assertEqual(cache.get_stats()["misses"], 1)
+
+    def test_cache_max_bytes(self):
+        cache = ObjectCache(default_expiration=10, max_bytes=100)
+        cache["foo"] = "a" * 40
+        cache["foo2"] = "b" * 40
+        self.assertEqual(len(cache), 2)
+        cache["foo3"] = "c" * 40
+        self.assertNotIn("foo", cache)
+        self.assertTrue(cache.n_bytes <= 100)
+        del cache["foo2"]
+        self.assertEqual(len(cache), 1)
+
+    def test_cache_class_expiration(self):
+        cache = ObjectCache(default_expiration=10, class_expirations={"Account": 1})
+        cache["foo"] = Account("test", lazy=True, hive_instance=Hive(offline=True))
+        cache["foo2"] = "bar"
+        self.assertEqual(cache.get_expiration(cache["foo"]), 1)
+        time.sleep(2)
+        self.assertNotIn("foo", cache)
+        self.assertIn("foo2", cache)
+        cache.set_expiration(1, klass=str)
+        self.assertEqual(cache.get_expiration("bar"), 1)
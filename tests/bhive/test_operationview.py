@@ -0,0 +1,63 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import unittest
+from bhive import Hive
+from bhive.block import Block
+from bhive.blockchain import Blockchain, OperationView
+from bhive.blocksource import MemoryBlockSource
+from .blockfixtures import get_block
+
+
+def get_operations(block_num):
+    return [{"type": "vote_operation", "value": {"voter": "a%d" % block_num, "weight": 100}},
+            {"type": "transfer_operation", "value": {"from": "a", "to": "b"}}]
+
+
+class Testcases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.hv = Hive(offline=True)
+        cls.source = MemoryBlockSource([get_block(n, operations=get_operations(n)) for n in range(1, 4)], hive_instance=cls.hv)
+
+    def test_stream_op_views(self):
+        blockchain = Blockchain(hive_instance=self.hv, block_source=self.source)
+        ops = list(blockchain.stream(opNames=["vote"]))
+        views = list(blockchain.stream(opNames=["vote"], op_views=True))
+        self.assertEqual(len(views), 3)
+        self.assertEqual([view.as_dict() for view in views], ops)
+        view = views[1]
+        self.assertTrue(isinstance(view, OperationView))
+        self.assertEqual(view.type, "vote")
+        self.assertEqual(view.block_num, 2)
+        self.assertEqual(view.trx_num, 0)
+        self.assertEqual(view.trx_id, "%040x" % 2)
+        self.assertEqual(view["voter"], "a2")
+        self.assertEqual(view["timestamp"], ops[1]["timestamp"])
+        self.assertIn("weight", view)
+        self.assertIsNone(view.get("from"))
+        self.assertEqual(sorted(view.keys()), sorted(ops[1].keys()))
+        with self.assertRaises(AttributeError):
+            view.memo = ""
+
+    def test_lazy_id(self):
+        block = self.source.get_block(1)
+        view = list(Blockchain.block_operations(block, opNames=["transfer"], op_views=True))[0]
+        self.assertIsNone(view._hash)
+        self.assertEqual(view["_id"], Blockchain.hash_op(block["transactions"][0]["operations"][1]))
+        self.assertEqual(view._hash, view._id)
+        # The operation data is not copied
+        self.assertTrue(view.op is block["transactions"][0]["operations"][1]["value"])
+
+    def test_virtual_op_views(self):
+        vop = {"trx_id": "0" * 40, "block": 3, "trx_in_block": 4294967295, "op_in_trx": 0, "virtual_op": 1,
+               "timestamp": "2020-01-01T00:00:09",
+               "op": {"type": "producer_reward_operation", "value": {"producer": "w"}}}
+        block = Block({"block": 3, "timestamp": "2020-01-01T00:00:09", "operations": [vop]}, only_ops=True, hive_instance=self.hv)
+        view = list(Blockchain.block_operations(block, op_views=True))[0]
+        op = list(Blockchain.block_operations(block))[0]
+        self.assertEqual(view.as_dict(), op)
+        self.assertEqual(view.type, "producer_reward")
+        self.assertEqual(view.block_num, 3)
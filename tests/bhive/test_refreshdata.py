@@ -0,0 +1,129 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import time
+import unittest
+import mock
+from bhive import Hive
+
+
+class FakeRPC(object):
+    """ Answers the calls of refresh_data, the calls with add_to_queue are
+        answered together with the next call
+    """
+    def __init__(self, head_block=1, batch=True):
+        self.url = "https://a"
+        self.user = None
+        self.password = None
+        self.head_block = head_block
+        self.batch = batch
+        self.rpc_queue = []
+        self.requests = []
+
+    def get_use_appbase(self):
+        return True
+
+    def set_next_node_on_empty_reply(self, next_node_on_empty_reply=True):
+        pass
+
+    def get_network(self, props=None):
+        return {"chain_id": "0" * 64}
+
+    def get_result(self, name):
+        if name == "get_dynamic_global_properties":
+            return {"head_block_number": self.head_block}
+        elif name == "get_reward_funds":
+            return {"funds": [{"name": "post"}]}
+        return {"name": name}
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            if kwargs.get("add_to_queue", False):
+                self.rpc_queue.append(name)
+                return None
+            names = self.rpc_queue + [name]
+            self.rpc_queue = []
+            self.requests.append(names)
+            if len(names) > 1:
+                if not self.batch:
+                    raise Exception("batched calls are not supported")
+                return [self.get_result(n) for n in names]
+            return self.get_result(name)
+        return method
+
+
+class Testcases(unittest.TestCase):
+
+    def get_hive(self, rpc, **kwargs):
+        hv = Hive(offline=True, **kwargs)
+        hv.offline = False
+        hv.rpc = rpc
+        return hv
+
+    def test_refresh_data_batched(self):
+        rpc = FakeRPC()
+        hv = self.get_hive(rpc)
+        hv.refresh_data()
+        self.assertEqual(len(rpc.requests), 1)
+        self.assertEqual(len(rpc.requests[0]), 6)
+        self.assertEqual(hv.data["dynamic_global_properties"], {"head_block_number": 1})
+        self.assertEqual(hv.data["reward_funds"], {"name": "post"})
+        self.assertEqual(hv.data["get_feed_history"], hv.data["feed_history"])
+        self.assertEqual(hv.data["last_node"], "https://a")
+        hv.refresh_data()
+        self.assertEqual(len(rpc.requests), 1)
+        hv.refresh_data(force_refresh=True)
+        self.assertEqual(len(rpc.requests), 2)
+
+    def test_refresh_data_without_batch(self):
+        rpc = FakeRPC(batch=False)
+        hv = self.get_hive(rpc)
+        hv.refresh_data()
+        # the failed batch and one call for each parameter
+        self.assertEqual(len(rpc.requests), 7)
+        self.assertEqual(hv.data["dynamic_global_properties"], {"head_block_number": 1})
+        self.assertEqual(hv.data["reward_funds"], {"name": "post"})
+
+    def test_refresh_data_node_change(self):
+        rpc = FakeRPC()
+        hv = self.get_hive(rpc)
+        hv.refresh_data()
+        # threads which share the rpc are connected to different nodes
+        rpc.url = "https://b"
+        hv.refresh_data()
+        self.assertEqual(len(rpc.requests), 1)
+        # a new rpc instance refreshes the data
+        hv.rpc = FakeRPC(head_block=2)
+        hv.refresh_data()
+        self.assertEqual(hv.data["dynamic_global_properties"], {"head_block_number": 2})
+
+    def wait_for_head_block(self, hv, head_block):
+        for i in range(200):
+            if hv.data["dynamic_global_properties"]["head_block_number"] == head_block:
+                return
+            time.sleep(0.01)
+
+    def test_background_data_refresh(self):
+        background_rpc = FakeRPC(head_block=2)
+        hv = self.get_hive(FakeRPC(), background_data_refresh=True, data_refresh_time_seconds=0.05)
+        hv.rpc.nodes = mock.Mock(export_working_nodes=lambda: ["https://a"])
+        hv.rpc.num_retries = hv.rpc.num_retries_call = hv.rpc.timeout = 1
+        hv.rpc.use_condenser = False
+        with mock.patch("bhive.hive.HiveNodeRPC", return_value=background_rpc):
+            hv.refresh_data()
+            self.assertEqual(hv.data["dynamic_global_properties"], {"head_block_number": 1})
+            self.wait_for_head_block(hv, 2)
+            hv.stop_background_data_refresh()
+            self.assertEqual(hv.data["dynamic_global_properties"], {"head_block_number": 2})
+            # stale data does not refresh on the rpc of the caller, a new thread refreshes it
+            background_rpc.head_block = 3
+            time.sleep(0.06)
+            hv.get_dynamic_global_properties()
+            self.wait_for_head_block(hv, 3)
+            hv.stop_background_data_refresh()
+        self.assertEqual(hv.data["dynamic_global_properties"], {"head_block_number": 3})
+        self.assertEqual(len(hv.rpc.requests), 1)
@@ -18,10 +18,12 @@ from bhive.utils import (
     remove_from_dict,
     formatToTimeStamp,
     formatTimeString,
+    parse_time,
     addTzInfo,
     derive_beneficiaries,
     derive_tags,
-    seperate_yaml_dict_from_body
+    seperate_yaml_dict_from_body,
+    windowed_map
 )
 
 
@@ -113,6 +115,18 @@ class Testcases(unittest.TestCase):
         t2 = addTzInfo(datetime(2018, 7, 10, 10, 8, 39))
         self.assertEqual(t, t2)
 
+    def test_parse_time(self):
+        for t in ["1970-01-01T00:00:00", "2018-07-10T10:08:39", "2020-02-29T23:59:59"]:
+            t2 = addTzInfo(datetime.strptime(t, "%Y-%m-%dT%H:%M:%S"))
+            self.assertEqual(formatTimeString(t), t2)
+            self.assertEqual(parse_time(t), t2)
+            self.assertEqual(formatTimeString(t).tzinfo, t2.tzinfo)
+            self.assertEqual(formatTimeString(t2), t)
+        self.assertEqual(formatTimeString(date(2018, 7, 10)), "2018-07-10T00:00:00")
+        for t in ["2018-13-10T10:08:39", "2018-07-10 10:08:39", "2018-07-10T10:08", "2018-07-1xT10:08:39"]:
+            with self.assertRaises(ValueError):
+                formatTimeString(t)
+
     def test_derive_beneficiaries(self):
         t = "bhive.app:10"
         b = derive_beneficiaries(t)
@@ -150,3 +164,22 @@ class Testcases(unittest.TestCase):
         body, par = seperate_yaml_dict_from_body(t)
         self.assertEqual(par, {"par1": "data1", "par2": "data2", "par3": 3})
         self.assertEqual(body, "\n test ---")
+
+    def test_windowed_map(self):
+        submitted = []
+
+        def submit(item):
+            submitted.append(item)
+            return item
+
+        results = windowed_map(submit, range(10), 3, result=lambda task: task * 2)
+        self.assertEqual(submitted, [])
+        self.assertEqual(next(results), 0)
+        # the next item is submitted before the result is yielded
+        self.assertEqual(submitted, [0, 1, 2, 3])
+        self.assertEqual(list(results), [2 * i for i in range(1, 10)])
+        cancelled = []
+        results = windowed_map(submit, range(10), 3, result=lambda task: task, cancel=cancelled.append)
+        self.assertEqual(next(results), 0)
+        results.close()
+        self.assertEqual(cancelled, [1, 2, 3])
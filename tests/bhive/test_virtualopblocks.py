@@ -0,0 +1,55 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import unittest
+import mock
+from bhive import Hive
+from bhive.block import Block
+from bhive.blockchain import Blockchain
+
+
+class Testcases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.hv = Hive(offline=True)
+
+    def get_ops(self, start, stop):
+        return dict((n, [{"block": n, "timestamp": "2020-01-01T00:00:00", "op": ["producer_reward", {}]}])
+                    for n in range(start, stop + 1))
+
+    def wait_for_block(self, block_num, **kwargs):
+        return Block({"block": block_num, "timestamp": "2020-01-01T00:00:00", "operations": []},
+                     only_virtual_ops=True, hive_instance=self.hv)
+
+    def test_virtual_op_blocks_above_lib(self):
+        blockchain = Blockchain(hive_instance=self.hv)
+        props = {"last_irreversible_block_num": 15, "head_block_number": 30}
+        with mock.patch.object(Hive, "get_dynamic_global_properties", return_value=props), \
+                mock.patch.object(Blockchain, "_enum_virtual_ops_supported", return_value=True), \
+                mock.patch.object(Blockchain, "enum_virtual_ops", side_effect=self.get_ops) as enum_virtual_ops, \
+                mock.patch.object(Blockchain, "wait_for_and_get_block", side_effect=self.wait_for_block) as wait_for_and_get_block:
+            blocks = list(blockchain.virtual_op_blocks(1, 20, block_range=10))
+        self.assertEqual([b.block_num for b in blocks], list(range(1, 21)))
+        # only irreversible blocks are received by enum_virtual_ops
+        self.assertEqual(enum_virtual_ops.call_args_list, [mock.call(1, 10), mock.call(11, 15)])
+        self.assertEqual([c[0][0] for c in wait_for_and_get_block.call_args_list], list(range(16, 21)))
+        self.assertEqual(len(blocks[14].operations), 1)
+
+    def test_blocks_virtual_op_range_is_opt_in(self):
+        blockchain = Blockchain(hive_instance=self.hv)
+        props = {"last_irreversible_block_num": 15, "head_block_number": 30}
+        with mock.patch.object(Hive, "get_dynamic_global_properties", return_value=props), \
+                mock.patch.object(Blockchain, "get_current_block", return_value=mock.Mock(block_num=30)), \
+                mock.patch.object(Blockchain, "_enum_virtual_ops_supported", return_value=True), \
+                mock.patch.object(Blockchain, "enum_virtual_ops", side_effect=self.get_ops) as enum_virtual_ops, \
+                mock.patch.object(Blockchain, "wait_for_and_get_block", side_effect=self.wait_for_block) as wait_for_and_get_block:
+            blocks = list(blockchain.blocks(start=1, stop=5, only_virtual_ops=True))
+            self.assertEqual([b.block_num for b in blocks], list(range(1, 6)))
+            # get_ops_in_block is called for each block by default
+            self.assertEqual(enum_virtual_ops.call_count, 0)
+            self.assertEqual(wait_for_and_get_block.call_count, 5)
+            blocks = list(blockchain.blocks(start=1, stop=5, only_virtual_ops=True, virtual_op_range=10))
+            self.assertEqual([b.block_num for b in blocks], list(range(1, 6)))
+            self.assertEqual(enum_virtual_ops.call_args_list, [mock.call(1, 5)])
@@ -7,7 +7,7 @@ import unittest
 from parameterized import parameterized
 from pprint import pprint
 from bhive import Hive
-from bhive.witness import Witness, Witnesses, WitnessesVotedByAccount, WitnessesRankedByVote
+from bhive.witness import Witness, Witnesses, WitnessesVotedByAccount, WitnessesRankedByVote, GetWitnesses
 from bhive.instance import set_shared_hive_instance
 from bhive.nodelist import NodeList
 
@@ -94,6 +94,16 @@ class Testcases(unittest.TestCase):
         self.assertTrue(len(w) > 0)
         self.assertTrue(isinstance(w[0], Witness))
 
+    def test_GetWitnesses(self):
+        bts = self.bts
+        names = ["gtg", "ausbitbank", "blocktrades", "good-karma"]
+        w = GetWitnesses(names, batch_limit=2, threading=True, hive_instance=bts)
+        self.assertEqual([x["owner"] for x in w], names)
+        self.assertTrue(isinstance(w[0], Witness))
+        w = GetWitnesses(names, batch_limit=2, raw_data=True, hive_instance=bts)
+        self.assertEqual([x["owner"] for x in w], names)
+        self.assertFalse(isinstance(w[0], Witness))
+
     @parameterized.expand([
         ("normal"),
         ("hiveio"),
@@ -0,0 +1,39 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import unittest
+from bhive import Hive
+from bhive.workerpool import WorkerPool
+
+
+class Testcases(unittest.TestCase):
+
+    def test_submit_and_map(self):
+        hv = Hive(offline=True)
+        pool = WorkerPool(hv, max_workers=4)
+        self.assertEqual(pool.submit(lambda a, b: a + b, 1, b=2).result(), 3)
+        self.assertEqual(list(pool.map(lambda x: x * x, range(20))), [x * x for x in range(20)])
+        self.assertEqual(list(pool.map(lambda x: x, range(5), window=1)), list(range(5)))
+        pool.shutdown()
+        with self.assertRaises(RuntimeError):
+            pool.submit(lambda: None)
+
+    def test_resize(self):
+        hv = Hive(offline=True)
+        pool = WorkerPool(hv, max_workers=2)
+        pool.resize(1)
+        self.assertEqual(pool.max_workers, 2)
+        pool.resize(6)
+        self.assertEqual(pool.max_workers, 6)
+        self.assertEqual(list(pool.map(lambda x: x + 1, range(10))), list(range(1, 11)))
+        pool.shutdown()
+
+    def test_hive_worker_pool(self):
+        hv = Hive(offline=True)
+        pool = hv.get_worker_pool(2)
+        self.assertIs(hv.get_worker_pool(4), pool)
+        self.assertEqual(pool.max_workers, 4)
+        hv.close_worker_pool()
+        self.assertIsNot(hv.get_worker_pool(), pool)
+        hv.close_worker_pool()
@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+
+class NodeError(Exception):
+    """Is returned by the fake node as json rpc error"""
+    pass
+
+
+class FakeResponse(object):
+    def __init__(self, session, url, data):
+        self.session = session
+        self.url = url
+        self.data = data
+        self.status = 200
+        self._text = None
+
+    async def __aenter__(self):
+        payload = json.loads(self.data.decode("utf8"))
+        if isinstance(payload, list):
+            replies = []
+            for query in payload:
+                replies.append(await self.session.answer(self.url, query))
+            self._text = json.dumps(replies)
+        else:
+            self._text = json.dumps(await self.session.answer(self.url, payload))
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def text(self):
+        return self._text
+
+
+class FakeSession(object):
+    """ Replaces the aiohttp session, the posted json rpc queries are answered
+        by ``handlers[url](method, params)``. A raised NodeError is returned as
+        json rpc error, other exceptions are raised by the post.
+    """
+    def __init__(self, handlers):
+        self.handlers = handlers
+        self.closed = False
+        self.requests = []
+        self.running = 0
+        self.max_running = 0
+
+    async def answer(self, url, query):
+        self.requests.append((url, query["method"]))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            result = self.handlers[url](query["method"], query.get("params"))
+            if asyncio.iscoroutine(result):
+                result = await result
+        except NodeError as e:
+            return {"jsonrpc": "2.0", "error": {"message": str(e)}, "id": query["id"]}
+        finally:
+            self.running -= 1
+        return {"jsonrpc": "2.0", "result": result, "id": query["id"]}
+
+    def post(self, url, data=None, headers=None, timeout=None, auth=None):
+        return FakeResponse(self, url, data)
+
+    async def close(self):
+        self.closed = True
+
+
+def run(coro):
+    """Runs the coroutine on a new event loop"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
@@ -0,0 +1,103 @@
+# This Python file uses the following encoding: utf-8
+import asyncio
+import unittest
+import aiohttp
+from bhiveapi.asynchivenoderpc import AsyncHiveNodeRPC
+from .aiohttpfixtures import FakeSession, NodeError, run
+
+
+class Testcases(unittest.TestCase):
+
+    def get_rpc(self, handlers, **kwargs):
+        rpc = AsyncHiveNodeRPC(list(handlers.keys()), disable_chain_detection=True, **kwargs)
+        rpc.session = FakeSession(handlers)
+        return rpc
+
+    def test_concurrent_calls(self):
+        async def node(method, params):
+            # later blocks answer faster
+            await asyncio.sleep(0.001 * (10 - params["block_num"]))
+            return {"block_num": params["block_num"]}
+
+        rpc = self.get_rpc({"https://a": node})
+
+        async def main():
+            return await asyncio.gather(*[rpc.get_block({"block_num": i}, api="block") for i in range(10)])
+
+        results = run(main())
+        self.assertEqual([r["block_num"] for r in results], list(range(10)))
+        self.assertGreater(rpc.session.max_running, 1)
+        self.assertEqual(rpc.connection_cnt, 1)
+
+    def test_retry_is_counted_per_call(self):
+        failed = []
+
+        async def node(method, params):
+            await asyncio.sleep(0.01)
+            if params["block_num"] == 0 and len(failed) == 0:
+                failed.append(0)
+                raise NodeError("Internal Error")
+            return {"block_num": params["block_num"]}
+
+        rpc = self.get_rpc({"https://a": node, "https://b": node}, num_retries_call=2)
+
+        async def main():
+            return await asyncio.gather(*[rpc.get_block({"block_num": i}, api="block") for i in range(10)])
+
+        results = run(main())
+        self.assertEqual([r["block_num"] for r in results], list(range(10)))
+        # a single error of one call does not move the other calls to the next node
+        self.assertEqual(rpc.connection_cnt, 1)
+        self.assertEqual(set(url for url, method in rpc.session.requests), {"https://a"})
+
+    def test_call_retries(self):
+        def node(method, params):
+            raise NodeError("Internal Error")
+
+        rpc = self.get_rpc({"https://a": node}, num_retries_call=1)
+        # as in HiveNodeRPC, the call gives up after num_retries_call tries
+        self.assertIsNone(run(rpc.get_block({"block_num": 1}, api="block")))
+        self.assertEqual(len(rpc.session.requests), 1)
+
+    def test_failover(self):
+        def broken(method, params):
+            raise aiohttp.ClientConnectionError("refused")
+
+        def empty(method, params):
+            return {}
+
+        def node(method, params):
+            return {"head_block_number": 10}
+
+        rpc = self.get_rpc({"https://a": broken, "https://b": node}, num_retries=5)
+        self.assertEqual(run(rpc.get_dynamic_global_properties(api="database")), {"head_block_number": 10})
+        self.assertEqual(rpc.url, "https://b")
+
+        rpc = self.get_rpc({"https://a": empty, "https://b": node}, num_retries=5)
+        # the empty reply is returned, when next_node_on_empty_reply is not set for the call
+        self.assertEqual(run(rpc.get_dynamic_global_properties(api="database")), {})
+        self.assertEqual(rpc.url, "https://a")
+        props = run(rpc.get_dynamic_global_properties(api="database", next_node_on_empty_reply=True))
+        self.assertEqual(props, {"head_block_number": 10})
+        self.assertEqual(rpc.url, "https://b")
+
+    def test_queue_per_task(self):
+        async def node(method, params):
+            await asyncio.sleep(0.001)
+            return {"block_num": params["block_num"]}
+
+        rpc = self.get_rpc({"https://a": node})
+
+        async def batch(block_nums):
+            for block_num in block_nums[:-1]:
+                await rpc.get_block({"block_num": block_num}, api="block", add_to_queue=True)
+                await asyncio.sleep(0.001)
+            return await rpc.get_block({"block_num": block_nums[-1]}, api="block")
+
+        async def main():
+            return await asyncio.gather(batch([1, 2, 3]), batch([11, 12, 13]))
+
+        results = run(main())
+        # the queued calls of one task are not sent by the other task
+        self.assertEqual([[r["block_num"] for r in result] for result in results], [[1, 2, 3], [11, 12, 13]])
+        self.assertEqual(len(rpc.session.requests), 6)
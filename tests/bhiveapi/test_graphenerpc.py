@@ -0,0 +1,73 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import threading
+import time
+import unittest
+import mock
+from bhiveapi.graphenerpc import GrapheneRPC
+
+
+class Testcases(unittest.TestCase):
+
+    def get_rpc(self, delays):
+        rpc = GrapheneRPC(list(delays.keys()), autoconnect=False, hedge_requests=True, hedge_delay=0.05)
+        rpc.url = "https://a"
+        rpc.current_rpc = rpc.rpc_methods["appbase"]
+
+        rpc.sent = []
+
+        def request_send(payload, url=None, session=None):
+            rpc.sent.append((url, session, threading.current_thread()))
+            time.sleep(delays[url])
+            return mock.Mock(text='{"result": "%s"}' % url, json=lambda: {"result": url})
+
+        rpc.request_send = request_send
+        return rpc
+
+    def test_hedged_request_latency(self):
+        query = {"jsonrpc": "2.0", "method": "block_api.get_block", "params": {"block_num": 1}, "id": 1}
+        rpc = self.get_rpc({"https://a": 0.5, "https://b": 0.})
+        self.assertEqual(rpc.rpcexec(query), "https://b")
+        # the latency is only recorded for the node which answered
+        self.assertIsNone(rpc.nodes.get_node("https://a").latency)
+        self.assertLess(rpc.nodes.get_node("https://b").latency, 0.5)
+
+        rpc = self.get_rpc({"https://a": 0., "https://b": 0.})
+        self.assertEqual(rpc.rpcexec(query), "https://a")
+        self.assertIsNotNone(rpc.nodes.get_node("https://a").latency)
+        self.assertIsNone(rpc.nodes.get_node("https://b").latency)
+
+    def test_hedge_pool_is_created_once(self):
+        rpc = self.get_rpc({"https://a": 0., "https://b": 0.})
+        pools = []
+
+        def worker():
+            rpc.url = "https://a"
+            rpc.hedged_request_send(b"{}")
+            pools.append(rpc._hedge_pool)
+
+        threads = [threading.Thread(target=worker) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(pools), 8)
+        self.assertEqual(len(set(id(pool) for pool in pools)), 1)
+
+    def test_hedged_request_sessions(self):
+        query = {"jsonrpc": "2.0", "method": "block_api.get_block", "params": {"block_num": 1}, "id": 1}
+        rpc = self.get_rpc({"https://a": 0.2, "https://b": 0.})
+        rpc.session = mock.Mock()
+        self.assertEqual(rpc.rpcexec(query), "https://b")
+        self.assertEqual(rpc.rpcexec(query), "https://b")
+        self.assertEqual(len(rpc.sent), 4)
+        threads = {}
+        for url, session, thread in rpc.sent:
+            # the session of the caller is not used by the pool threads
+            self.assertIsNotNone(session)
+            self.assertIsNot(session, rpc.session)
+            # a session is only used by a single thread
+            self.assertIs(threads.setdefault(id(session), thread), thread)
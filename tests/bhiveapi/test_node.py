@@ -5,6 +5,7 @@ from __future__ import print_function
 from __future__ import unicode_literals
 import pytest
 import unittest
+import threading
 from bhiveapi.node import Nodes
 from bhiveapi.rpcutils import (
     is_network_appbase_ready,
@@ -54,3 +55,116 @@ class Testcases(unittest.TestCase):
         nodes = Nodes(["a", "b", "c"], 5, 5)
         nodes2 = Nodes(nodes, 5, 5)
         self.assertEqual(nodes.url, nodes2.url)
+
+    def test_node_stats(self):
+        nodes = Nodes(["a", "b", "c"], 5, 5)
+        next(nodes)
+        nodes.record_latency(1.)
+        nodes.record_latency(2.)
+        self.assertAlmostEqual(nodes.node.latency, 1.3)
+        self.assertEqual(nodes.node.request_cnt, 2)
+        self.assertEqual(nodes.node.error_rate, 0)
+        nodes.increase_error_cnt()
+        self.assertAlmostEqual(nodes.node.error_rate, 0.3)
+        nodes.set_head_block(100)
+        self.assertEqual(nodes.node.head_block, 100)
+        self.assertEqual(nodes.node.get_latency_percentile(100), 2.)
+        stats = nodes.get_node_stats()
+        self.assertEqual(len(stats), 3)
+        self.assertEqual(stats[0]["url"], "a")
+        self.assertEqual(stats[0]["head_block"], 100)
+        self.assertFalse(stats[0]["lagging"])
+
+    def test_next_prefers_fast_nodes(self):
+        nodes = Nodes(["a", "b", "c", "d"], 5, 5)
+        for latency in [0.5, 2., 0.1, 0.2]:
+            next(nodes)
+            nodes.record_latency(latency)
+        self.assertEqual(nodes.url, "d")
+        next(nodes)
+        self.assertEqual(nodes.url, "c")
+        next(nodes)
+        self.assertEqual(nodes.url, "d")
+        # c becomes unhealthy
+        nodes.get_node("c").update_error()
+        nodes.get_node("c").update_error()
+        next(nodes)
+        self.assertEqual(nodes.url, "a")
+
+    def test_next_skips_lagging_nodes(self):
+        nodes = Nodes(["a", "b", "c"], 5, 5)
+        for latency, head_block in [(0.5, 1000), (0.1, 900), (0.3, 1000)]:
+            next(nodes)
+            nodes.record_latency(latency)
+            nodes.set_head_block(head_block)
+        self.assertTrue(nodes.is_lagging(nodes.get_node("b")))
+        next(nodes)
+        self.assertEqual(nodes.url, "a")
+        next(nodes)
+        self.assertEqual(nodes.url, "c")
+
+    def test_get_alternative_node(self):
+        nodes = Nodes(["a", "b", "c"], 5, 5)
+        next(nodes)
+        self.assertEqual(nodes.get_alternative_node().url, "b")
+        nodes.get_node("b").update_latency(1.)
+        nodes.get_node("c").update_latency(0.5)
+        self.assertEqual(nodes.get_alternative_node().url, "c")
+        self.assertEqual(nodes.url, "a")
+        nodes = Nodes(["a"], 5, 5)
+        self.assertIsNone(nodes.get_alternative_node())
+
+    def test_thread_state(self):
+        nodes = Nodes(["a", "b"], 5, 5)
+        next(nodes)
+        nodes.increase_error_cnt_call()
+        result = {}
+
+        def worker():
+            result["url"] = nodes.url
+            result["error_cnt_call"] = nodes.error_cnt_call
+            next(nodes)
+            next(nodes)
+            nodes.increase_error_cnt_call()
+            nodes.increase_error_cnt_call()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertEqual(result["error_cnt_call"], 0)
+        self.assertEqual(nodes.url, "a")
+        self.assertEqual(nodes.error_cnt_call, 1)
+
+    def test_next_probes_unmeasured_node_once(self):
+        nodes = Nodes(["a", "b"], 5, 5)
+        next(nodes)
+        nodes.record_latency(0.1)
+        result = {}
+
+        def worker():
+            next(nodes)
+            result["url"] = nodes.url
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertEqual(result["url"], "b")
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertEqual(result["url"], "a")
+
+    def test_is_node_switch_needed(self):
+        nodes = Nodes(["a", "b"], 5, 5)
+        self.assertFalse(nodes.is_node_switch_needed())
+        next(nodes)
+        nodes.record_latency(1.)
+        nodes.get_node("b").update_latency(0.5)
+        self.assertFalse(nodes.is_node_switch_needed())
+        nodes.get_node("b").latency = 0.01
+        self.assertTrue(nodes.is_node_switch_needed(latency_factor=4))
+        self.assertFalse(nodes.is_node_switch_needed(latency_factor=1000))
+        nodes.get_node("a").latency = 0.001
+        for i in range(3):
+            nodes.get_node("a").update_error()
+        self.assertTrue(nodes.is_node_switch_needed(latency_factor=1000))
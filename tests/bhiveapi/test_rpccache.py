@@ -0,0 +1,62 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import os
+import shutil
+import tempfile
+import unittest
+from bhiveapi.rpccache import RPCCache, get_block_num_of_query, get_query_method_and_params
+from bhiveapi.rpcutils import get_query
+
+
+class Testcases(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_get_block_num_of_query(self):
+        self.assertEqual(get_block_num_of_query("get_block", {"block_num": 10}), 10)
+        self.assertEqual(get_block_num_of_query("get_block", [10]), 10)
+        self.assertEqual(get_block_num_of_query("get_ops_in_block", [10, False]), 10)
+        self.assertEqual(get_block_num_of_query("get_block_range", {"starting_block_num": 10, "count": 5}), 14)
+        self.assertEqual(get_block_num_of_query("enum_virtual_ops", {"block_range_begin": 10, "block_range_end": 12}), 11)
+        self.assertIsNone(get_block_num_of_query("get_dynamic_global_properties", {}))
+        self.assertIsNone(get_block_num_of_query("get_block", {}))
+
+    def test_get_query_method_and_params(self):
+        query = get_query(True, 1, "block_api", "get_block", ({"block_num": 10},))
+        self.assertEqual(get_query_method_and_params(query), ("block_api.get_block", {"block_num": 10}))
+        query = get_query(False, 1, "condenser_api", "get_block", (10,))
+        self.assertEqual(get_query_method_and_params(query), ("condenser_api.get_block", [10]))
+
+    def test_get_set(self):
+        for compress in [True, False]:
+            cache = RPCCache(os.path.join(self.path, str(compress)), compress=compress)
+            key = cache.get_key("abc", "block_api.get_block", {"block_num": 10})
+            self.assertEqual(key, cache.get_key("abc", "block_api.get_block", {"block_num": 10}))
+            self.assertNotEqual(key, cache.get_key("def", "block_api.get_block", {"block_num": 10}))
+            self.assertIsNone(cache.get(key))
+            cache.set(key, {"block_id": "123", "transactions": []})
+            self.assertEqual(cache.get(key), {"block_id": "123", "transactions": []})
+            self.assertEqual(cache.hits, 1)
+            self.assertEqual(cache.misses, 1)
+            cache.remove(key)
+            self.assertIsNone(cache.get(key))
+
+    def test_eviction(self):
+        cache = RPCCache(self.path, max_size=1000, compress=False)
+        keys = [cache.get_key("abc", "block_api.get_block", {"block_num": i}) for i in range(20)]
+        for key in keys:
+            cache.set(key, {"data": "x" * 100})
+        self.assertTrue(cache.size <= 1000)
+        self.assertTrue(cache.evictions > 0)
+        self.assertIsNone(cache.get(keys[0]))
+        self.assertIsNotNone(cache.get(keys[-1]))
+        cache2 = RPCCache(self.path, max_size=1000, compress=False)
+        cache2.clear()
+        self.assertEqual(cache2.size, 0)
+        self.assertIsNone(cache2.get(keys[-1]))
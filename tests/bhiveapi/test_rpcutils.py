@@ -7,7 +7,7 @@ import pytest
 import unittest
 from bhiveapi.rpcutils import (
     is_network_appbase_ready,
-    get_api_name, get_query, UnauthorizedError,
+    get_api_name, get_query, get_method_names, is_idempotent_query, UnauthorizedError,
     RPCConnection, RPCError, NumRetriesReached
 )
 
@@ -83,3 +83,19 @@ class Testcases(unittest.TestCase):
         self.assertEqual(query["id"], 1)
         self.assertTrue(isinstance(query["params"], list))
         self.assertEqual(query["params"], ["test_api", "test", ["b"]])
+
+    def test_is_idempotent_query(self):
+        query = get_query(True, 1, "database_api", "get_dynamic_global_properties", args=())
+        self.assertEqual(get_method_names(query), ["get_dynamic_global_properties"])
+        self.assertTrue(is_idempotent_query(query))
+        query = get_query(False, 1, "condenser_api", "broadcast_transaction", args=({},))
+        self.assertEqual(get_method_names(query), ["broadcast_transaction"])
+        self.assertFalse(is_idempotent_query(query))
+        query = get_query(True, 1, "network_broadcast_api", "broadcast_transaction_synchronous", args=({"trx": {}},))
+        self.assertFalse(is_idempotent_query(query))
+        query = [get_query(True, 1, "block_api", "get_block", args=({"block_num": 1},)),
+                 get_query(True, 2, "network_broadcast_api", "broadcast_transaction", args=({"trx": {}},))]
+        self.assertEqual(get_method_names(query), ["get_block", "broadcast_transaction"])
+        self.assertFalse(is_idempotent_query(query))
+        self.assertTrue(is_idempotent_query(query[:1]))
+        self.assertFalse(is_idempotent_query({}))
@@ -0,0 +1,10 @@
+import sys
+
+collect_ignore = []
+if sys.version_info < (3, 6):
+    # asyncio tests need async generators and aiohttp
+    collect_ignore += [
+        "bhiveapi/aiohttpfixtures.py",
+        "bhiveapi/test_asynchivenoderpc.py",
+        "bhive/test_asyncblockchain.py",
+    ]